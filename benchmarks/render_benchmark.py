@@ -0,0 +1,293 @@
+"""
+Benchmarks the bingo card and chutes and ladders board rendering.
+
+Runs the render pool jobs (card marks, board renders) and the upload encoder
+directly, against the bundled template_images and synthetic boards of
+increasing size, and reports latency percentiles, peak RSS and output bytes.
+Every case runs in a fresh process so its memory is not hidden by the
+cases before it.
+
+Usage:
+    python benchmarks/render_benchmark.py                   # run and compare with baseline.json
+    python benchmarks/render_benchmark.py --save-baseline   # run and store the results as the new baseline
+    python benchmarks/render_benchmark.py --quick           # fewer rounds and sizes, for a fast check
+
+Exits with 1 when a case's p50 is more than --threshold times its baseline
+(and at least --min-delta-ms slower).
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+import bot  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+SYNTHETIC_SIZES = (512, 1024, 2048, 4096)
+ENCODE_FORMATS = ("png", "palette", "webp", "jpeg")
+WARMUP_ROUNDS = 3
+# the chutes and ladders board, with the board_bounds settings.json ships for it
+CNL_BOARD_TEMPLATE = "bingo_card_image.png"
+CNL_BOARD_BOUNDS = {
+    "tile_count": 100, "tile_size": 100, "team_icon_x_offset": 4, "team_icon_y_offset": 30,
+    "x_offset": 5, "y_offset": 5, "x_right_offset": 5, "y_bottom_offset": 5, "gutter": 4,
+}
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of the process so far, in MiB. Cases run in their own
+    process, so this is the peak of one case and what it was set up with.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB everywhere else
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def percentile(samples: list, pct: float) -> float:
+    samples = sorted(samples)
+    index = min(int(round(pct / 100 * (len(samples) - 1))), len(samples) - 1)
+    return samples[index]
+
+
+def measure(name: str, func, rounds: int) -> dict:
+    """
+    Time func over a number of rounds.
+
+    Args:
+        name (str): The case name.
+        func: Called with the round number, returns the output size in bytes.
+        rounds (int): How many times to run func.
+
+    Returns:
+        dict: Latency percentiles in milliseconds, peak RSS, how much the case grew it and output bytes.
+    """
+    setup_rss = peak_rss_mb()
+    # warm up: fills the image caches like a running bot would have and lets the
+    # allocator settle, the first rounds on a large image are dominated by page faults
+    for _ in range(WARMUP_ROUNDS):
+        func(-1)
+    samples = []
+    output_bytes = 0
+    for i in range(rounds):
+        start = time.perf_counter()
+        output_bytes = func(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    result = {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p90_ms": round(percentile(samples, 90), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "case_rss_mb": round(peak_rss_mb() - setup_rss, 1),
+        "output_bytes": output_bytes,
+    }
+    print(
+        f"{name:<40} p50 {result['p50_ms']:>9.2f}ms  p90 {result['p90_ms']:>9.2f}ms  "
+        f"p99 {result['p99_ms']:>9.2f}ms  rss {result['peak_rss_mb']:>7.1f}MiB "
+        f"(+{result['case_rss_mb']:>6.1f})  out {output_bytes:>9}B",
+        flush=True,
+    )
+    return result
+
+
+def synthetic_template(path: str, size: int) -> str:
+    """
+    Draw a card/board like template with a grid and some colour so it does not compress to nothing.
+    """
+    img = Image.new("RGB", (size, size), "white")
+    draw = ImageDraw.Draw(img)
+    step = max(size // 10, 1)
+    for i in range(10):
+        for j in range(10):
+            colour = ((i * 25) % 256, (j * 25) % 256, ((i + j) * 12) % 256)
+            draw.rectangle([i * step + 2, j * step + 2, (i + 1) * step - 2, (j + 1) * step - 2], fill=colour)
+    img.save(path)
+    return path
+
+
+def synthetic_board_bounds(size: int) -> dict:
+    """
+    The board_bounds of a synthetic_template() board.
+    """
+    tile_size = max(size // 10, 1)
+    return bot.BoardBounds(
+        tile_size=tile_size, team_icon_x_offset=tile_size // 25, team_icon_y_offset=tile_size * 3 // 10
+    ).to_dict()
+
+
+def plan(workdir: str, quick: bool) -> list:
+    """
+    The case groups to run: the bundled card templates, the chutes and ladders board,
+    then synthetic cards and boards of increasing size.
+
+    Returns:
+        list: (case group, arguments of its CASE_GROUPS function).
+    """
+    groups = []
+    for name in sorted(os.listdir(bot.IMAGE_TEMPLATE_PATH)):
+        if name.endswith(".png") and "CNL_Team" not in name and name != "confetti.png":
+            path = os.path.join(bot.IMAGE_TEMPLATE_PATH, name)
+            groups += [("card", (name, path, workdir)), ("encode", (name, path))]
+    board_path = os.path.join(bot.IMAGE_TEMPLATE_PATH, CNL_BOARD_TEMPLATE)
+    groups.append(("board", (CNL_BOARD_TEMPLATE, board_path, CNL_BOARD_BOUNDS, workdir)))
+    for size in SYNTHETIC_SIZES[:2] if quick else SYNTHETIC_SIZES:
+        name = f"synthetic-{size}"
+        path = synthetic_template(os.path.join(workdir, f"{name}.png"), size)
+        groups += [
+            ("card", (name, path, workdir)),
+            ("board", (name, path, synthetic_board_bounds(size), workdir)),
+            ("encode", (name, path)),
+        ]
+    return groups
+
+
+def card_cases(name: str, template_path: str, workdir: str) -> dict:
+    cases = {}
+    bounds = bot.ImageBounds().to_dict()
+    card_path = os.path.join(workdir, f"{name}-card.png")
+    tiles = [[row, column] for row in range(1, 6) for column in range(1, 6)]
+
+    def full_render(i):
+        # a new template key every round so the compositor starts from the template
+        bot.card_compositor._cards.clear()
+        return len(bot.render_bingo_card(template_path, bounds, tiles[:12], card_path, 0).data)
+
+    def mark_one(i):
+        # toggle one tile on the cached card, the usual /mark_specific_tile_completed path
+        marked = tiles[:12] + ([tiles[12 + i % 13]] if i % 2 == 0 else [])
+        return len(bot.render_bingo_card(template_path, bounds, marked, card_path, 0).data)
+
+    def compose_only(i):
+        bot.card_compositor._cards.clear()
+        template = bot.image_assets.image(template_path)
+        img = bot.card_compositor.render(card_path, template, ("bench", i), bounds, bot.tiles_completed_mask(tiles[:12]))
+        # raw pixel bytes, nothing is encoded
+        return img.size[0] * img.size[1] * len(img.getbands())
+
+    cases[f"card.full_render[{name}]"] = full_render
+    cases[f"card.mark_one[{name}]"] = mark_one
+    cases[f"card.compose_only[{name}]"] = compose_only
+    return cases
+
+
+def board_cases(name: str, template_path: str, board_bounds: dict, workdir: str) -> dict:
+    cases = {}
+    origins = bot.board_geometry(board_bounds)
+    icon_sizes = [icon.size for icon in bot.image_assets.team_icons()]
+    board_path = os.path.join(workdir, f"{name}-board.png")
+
+    def board_render(i):
+        # seven teams, some sharing a tile
+        scores = [(i * 7 + team * 13) % 100 + 1 for team in range(5)] + [50, 50]
+        placements = bot.layout_team_icons(scores, icon_sizes, origins, board_bounds)
+        return len(bot.render_team_icons_board(template_path, placements, False, board_path, 0).data)
+
+    def layout_crowded(i):
+        bot.layout_team_icons([42 + i % 3] * 48, icon_sizes, origins, board_bounds)
+        return 0
+
+    cases[f"board.render[{name}]"] = board_render
+    cases[f"board.layout_48_teams[{name}]"] = layout_crowded
+    return cases
+
+
+def encode_cases(name: str, template_path: str) -> dict:
+    cases = {}
+    for format in ENCODE_FORMATS:
+        def encode(i, encoder=bot.ImageEncoder(format)):
+            return len(encoder.encode(bot.image_assets.image(template_path)).data)
+        cases[f"encode.{format}[{name}]"] = encode
+    return cases
+
+
+CASE_GROUPS = {"card": card_cases, "board": board_cases, "encode": encode_cases}
+
+
+def run_case(group: str, args: tuple, case: str, rounds: int) -> dict:
+    """
+    Build a case group and measure one of its cases, run in a process of its own.
+    """
+    return measure(case, CASE_GROUPS[group](*args)[case], rounds)
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float) -> list:
+    """
+    Find the cases whose p50 got slower than threshold times the baseline.
+    Cases slower by less than min_delta_ms are left out, fast cases are mostly timer noise.
+    """
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get("results", {}).get(case)
+        if not base or not base.get("p50_ms"):
+            continue
+        ratio = result["p50_ms"] / base["p50_ms"]
+        if ratio > threshold and result["p50_ms"] - base["p50_ms"] >= min_delta_ms:
+            regressions.append(f"{case}: p50 {result['p50_ms']:.2f}ms vs baseline {base['p50_ms']:.2f}ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=20, help="timed rounds per case")
+    parser.add_argument("--quick", action="store_true", help="5 rounds and only the smaller synthetic boards")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results in baseline.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare with or save to")
+    # p50 of an unchanged tree moves up to about 1.5x between runs on a busy machine
+    parser.add_argument("--threshold", type=float, default=2.0, help="p50 ratio over baseline that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=20.0, help="ignore p50 increases smaller than this")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+    rounds = 5 if args.quick else args.rounds
+
+    results = {}
+    # spawn and one case per worker: every case starts from a fresh interpreter,
+    # with nothing cached or allocated by the cases before it
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as workdir, context.Pool(1, maxtasksperchild=1) as pool:
+        for group, group_args in plan(workdir, args.quick):
+            for case in CASE_GROUPS[group](*group_args):
+                results[case] = pool.apply(run_case, (group, group_args, case, rounds))
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rounds": rounds,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f), args.threshold, args.min_delta_ms)
+    if regressions:
+        print("Regressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
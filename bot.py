@@ -5,18 +5,39 @@ from discord.ext import commands, tasks
 import requests
 import json
 import re
+import shutil
 import random
+import sqlite3
 import os
 import datetime
+import gzip
+import hashlib
 import math
 import config
 import asyncio
+import collections
+import concurrent.futures
+import atexit
+import bisect
+import contextlib
+import contextvars
+import copy
+import dataclasses
+import functools
+import threading
+import time
 from discord import Role
 from typing import List, Optional
 from PIL import Image, ImageDraw
+import numpy as np
 import csv
 import requests
-from io import StringIO
+from io import BytesIO, StringIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
@@ -30,13 +51,88 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix="/", intents=intents)
+# guild of the interaction being handled, used to pick that guild's settings shard
+active_guild_id = contextvars.ContextVar("active_guild_id", default=None)
+
+
+def bind_guild(interaction: discord.Interaction) -> None:
+    """
+    Bind the interaction's guild so settings calls made while handling it resolve to that guild's shard.
+
+    Args:
+        interaction (discord.Interaction): The interaction being handled.
+    """
+    active_guild_id.set(interaction.guild.id if interaction.guild else None)
+
+
+class BingoCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        bind_guild(interaction)
+        return True
+
+
+class GuildView(discord.ui.View):
+    """
+    Base view for bot responses with buttons. Binds the clicking user's guild before the button callback runs.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        bind_guild(interaction)
+        return True
+
+
+bot = commands.Bot(command_prefix="/", intents=intents, tree_cls=BingoCommandTree)
 
 DICE_SIDES = 6
 
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
 
+SETTINGS_PATH = "settings.json"
+SETTINGS_DB_PATH = "settings.db"
+JOURNAL_PATH = "journal"
+SNAPSHOTS_PATH = "snapshots"
+# settings snapshots kept per guild before the oldest are dropped
+SNAPSHOT_MAX_COUNT = 25
+SNAPSHOT_MAX_BYTES = 20 * 1024 * 1024
+# one settings shard per guild lives under this directory
+GUILD_DATA_PATH = "guilds"
+# records, under GUILD_DATA_PATH, which guild the top level settings.json was migrated to
+LEGACY_SETTINGS_MARKER = "legacy_settings_guild"
+# seconds without interactions before a guild's settings shard is unloaded
+GUILD_IDLE_TIMEOUT = 30 * 60
+# compact the roll journal into a snapshot after this many events
+JOURNAL_SNAPSHOT_EVERY = 100
+# team fields covered by the roll journal, everything else is persisted with the settings
+JOURNAL_TEAM_FIELDS = ("current", "prev", "reroll", "roll_history")
+# seconds to wait after a change before persisting settings, coalesces bursts of saves
+SETTINGS_FLUSH_DELAY = 2.0
+
 IMAGE_PATH = os.path.join(os.getcwd(), "images")
+# decoded board images kept in memory, team icons are scaled down to this size for the board
+IMAGE_CACHE_MAX_IMAGES = 32
+TEAM_ICON_SCALE = 0.75
+# Pillow rendering runs on a "thread" or "process" pool, jobs beyond RENDER_MAX_QUEUE wait for a free slot
+RENDER_POOL = "thread"
+RENDER_WORKERS = 2
+RENDER_MAX_QUEUE = 8
+# rendered chutes and ladders boards kept in generated/, least recently used are removed first
+BOARD_RENDER_CACHE_MAX = 20
+# attachment names of uploaded images (extension added per IMAGE_UPLOAD_FORMAT), embeds point at them with attachment://
+BINGO_CARD_FILENAME = "bingo_card"
+# bingo card uploads sent at once by the all teams commands
+UPLOAD_CONCURRENCY = 4
+# channels created at once by /create_team_channels, each also posts its description
+CHANNEL_CREATE_CONCURRENCY = 5
+# member role edits sent at once by the bulk role commands (/close_server, /spectators @everyone)
+ROLE_SYNC_CONCURRENCY = 4
+SCORE_BOARD_FILENAME = "score_board"
+# rendered images are encoded as "png", "palette" (256 colour png), "webp" or "jpeg", scaled down to fit
+# IMAGE_UPLOAD_MAX_DIMENSION and then squeezed (lower quality, smaller size) until under IMAGE_UPLOAD_MAX_BYTES
+IMAGE_UPLOAD_FORMAT = "png"
+IMAGE_UPLOAD_MAX_BYTES = 2 * 1024 * 1024
+IMAGE_UPLOAD_MAX_DIMENSION = 2048
+# zlib level of "png" uploads, encoding time dominates a roll and higher levels barely shrink a card
+IMAGE_PNG_COMPRESS_LEVEL = 1
 IMAGE_TEMPLATE_PATH = os.path.join(os.getcwd(), "template_images")
 
 print(f"{IMAGE_PATH = }")
@@ -91,6 +187,12 @@ CNL_SHORTCUTS = (
     (54, 34),
     (17, 7)
 )
+# where the ladders and chutes come from: "config" for CNL_SHORTCUTS, "tiles" for
+# the tile sheet, where a tile's sabotage column holds the tile number to move to
+CNL_SHORTCUTS_SOURCE = "config"
+
+# channels the bot looks up per team or server wide, matched by name or a "-<role>" suffix (team-1-bingo-card)
+CHANNEL_ROLES = ("bingo-card", "dice-roll", "score-board", "tile-list", "team-assignments")
 
 IGNORED_CATEGORIES = [
     "welcome",
@@ -101,16 +203,31 @@ IGNORED_CATEGORIES = [
 ]
 
 default_settings_dict = {
-    "bot_mode": {"bot_options": ["candyland", "normal"], "current": "candyland"},
+    "bot_mode": {"bot_options": ["candyland", "normal", "chutes and ladders"], "current": "candyland"},
     "tiles": {"url": "", "spreadsheet_id": "", "items": {}},
+    "running": False,
+    "rerolling": False,
+    "total_teams": 7,
+    "items": {},
+    "posts": {},
+    "brief_teams_channels": False,
+    # bounds and board of the bundled template_images/bingo_card_image.png
+    "image_bounds": {
+        "x_offset": 52, "y_offset": 35, "x_right_offset": 52, "y_bottom_offset": 100, "x": 0, "y": 0, "gutter": 15,
+    },
+    "board_template": os.path.join(IMAGE_TEMPLATE_PATH, "bingo_card_image.png"),
+    "board_bounds": {
+        "tile_count": 100, "tile_size": 100, "team_icon_x_offset": 4, "team_icon_y_offset": 30,
+        "x_offset": 5, "y_offset": 5, "x_right_offset": 5, "y_bottom_offset": 5, "x": 0, "y": 0, "gutter": 4,
+    },
     "teams": {
-        "Team 1": {"current": 0, "prev": None, "reroll": True, "roll_history": []},
-        "Team 2": {"current": 0, "prev": None, "reroll": True, "roll_history": []},
-        "Team 3": {"current": 0, "prev": None, "reroll": True, "roll_history": []},
-        "Team 4": {"current": 0, "prev": None, "reroll": True, "roll_history": []},
-        "Team 5": {"current": 0, "prev": None, "reroll": True, "roll_history": []},
-        "Team 6": {"current": 0, "prev": None, "reroll": True, "roll_history": []},
-        "Team 7": {"current": 0, "prev": None, "reroll": True, "roll_history": []},
+        "Team 1": {"current": 0, "prev": None, "reroll": True, "roll_history": [], "tiles_completed": []},
+        "Team 2": {"current": 0, "prev": None, "reroll": True, "roll_history": [], "tiles_completed": []},
+        "Team 3": {"current": 0, "prev": None, "reroll": True, "roll_history": [], "tiles_completed": []},
+        "Team 4": {"current": 0, "prev": None, "reroll": True, "roll_history": [], "tiles_completed": []},
+        "Team 5": {"current": 0, "prev": None, "reroll": True, "roll_history": [], "tiles_completed": []},
+        "Team 6": {"current": 0, "prev": None, "reroll": True, "roll_history": [], "tiles_completed": []},
+        "Team 7": {"current": 0, "prev": None, "reroll": True, "roll_history": [], "tiles_completed": []},
     },
 }
 
@@ -158,6 +275,23 @@ def create_discord_friendly_name(text):
         .replace(",", "")
     )
 
+def discord_channel_name(name: str) -> str:
+    """
+    Normalize a channel name the way Discord does when it creates a text channel.
+
+    Discord lowercases the name, turns whitespace into dashes and drops punctuation
+    other than dashes and underscores, so "Dragon WUT!" is stored as "dragon-wut".
+
+    Args:
+        name (str): The requested channel name.
+
+    Returns:
+        str: The name Discord will give the channel.
+    """
+    name = re.sub(r"\s+", "-", name.strip().lower())
+    name = re.sub(r"[^\w-]", "", name)
+    return re.sub(r"-{2,}", "-", name).strip("-")
+
 def chunk_text(text, chunk_size=3996, split_line=False):
     """Splits text into chunks of a specified size."""
     return [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
@@ -176,41 +310,1265 @@ def chunk_item_list_text(text_list, chunk_size=3896):
     output.append(chunk)
     return output
 
-def create_settings_json():
-    """
-    Create a settings.json file with default settings.
+# ======================================= Settings Models ====================================================
+
+
+@dataclasses.dataclass(slots=True)
+class SettingsModel:
+    """
+    Mapping style access for the settings models so code written against the
+    plain settings dicts (settings["teams"][team_name]["current"]) keeps working.
+
+    _absent holds the fields the settings.json dict did not have, so "key in model",
+    get() and to_dict() treat them as missing while a stored None stays a value.
+    Setting a field makes it present. Fields with a default_factory (lists, dicts)
+    are always present, they are changed in place rather than set.
+    """
+
+    _absent: frozenset = dataclasses.field(default=frozenset(), repr=False, compare=False, kw_only=True)
+
+    def __post_init__(self):
+        # built in code rather than from settings.json: unset optional fields are missing
+        self._absent = frozenset(name for name in self._field_names() if getattr(self, name) is None)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        absent = getattr(self, "_absent", None)
+        if absent and name in absent:
+            object.__setattr__(self, "_absent", absent - {name})
+
+    @classmethod
+    @functools.cache
+    def _field_names(cls) -> tuple:
+        return tuple(f.name for f in dataclasses.fields(cls) if f.name != "_absent")
+
+    @classmethod
+    @functools.cache
+    def _optional_names(cls) -> frozenset:
+        # the fields that can be absent
+        return frozenset(
+            f.name for f in dataclasses.fields(cls)
+            if f.name != "_absent" and f.default_factory is dataclasses.MISSING
+        )
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self._field_names() and key not in self._absent
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self else default
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def update(self, values: dict) -> None:
+        for k, v in values.items():
+            self[k] = v
+
+    def to_dict(self) -> dict:
+        """
+        Convert to the settings.json format. Missing fields are left out.
+        """
+        return {name: getattr(self, name) for name in self._field_names() if name not in self._absent}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """
+        Build the model from its settings.json format. Unknown keys are ignored.
+        """
+        names = cls._field_names()
+        model = cls(**{name: data[name] for name in names if name in data})
+        model._absent = frozenset(name for name in cls._optional_names() if name not in data)
+        return model
+
+
+@dataclasses.dataclass(slots=True)
+class Team(SettingsModel):
+    current: int = 0
+    prev: Optional[int] = None
+    # default_settings_dict starts every team on True, one reroll
+    reroll: int = True
+    roll_history: list = dataclasses.field(default_factory=list)
+    image: Optional[str] = None
+    board: Optional[str] = None
+    tiles_completed: list = dataclasses.field(default_factory=list)
+    # planned channel name -> id of the channel provisioned for it
+    channels: Optional[dict] = None
+
+
+@dataclasses.dataclass(slots=True)
+class Tile(SettingsModel):
+    name: str = ""
+    desc: str = ""
+    discord_name: str = ""
+    tile_num: Optional[str] = None
+    short_desc: Optional[str] = None
+    sabotage: Optional[str] = None
+    item_names: Optional[str] = None
+
+
+@dataclasses.dataclass(slots=True)
+class ImageBounds(SettingsModel):
+    x_offset: int = 0
+    y_offset: int = 0
+    x_right_offset: int = 0
+    y_bottom_offset: int = 0
+    x: int = 0
+    y: int = 0
+    gutter: int = 0
+    rows: int = 5
+    columns: int = 5
+
+
+@dataclasses.dataclass(slots=True)
+class BoardBounds(SettingsModel):
+    tile_count: int = 100
+    columns: int = 10
+    tile_size: int = 0
+    team_icon_x_offset: int = 0
+    team_icon_y_offset: int = 0
+    x_offset: int = 0
+    y_offset: int = 0
+    x_right_offset: int = 0
+    y_bottom_offset: int = 0
+    x: int = 0
+    y: int = 0
+    gutter: int = 0
+
+
+class TileList:
+    """
+    The bingo tiles indexed by tile number (tiles start at 1, index 0 is unused).
+    Also accepts the str keys of the settings.json "items" dict so older lookups keep working.
+    """
+
+    __slots__ = ("tiles",)
+
+    def __init__(self, tiles: list = None):
+        self.tiles = tiles if tiles is not None else [None]
+
+    @classmethod
+    def from_dict(cls, items: dict) -> "TileList":
+        tiles = [None] * (max((int(k) for k in items), default=0) + 1)
+        for k, item in items.items():
+            tiles[int(k)] = item if isinstance(item, Tile) else Tile.from_dict(item)
+        return cls(tiles)
+
+    def to_dict(self) -> dict:
+        return {str(i): tile.to_dict() for i, tile in enumerate(self.tiles) if tile is not None}
+
+    def __getitem__(self, tile_number) -> Tile:
+        try:
+            tile = self.tiles[int(tile_number)]
+        except (IndexError, ValueError):
+            raise KeyError(tile_number) from None
+        if tile is None:
+            raise KeyError(tile_number)
+        return tile
+
+    def get(self, tile_number, default=None):
+        try:
+            return self[tile_number]
+        except KeyError:
+            return default
+
+    def __contains__(self, tile_number) -> bool:
+        return self.get(tile_number) is not None
+
+    def __len__(self) -> int:
+        return sum(1 for tile in self.tiles if tile is not None)
+
+    def keys(self):
+        return [str(i) for i, tile in enumerate(self.tiles) if tile is not None]
+
+    def values(self):
+        return [tile for tile in self.tiles if tile is not None]
+
+    def items(self):
+        return [(str(i), tile) for i, tile in enumerate(self.tiles) if tile is not None]
+
+
+def settings_json_default(obj):
+    """
+    json.dump hook that writes the settings models in the settings.json format.
+    """
+    if isinstance(obj, (SettingsModel, TileList)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def hydrate_settings(settings: dict) -> dict:
+    """
+    Convert the teams, tiles and bounds of a settings dict loaded from JSON into the settings models, in place.
+    Top level keys the settings are missing are filled in from default_settings_dict.
+
+    Args:
+        settings (dict): The settings.
+
+    Returns:
+        dict: The same settings dict.
+    """
+    for key, value in default_settings_dict.items():
+        if key not in settings:
+            settings[key] = copy.deepcopy(value)
+    teams = settings["teams"]
+    for team_name, team in teams.items():
+        if not isinstance(team, Team):
+            teams[team_name] = Team.from_dict(team)
+    if "items" in settings and not isinstance(settings["items"], TileList):
+        settings["items"] = TileList.from_dict(settings["items"])
+    if isinstance(settings.get("image_bounds"), dict):
+        settings["image_bounds"] = ImageBounds.from_dict(settings["image_bounds"])
+    if isinstance(settings.get("board_bounds"), dict):
+        settings["board_bounds"] = BoardBounds.from_dict(settings["board_bounds"])
+    return settings
+
+
+class JsonSettingsBackend:
+    """
+    Stores the whole settings dict in a single JSON file.
+    Writes go to a temp file that is renamed into place.
+    """
+
+    def __init__(self, path: str = SETTINGS_PATH):
+        self.path = path
+
+    def load(self) -> dict:
+        if not os.path.exists(self.path):
+            print(f"trying to load {self.path} but file does not exist")
+            self.save(default_settings_dict)
+            print(f"created {self.path} file")
+        with open(self.path) as f:
+            return json.load(f)
+
+    def save(self, contents: dict) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = os.path.join(directory, f".{os.path.basename(self.path)}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(contents, f, indent=4, default=settings_json_default)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class SqliteSettingsBackend:
+    """
+    Stores the settings in normalized SQLite tables (WAL mode).
+
+    Teams, rolls, completed tiles, items and posts each get their own table and
+    only the rows that changed since the last save are written. Everything else
+    at the top level of the settings dict is kept as JSON in the config table.
+    An empty database is seeded from settings.json on first load.
+    """
+
+    TABLE_COLUMNS = {
+        "teams": ("name", "position", "current", "prev", "reroll", "image", "board", "extra"),
+        "rolls": ("team", "idx", "value"),
+        "completed_tiles": ("team", "idx", "row", "col"),
+        "items": ("tile", "tile_num", "name", "short_desc", "desc", "sabotage", "item_names", "discord_name"),
+        "posts": ("key", "id", "content", "extra"),
+        "config": ("key", "value"),
+    }
+    TABLE_KEYS = {
+        "teams": ("name",),
+        "rolls": ("team", "idx"),
+        "completed_tiles": ("team", "idx"),
+        "items": ("tile",),
+        "posts": ("key",),
+        "config": ("key",),
+    }
+    TEAM_COLUMNS = ("current", "prev", "reroll", "image", "board")
+    ITEM_COLUMNS = ("tile_num", "name", "short_desc", "desc", "sabotage", "item_names", "discord_name")
+
+    def __init__(self, path: str = SETTINGS_DB_PATH, *, import_path: str = SETTINGS_PATH):
+        self.path = path
+        self.import_path = import_path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        self._rows = None
+
+    def _create_tables(self) -> None:
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value TEXT);
+            CREATE TABLE IF NOT EXISTS teams (
+                name TEXT PRIMARY KEY, position INTEGER, current INTEGER, prev INTEGER,
+                reroll INTEGER, image TEXT, board TEXT, extra TEXT
+            );
+            CREATE TABLE IF NOT EXISTS rolls (
+                team TEXT, idx INTEGER, value TEXT, PRIMARY KEY (team, idx)
+            );
+            CREATE TABLE IF NOT EXISTS completed_tiles (
+                team TEXT, idx INTEGER, row INTEGER, col INTEGER, PRIMARY KEY (team, idx)
+            );
+            CREATE TABLE IF NOT EXISTS items (
+                tile INTEGER PRIMARY KEY, tile_num TEXT, name TEXT, short_desc TEXT, "desc" TEXT,
+                sabotage TEXT, item_names TEXT, discord_name TEXT
+            );
+            CREATE TABLE IF NOT EXISTS posts (key TEXT PRIMARY KEY, id INTEGER, content TEXT, extra TEXT);
+            """
+        )
+        self.conn.commit()
+
+    def _to_rows(self, contents: dict) -> dict:
+        """
+        Flatten a settings dict into rows keyed by table and primary key.
+        """
+        rows = {table: {} for table in self.TABLE_COLUMNS}
+        for position, (name, team) in enumerate(contents.get("teams", {}).items()):
+            extra = {
+                k: team[k] for k in team.keys()
+                if k not in self.TEAM_COLUMNS and k not in ("roll_history", "tiles_completed")
+            }
+            rows["teams"][(name,)] = (
+                name, position, *[team.get(k) for k in self.TEAM_COLUMNS], json.dumps(extra)
+            )
+            for idx, value in enumerate(team.get("roll_history", [])):
+                rows["rolls"][(name, idx)] = (name, idx, json.dumps(value))
+            for idx, (row, col) in enumerate(team.get("tiles_completed", [])):
+                rows["completed_tiles"][(name, idx)] = (name, idx, row, col)
+        for tile, item in contents.get("items", {}).items():
+            rows["items"][(int(tile),)] = (int(tile), *[item.get(k) for k in self.ITEM_COLUMNS])
+        for key, post in contents.get("posts", {}).items():
+            extra = {k: v for k, v in post.items() if k not in ("id", "content")}
+            rows["posts"][(key,)] = (key, post.get("id"), post.get("content"), json.dumps(extra))
+        for key, value in contents.items():
+            if key in ("teams", "items", "posts"):
+                continue
+            rows["config"][(key,)] = (key, json.dumps(value, default=settings_json_default))
+        return rows
+
+    def _from_rows(self) -> dict:
+        """
+        Rebuild the settings dict from the database tables.
+        """
+        contents = {}
+        for key, value in self.conn.execute("SELECT key, value FROM config"):
+            contents[key] = json.loads(value)
+        teams = {}
+        for name, _, current, prev, reroll, image, board, extra in self.conn.execute(
+            "SELECT * FROM teams ORDER BY position"
+        ):
+            team = {"current": current, "prev": prev, "reroll": reroll, "roll_history": [], "tiles_completed": []}
+            if image is not None:
+                team["image"] = image
+            if board is not None:
+                team["board"] = board
+            team.update(json.loads(extra) if extra else {})
+            teams[name] = team
+        for team, _, value in self.conn.execute("SELECT * FROM rolls ORDER BY team, idx"):
+            teams[team]["roll_history"].append(json.loads(value))
+        for team, _, row, col in self.conn.execute("SELECT * FROM completed_tiles ORDER BY team, idx"):
+            teams[team]["tiles_completed"].append([row, col])
+        contents["teams"] = teams
+        items = {}
+        for tile, *values in self.conn.execute("SELECT * FROM items ORDER BY tile"):
+            items[str(tile)] = {k: v for k, v in zip(self.ITEM_COLUMNS, values) if v is not None}
+        contents["items"] = items
+        posts = {}
+        for key, post_id, content, extra in self.conn.execute("SELECT * FROM posts"):
+            posts[key] = {"id": post_id, "content": content, **(json.loads(extra) if extra else {})}
+        if posts:
+            contents["posts"] = posts
+        return contents
+
+    def load(self) -> dict:
+        if not self.conn.execute("SELECT 1 FROM config LIMIT 1").fetchone():
+            if os.path.exists(self.import_path):
+                self.import_settings_json(self.import_path)
+            else:
+                self.save(default_settings_dict)
+        contents = self._from_rows()
+        self._rows = self._to_rows(contents)
+        return contents
+
+    def save(self, contents: dict) -> None:
+        """
+        Write only the rows that differ from the last save.
+        """
+        rows = self._to_rows(contents)
+        with self.conn:
+            self._write_rows(rows, self._rows)
+        self._rows = rows
+
+    def _write_rows(self, rows: dict, previous: Optional[dict]) -> None:
+        # runs inside the caller's transaction
+        previous = previous or {table: {} for table in self.TABLE_COLUMNS}
+        for table, table_rows in rows.items():
+            columns = ", ".join(f'"{c}"' for c in self.TABLE_COLUMNS[table])
+            placeholders = ", ".join("?" * len(self.TABLE_COLUMNS[table]))
+            keys = self.TABLE_KEYS[table]
+            changed = [row for pk, row in table_rows.items() if previous[table].get(pk) != row]
+            if changed:
+                self.conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} ({columns}) VALUES ({placeholders})",
+                    changed,
+                )
+            removed = [pk for pk in previous[table] if pk not in table_rows]
+            if removed:
+                self.conn.executemany(
+                    f"DELETE FROM {table} WHERE {' AND '.join(f'{k} = ?' for k in keys)}",
+                    removed,
+                )
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def import_settings_json(self, path: str = SETTINGS_PATH) -> dict:
+        """
+        One-shot import of an existing settings.json into the database, replacing its contents.
+
+        Args:
+            path (str): Path to the settings.json file.
+
+        Returns:
+            dict: The imported settings.
+        """
+        with open(path) as f:
+            contents = json.load(f)
+        rows = self._to_rows(contents)
+        # one transaction, a failed import leaves the old contents in place
+        with self.conn:
+            for table in self.TABLE_COLUMNS:
+                self.conn.execute(f"DELETE FROM {table}")
+            self._write_rows(rows, None)
+        self._rows = rows
+        print(f"imported {path} into {self.path}")
+        return contents
+
+
+class SettingsJournal:
+    """
+    Append-only journal of team state changes with periodic compacted snapshots.
+
+    Every roll, reroll, sabotage jump, manual tile change and reroll grant/revoke is
+    appended as one JSON line holding the team's resulting state, so each change
+    costs a single append instead of a full settings rewrite. Every
+    JOURNAL_SNAPSHOT_EVERY events the journaled team fields are written to a
+    snapshot together with the journal offset they cover. On startup the latest
+    snapshot is loaded and only the tail of the journal after it is replayed.
+    """
+
+    def __init__(self, path: str = JOURNAL_PATH, *, snapshot_every: int = JOURNAL_SNAPSHOT_EVERY):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.events_path = os.path.join(path, "events.jsonl")
+        self.seq = 0
+        self.events_since_snapshot = 0
+        # (seq, ts, offset, file name) for every snapshot, oldest first
+        self.snapshots = []
+        self._history_len = {}
+        self._file = None
+
+    def _snapshot_path(self, seq: int) -> str:
+        return os.path.join(self.path, f"snapshot-{seq:08d}.json")
+
+    def _load_snapshot_index(self) -> None:
+        self.snapshots = []
+        for file_name in sorted(os.listdir(self.path)):
+            if not file_name.startswith("snapshot-"):
+                continue
+            with open(os.path.join(self.path, file_name)) as f:
+                snapshot = json.load(f)
+            self.snapshots.append((snapshot["seq"], snapshot["ts"], snapshot["offset"], file_name))
+
+    def read_events(self, offset: int = 0):
+        """
+        Read journal events starting at a byte offset.
+
+        Args:
+            offset (int): Byte offset into the journal file to start from.
+
+        Yields:
+            tuple: (offset after the event, event dict).
+        """
+        if not os.path.exists(self.events_path):
+            return
+        with open(self.events_path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # torn write from a crash, nothing after it was committed
+                    break
+                yield offset, event
+
+    @staticmethod
+    def apply_event(teams: dict, event: dict) -> None:
+        """
+        Apply a journal event to a teams dict.
+
+        Args:
+            teams (dict): settings["teams"] or a dict shaped like it.
+            event (dict): The journal event.
+        """
+        team = teams.get(event["team"])
+        if team is None:
+            return
+        for k, v in event["state"].items():
+            team[k] = v
+        team["roll_history"][event["history_at"]:] = event["history"]
+
+    def replay(self, settings: dict) -> None:
+        """
+        Bring the team state in settings up to date from the latest snapshot and the journal tail.
+
+        Args:
+            settings (dict): The settings loaded from the storage backend.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        self._load_snapshot_index()
+        offset = 0
+        replayed = 0
+        if self.snapshots:
+            self.seq, _, offset, file_name = self.snapshots[-1]
+            with open(os.path.join(self.path, file_name)) as f:
+                snapshot = json.load(f)
+            for team_name, state in snapshot["teams"].items():
+                if team_name in settings["teams"]:
+                    settings["teams"][team_name].update(copy.deepcopy(state))
+        for offset, event in self.read_events(offset):
+            self.apply_event(settings["teams"], event)
+            self.seq = event["seq"]
+            replayed += 1
+        self.events_since_snapshot = replayed
+        self._history_len = {
+            team_name: len(team.get("roll_history", [])) for team_name, team in settings["teams"].items()
+        }
+        # drop a torn tail so new events start on a clean line
+        if os.path.exists(self.events_path) and os.path.getsize(self.events_path) != offset:
+            with open(self.events_path, "r+b") as f:
+                f.truncate(offset)
+        self._file = open(self.events_path, "ab")
+        if not self.snapshots:
+            # base snapshot so every event can be rebuilt from a known state
+            self.snapshot(settings)
+        if replayed:
+            print(f"replayed {replayed} journal event(s) up to #{self.seq}")
+
+    def append(self, settings: dict, event_type: str, team_name: str, **data) -> dict:
+        """
+        Append the current state of a team to the journal.
+
+        Args:
+            settings (dict): The live settings.
+            event_type (str): What happened, e.g. "roll", "reroll", "sabotage", "set_tile".
+            team_name (str): The team that changed.
+            **data: Extra details stored with the event, e.g. the dice roll.
+
+        Returns:
+            dict: The journal event.
+        """
+        team = settings["teams"][team_name]
+        history = team.get("roll_history", [])
+        history_at = self._history_len.get(team_name, 0)
+        if history_at > len(history):
+            history_at = 0
+        self.seq += 1
+        event = {
+            "seq": self.seq,
+            "ts": time.time(),
+            "type": event_type,
+            "team": team_name,
+            "state": {k: team.get(k) for k in JOURNAL_TEAM_FIELDS if k != "roll_history"},
+            "history_at": history_at,
+            "history": list(history[history_at:]),
+            **data,
+        }
+        self._history_len[team_name] = len(history)
+        self._file.write(json.dumps(event).encode() + b"\n")
+        self._file.flush()
+        self.events_since_snapshot += 1
+        if self.events_since_snapshot >= self.snapshot_every:
+            self.snapshot(settings)
+        return event
+
+    def snapshot(self, settings: dict) -> None:
+        """
+        Write a compacted snapshot of the journaled team fields at the current journal position.
+
+        Args:
+            settings (dict): The live settings.
+        """
+        if self._file is None:
+            return
+        self._file.flush()
+        offset = self._file.tell()
+        ts = time.time()
+        snapshot = {
+            "seq": self.seq,
+            "ts": ts,
+            "offset": offset,
+            "teams": {
+                team_name: {k: copy.deepcopy(team.get(k)) for k in JOURNAL_TEAM_FIELDS}
+                for team_name, team in settings["teams"].items()
+            },
+        }
+        path = self._snapshot_path(self.seq)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+        self.snapshots = [x for x in self.snapshots if x[0] != self.seq]
+        self.snapshots.append((self.seq, ts, offset, os.path.basename(path)))
+        self._history_len = {
+            team_name: len(team.get("roll_history", [])) for team_name, team in settings["teams"].items()
+        }
+        self.events_since_snapshot = 0
+
+    def team_state_at(self, team_name: str, *, seq: int = None, ts: float = None) -> tuple:
+        """
+        Rebuild a team's journaled state as it was at a past event or point in time.
+        Seeks from the closest snapshot at or before the target, so at most
+        snapshot_every events are read.
+
+        Args:
+            team_name (str): The name of the team.
+            seq (int, optional): Rebuild the state as of this event number.
+            ts (float, optional): Rebuild the state as of this unix timestamp.
+
+        Returns:
+            tuple: (state dict, seq of the last event applied), or (None, None) if
+            there is no snapshot at or before the target.
+        """
+        if self._file is not None:
+            self._file.flush()
+        if seq is not None:
+            i = bisect.bisect_right([x[0] for x in self.snapshots], seq)
+        else:
+            i = bisect.bisect_right([x[1] for x in self.snapshots], ts)
+        if i == 0:
+            return None, None
+        snapshot_seq, _, offset, file_name = self.snapshots[i - 1]
+        with open(os.path.join(self.path, file_name)) as f:
+            state = json.load(f)["teams"].get(team_name)
+        if state is None:
+            return None, None
+        last_seq = snapshot_seq
+        teams = {team_name: state}
+        for _, event in self.read_events(offset):
+            if (seq is not None and event["seq"] > seq) or (ts is not None and event["ts"] > ts):
+                break
+            last_seq = event["seq"]
+            self.apply_event(teams, event)
+        return state, last_seq
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SettingsStore:
+    """
+    Process-wide, in-memory settings store with write-behind persistence.
+
+    The settings are read from the storage backend once and every caller shares
+    the same dict. Changes are persisted on a debounced schedule so a burst of
+    saves coalesces into a single backend write.
+    """
+
+    def __init__(self, backend=None, journal=None, snapshots=None, *, flush_delay: float = SETTINGS_FLUSH_DELAY):
+        self.backend = backend if backend is not None else JsonSettingsBackend(SETTINGS_PATH)
+        self.journal = journal
+        self.snapshots = snapshots
+        self.flush_delay = flush_delay
+        self._settings = None
+        self._dirty = False
+        self._flush_handle = None
+        self.saves_requested = 0
+        self.writes = 0
+        self._team_locks = {}
+        self._team_events = {}
+        self._global_lock = asyncio.Lock()
+        self.lock_stats = {"acquired": 0, "contended": 0, "wait_seconds": 0.0, "rolled_back": 0}
+        # commands holding the store across awaits, the registry does not evict it meanwhile
+        self.users = 0
+        self.last_used = time.monotonic()
+
+    def touch(self) -> None:
+        """
+        Mark the store as used now, so the registry does not count it as idle.
+        """
+        self.last_used = time.monotonic()
+
+    @contextlib.contextmanager
+    def in_use(self):
+        """
+        Keep the store loaded while a command holds it across awaits without a lock,
+        so the journal it records to is not closed by an idle eviction in between.
+        """
+        self.users += 1
+        self.touch()
+        try:
+            yield self
+        finally:
+            self.users -= 1
+            self.touch()
+
+    def get(self) -> dict:
+        """
+        Get the current settings, reading them from disk on first use.
+
+        Returns:
+            dict: The live settings dict shared by all callers.
+        """
+        if self._settings is None:
+            self._settings = hydrate_settings(self._read())
+            if self.journal is not None:
+                self.journal.replay(self._settings)
+        return self._settings
+
+    def record(self, event_type: str, team_name: str, **data) -> None:
+        """
+        Record a change to a team's state.
+        With a journal the change is appended to it, otherwise a settings write is scheduled.
+
+        Args:
+            event_type (str): What happened, e.g. "roll", "reroll", "sabotage", "set_tile".
+            team_name (str): The team that changed.
+            **data: Extra details stored with the event, e.g. the dice roll.
+        """
+        self.touch()
+        self._team_events[team_name] = self._team_events.get(team_name, 0) + 1
+        if self.journal is None:
+            self.mark_dirty()
+            return
+        snapshots = len(self.journal.snapshots)
+        self.journal.append(self.get(), event_type, team_name, **data)
+        if len(self.journal.snapshots) != snapshots:
+            # the snapshot covers the journal, let the backend catch up with it too
+            self.mark_dirty()
+
+    def take_snapshot(self, label: str) -> None:
+        """
+        Snapshot the full settings before a destructive change so it can be restored with /restore_snapshot.
+
+        Args:
+            label (str): What the snapshot was taken for, e.g. the command name.
+        """
+        if self.snapshots is not None:
+            self.snapshots.take(self.get(), label)
+
+    def checkpoint(self) -> None:
+        """
+        Snapshot the journal and schedule a settings write.
+        Used after bulk changes (reset, rename) that are not journaled event by event.
+        """
+        self.touch()
+        if self.journal is not None:
+            self.journal.snapshot(self.get())
+        self.mark_dirty()
+
+    def set(self, contents: dict) -> None:
+        """
+        Replace the current settings and schedule them to be persisted.
+        The live dict is updated in place so callers holding it see the new settings.
+
+        Args:
+            contents (dict): The new settings, copied so later changes to it are not shared.
+        """
+        if self._settings is None:
+            self._settings = hydrate_settings(copy.deepcopy(contents))
+        elif contents is not self._settings:
+            contents = hydrate_settings(copy.deepcopy(contents))
+            self._settings.clear()
+            self._settings.update(contents)
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """
+        Schedule a write of the current settings.
+        Writes are coalesced, only one is pending at a time. Outside of a running
+        event loop (startup, scripts) the write happens immediately.
+        """
+        self._dirty = True
+        self.saves_requested += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_delay, self.flush)
+
+    def flush(self) -> None:
+        """
+        Write the settings to disk now if there are unsaved changes.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._dirty or self._settings is None:
+            return
+        self._write(self._settings)
+        self._dirty = False
+        self.writes += 1
+
+    async def _acquire(self, lock: asyncio.Lock) -> None:
+        self.touch()
+        self.lock_stats["acquired"] += 1
+        if not lock.locked():
+            await lock.acquire()
+            return
+        self.lock_stats["contended"] += 1
+        start = time.perf_counter()
+        await lock.acquire()
+        self.lock_stats["wait_seconds"] += time.perf_counter() - start
+
+    @contextlib.asynccontextmanager
+    async def team_transaction(self, team_name: str):
+        """
+        Lock a single team's state for a read-modify-write.
+        Different teams can hold their transactions at the same time. If the block
+        raises, the team's state is restored to what it was when the block started.
+        Changes should be recorded with record() before the block ends.
+
+        Args:
+            team_name (str): The name of the team to lock.
+
+        Yields:
+            dict: The live settings dict.
+        """
+        lock = self._team_locks.setdefault(team_name, asyncio.Lock())
+        await self._acquire(lock)
+        try:
+            settings = self.get()
+            backup = copy.deepcopy(settings["teams"].get(team_name))
+            events = self._team_events.get(team_name, 0)
+            try:
+                yield settings
+            except BaseException:
+                if backup is not None:
+                    settings["teams"][team_name] = backup
+                    if self._team_events.get(team_name, 0) != events:
+                        self.record("rollback", team_name)
+                self.lock_stats["rolled_back"] += 1
+                raise
+            if self._team_events.get(team_name, 0) == events:
+                # nothing was journaled for this change, persist it with the settings
+                self.mark_dirty()
+        finally:
+            lock.release()
+
+    @contextlib.asynccontextmanager
+    async def global_transaction(self):
+        """
+        Lock the cross-team fields ("running", "rerolling", "total_teams", "posts", ...)
+        for a read-modify-write. Team state and the tile list are not covered, use
+        team_transaction for teams.
+
+        Yields:
+            dict: The live settings dict.
+        """
+        await self._acquire(self._global_lock)
+        try:
+            settings = self.get()
+            skipped = ("teams", "items", "tiles")
+            backup = {k: copy.deepcopy(v) for k, v in settings.items() if k not in skipped}
+            try:
+                yield settings
+            except BaseException:
+                for k in [k for k in settings if k not in skipped and k not in backup]:
+                    del settings[k]
+                settings.update(backup)
+                self.lock_stats["rolled_back"] += 1
+                raise
+            self.mark_dirty()
+        finally:
+            self._global_lock.release()
+
+    @contextlib.asynccontextmanager
+    async def exclusive_transaction(self):
+        """
+        Lock the whole settings, the cross-team fields and every team, for changes that
+        rename or replace teams. Team locks are taken in name order after the global lock.
+        If the block raises, all settings are restored to what they were when it started.
+
+        Yields:
+            dict: The live settings dict.
+        """
+        await self._acquire(self._global_lock)
+        locks = []
+        try:
+            settings = self.get()
+            for team_name in sorted(set(self._team_locks) | set(settings["teams"])):
+                lock = self._team_locks.setdefault(team_name, asyncio.Lock())
+                await self._acquire(lock)
+                locks.append(lock)
+            backup = copy.deepcopy(settings)
+            try:
+                yield settings
+            except BaseException:
+                settings.clear()
+                settings.update(backup)
+                self.lock_stats["rolled_back"] += 1
+                raise
+            self.mark_dirty()
+        finally:
+            for lock in locks:
+                lock.release()
+            self._global_lock.release()
+
+    @property
+    def busy(self) -> bool:
+        """
+        Whether a command is using the store or any transaction holds a lock on it.
+        """
+        return (
+            self.users > 0
+            or self._global_lock.locked()
+            or any(lock.locked() for lock in self._team_locks.values())
+        )
+
+    def close(self) -> None:
+        """
+        Flush pending changes and release the backend and journal files.
+        """
+        self.flush()
+        if self.journal is not None:
+            self.journal.close()
+        if hasattr(self.backend, "close"):
+            self.backend.close()
+
+    def _read(self) -> dict:
+        return self.backend.load()
+
+    def _write(self, contents: dict) -> None:
+        self.backend.save(contents)
+
+
+class SettingsSnapshots:
+    """
+    Compressed, content-addressed snapshots of the full settings, taken before destructive commands.
+
+    Each snapshot file is named by the hash of its contents so saving an identical
+    state twice only adds a manifest entry. The manifest is rotated by entry count
+    and total file size, dropping the oldest snapshots first. Snapshots are zstd
+    compressed when the zstandard package is installed, gzip otherwise.
+    """
+
+    def __init__(
+        self,
+        path: str = SNAPSHOTS_PATH,
+        *,
+        max_count: int = SNAPSHOT_MAX_COUNT,
+        max_bytes: int = SNAPSHOT_MAX_BYTES,
+    ):
+        self.path = path
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.manifest_path = os.path.join(path, "manifest.json")
+
+    def _load_manifest(self) -> list:
+        if not os.path.exists(self.manifest_path):
+            return []
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: list) -> None:
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _compress(data: bytes) -> tuple:
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=10).compress(data), "zst"
+        return gzip.compress(data, compresslevel=9), "gz"
+
+    @staticmethod
+    def _decompress(data: bytes, file_name: str) -> bytes:
+        if file_name.endswith(".zst"):
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def list(self) -> list:
+        """
+        Returns:
+            list: The manifest entries, newest first.
+        """
+        return list(reversed(self._load_manifest()))
+
+    def take(self, settings: dict, label: str) -> dict:
+        """
+        Snapshot the settings.
+
+        Args:
+            settings (dict): The settings to snapshot.
+            label (str): What the snapshot was taken for, e.g. the command name.
+
+        Returns:
+            dict: The manifest entry.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        data = json.dumps(settings, default=settings_json_default, sort_keys=True, separators=(",", ":")).encode()
+        digest = hashlib.sha256(data).hexdigest()
+        manifest = self._load_manifest()
+        existing = [x for x in manifest if x["hash"] == digest and os.path.exists(os.path.join(self.path, x["file"]))]
+        if existing:
+            file_name, size = existing[0]["file"], existing[0]["size"]
+        else:
+            compressed, extension = self._compress(data)
+            file_name = f"{digest}.json.{extension}"
+            size = len(compressed)
+            tmp_path = os.path.join(self.path, f".{file_name}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, os.path.join(self.path, file_name))
+        entry = {"hash": digest, "label": label, "ts": time.time(), "file": file_name, "size": size}
+        manifest.append(entry)
+        self._save_manifest(self._rotate(manifest))
+        return entry
+
+    def _rotate(self, manifest: list) -> list:
+        while len(manifest) > self.max_count:
+            manifest.pop(0)
+        while len(manifest) > 1 and sum({x["file"]: x["size"] for x in manifest}.values()) > self.max_bytes:
+            manifest.pop(0)
+        referenced = {x["file"] for x in manifest}
+        for file_name in os.listdir(self.path):
+            if file_name.startswith(".") or file_name == "manifest.json" or file_name in referenced:
+                continue
+            os.remove(os.path.join(self.path, file_name))
+        return manifest
+
+    def load(self, digest: str) -> dict:
+        """
+        Load a snapshot by its hash (or a unique prefix of it).
+
+        Args:
+            digest (str): The snapshot hash.
+
+        Returns:
+            dict: The snapshotted settings.
+        """
+        entries = [x for x in self._load_manifest() if x["hash"].startswith(digest)]
+        if not entries or len({x["hash"] for x in entries}) > 1:
+            raise KeyError(digest)
+        file_name = entries[-1]["file"]
+        with open(os.path.join(self.path, file_name), "rb") as f:
+            return json.loads(self._decompress(f.read(), file_name))
+
+
+def create_settings_backend(directory: str = ""):
+    """
+    Create the settings storage backend selected by config.SETTINGS_BACKEND ("json" or "sqlite").
+
+    Args:
+        directory (str, optional): Directory holding the settings files. Defaults to the working directory.
+
+    Returns:
+        JsonSettingsBackend | SqliteSettingsBackend: The storage backend.
+    """
+    backend = getattr(config, "SETTINGS_BACKEND", "json")
+    if backend == "sqlite":
+        return SqliteSettingsBackend(
+            os.path.join(directory, SETTINGS_DB_PATH),
+            import_path=os.path.join(directory, SETTINGS_PATH),
+        )
+    return JsonSettingsBackend(os.path.join(directory, SETTINGS_PATH))
+
+
+class GuildSettingsRegistry:
+    """
+    One settings shard per guild, loaded lazily on first interaction and evicted when idle.
+
+    Each guild gets its own directory under GUILD_DATA_PATH with its own settings
+    backend, roll journal and locks, so events in different guilds never share
+    state or files. A new shard starts from default_settings_dict, except for the
+    guild the bot ran before sharding (config.LEGACY_SETTINGS_GUILD_ID, or the
+    first guild seen when unset) which takes over the top level settings.json.
+    """
+
+    def __init__(self, root: str = GUILD_DATA_PATH, *, idle_timeout: float = GUILD_IDLE_TIMEOUT):
+        self.root = root
+        self.idle_timeout = idle_timeout
+        self._stores = {}
+
+    def guild_path(self, guild_id: int) -> str:
+        return os.path.join(self.root, str(guild_id))
+
+    def _claim_legacy_settings(self, guild_id: int) -> bool:
+        """
+        Check whether a new guild is the one the top level settings.json belongs to.
+        Only one guild ever claims it, the claim is recorded in LEGACY_SETTINGS_MARKER.
+
+        Args:
+            guild_id (int): The Discord guild ID.
+
+        Returns:
+            bool: True when the guild's shard should start from settings.json.
+        """
+        if not os.path.exists(SETTINGS_PATH):
+            return False
+        legacy_guild_id = getattr(config, "LEGACY_SETTINGS_GUILD_ID", None)
+        if legacy_guild_id is not None and int(legacy_guild_id) != guild_id:
+            return False
+        try:
+            with open(os.path.join(self.root, LEGACY_SETTINGS_MARKER), "x") as f:
+                f.write(str(guild_id))
+        except FileExistsError:
+            return False
+        return True
+
+    def get(self, guild_id: int) -> SettingsStore:
+        """
+        Get the settings store for a guild, loading its shard if needed.
+
+        Args:
+            guild_id (int): The Discord guild ID.
+
+        Returns:
+            SettingsStore: The guild's settings store.
+        """
+        store = self._stores.get(guild_id)
+        if store is None:
+            directory = self.guild_path(guild_id)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+                # other guilds start from the defaults, settings.json holds another event's teams
+                if self._claim_legacy_settings(guild_id):
+                    print(f"migrating {SETTINGS_PATH} to the settings shard of guild {guild_id}")
+                    shutil.copyfile(SETTINGS_PATH, os.path.join(directory, SETTINGS_PATH))
+            store = SettingsStore(
+                create_settings_backend(directory),
+                SettingsJournal(os.path.join(directory, JOURNAL_PATH)),
+                SettingsSnapshots(os.path.join(directory, SNAPSHOTS_PATH)),
+            )
+            self._stores[guild_id] = store
+            print(f"loaded settings shard for guild {guild_id}")
+        store.touch()
+        return store
+
+    def evict_idle(self) -> int:
+        """
+        Flush and unload the shards that have not been used for idle_timeout seconds.
+        Shards held by a running command (SettingsStore.in_use) or a transaction are kept.
+
+        Returns:
+            int: The number of shards evicted.
+        """
+        now = time.monotonic()
+        evicted = 0
+        for guild_id, store in list(self._stores.items()):
+            if now - store.last_used < self.idle_timeout or store.busy:
+                continue
+            store.close()
+            del self._stores[guild_id]
+            evicted += 1
+        return evicted
+
+    def flush_all(self) -> None:
+        for store in self._stores.values():
+            store.flush()
+
+
+guild_settings = GuildSettingsRegistry()
+atexit.register(guild_settings.flush_all)
+
+
+def get_settings_store(guild_id: int = None) -> SettingsStore:
+    """
+    Get the settings store for a guild.
+
+    Args:
+        guild_id (int, optional): The Discord guild ID. Defaults to the guild of the interaction being handled.
+
+    Returns:
+        SettingsStore: The guild's settings store.
+    """
+    if guild_id is None:
+        guild_id = active_guild_id.get()
+    if guild_id is None:
+        raise RuntimeError("No guild bound, settings are only available while handling a guild interaction")
+    return guild_settings.get(guild_id)
+
+
+def guild_image_path(guild_id: int = None) -> str:
+    """
+    Get the directory for a guild's uploaded and generated bingo card images.
+
+    Args:
+        guild_id (int, optional): The Discord guild ID. Defaults to the guild of the interaction being handled.
+
+    Returns:
+        str: The absolute path of the guild's image directory.
+    """
+    if guild_id is None:
+        guild_id = active_guild_id.get()
+    path = os.path.abspath(os.path.join(guild_settings.guild_path(guild_id), "images"))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def create_settings_json():
+    """
+    Create a settings.json file with default settings.
+    """
+    store = get_settings_store()
+    store.set(copy.deepcopy(default_settings_dict))
+    store.flush()
+    print("created settings.json file")
+
+
+def load_settings_json(guild_id: int = None):
+    """
+    Load the settings from the guild's in-memory settings store.
+    The guild's settings file is only read the first time.
+
+    Args:
+        guild_id (int, optional): The Discord guild ID. Defaults to the guild of the interaction being handled.
+
+    Returns:
+        dict: A copy of the settings, changes to it are only kept by save_settings_json or a transaction.
     """
-    with open("settings.json", "w") as f:
-        json.dump(default_settings_dict, f, indent=4)
-        print("created settings.json file")
+    return copy.deepcopy(get_settings_store(guild_id).get())
 
 
-def load_settings_json():
+def read_settings_json(guild_id: int = None) -> dict:
     """
-    Load the settings from the settings.json file.
+    Get the guild's live settings without copying them, for commands that only read.
+    Commands that change the settings use a transaction, or save_settings_json on a
+    load_settings_json() copy.
+
+    Args:
+        guild_id (int, optional): The Discord guild ID. Defaults to the guild of the interaction being handled.
 
     Returns:
-        dict: The loaded settings.
+        dict: The live settings. Do not modify them.
     """
-    if not os.path.exists("settings.json"):
-        print("trying to load settings.json but file does not exist")
-        create_settings_json()
-    with open("settings.json") as f:
-        settings = json.load(f)
-        # print('loaded settings.json file')
-        return settings
+    return get_settings_store(guild_id).get()
 
 
-def save_settings_json(contents: dict) -> None:
+def save_settings_json(contents: dict, guild_id: int = None) -> None:
     """
-    Save the settings to the settings.json file.
+    Save the settings to the guild's settings store.
+    The write to disk is deferred and coalesced with other saves.
 
     Args:
         contents (dict): The settings to save.
+        guild_id (int, optional): The Discord guild ID. Defaults to the guild of the interaction being handled.
     """
-    with open("settings.json", "w") as f:
-        # print('saved settings.json file')
-        json.dump(contents, f, indent=4)
+    get_settings_store(guild_id).set(contents)
 
 
 def update_settings_json(
@@ -255,11 +1613,12 @@ def update_roll_settings(roll, team_name, settings, prev, current, reroll=False)
     Returns:
         dict: The updated settings dictionary.
     """
+    team = settings["teams"][team_name]
     if reroll:
-        settings["teams"][team_name]["roll_history"].append("reroll")
-    settings["teams"][team_name]["roll_history"].append(roll)
-    settings["teams"][team_name]["prev"] = prev
-    settings["teams"][team_name]["current"] = current
+        team.roll_history.append("reroll")
+    team.roll_history.append(roll)
+    team.prev = prev
+    team.current = current
     return settings
 
 
@@ -274,14 +1633,11 @@ def formatted_title(settings, team_name):
     Returns:
         str: The formatted title for the tile.
     """
-    tile_num = settings["teams"][team_name]["current"]
-    name = settings["items"][str(tile_num)]["name"]
-
-    desc = settings["items"][str(tile_num)].get("short_desc")
-    if not desc:
-        desc = settings["items"][str(tile_num)]["desc"]
-        return f"{tile_num} - {name}"
-    return f"{tile_num} - {name} - {desc}"
+    tile_num = settings["teams"][team_name].current
+    tile = settings["items"][tile_num]
+    if not tile.short_desc:
+        return f"{tile_num} - {tile.name}"
+    return f"{tile_num} - {tile.name} - {tile.short_desc}"
 
 
 def format_item_list(contents, tile_list: list) -> list:
@@ -303,7 +1659,7 @@ def format_item_list(contents, tile_list: list) -> list:
         if contents["bot_mode"]["current"] == "candyland" or contents["bot_mode"]["current"] == "chutes and ladders":
             tile_num, name, short_desc, desc, sabotage, item_names, diff = item
             frmt_item = {
-                i: {
+                str(i): {
                     "tile_num": tile_num,
                     "name": name,
                     "short_desc": short_desc,
@@ -316,10 +1672,10 @@ def format_item_list(contents, tile_list: list) -> list:
         else:
             name, desc = item
             frmt_item = {
-                i: {"name": name, "desc": desc, "discord_name": f"{name} - {desc}"}
+                str(i): {"name": name, "desc": desc, "discord_name": f"{name} - {desc}"}
             }
         items.update(frmt_item)
-    contents["items"] = items
+    contents["items"] = TileList.from_dict(items)
     return contents
 
 
@@ -424,13 +1780,13 @@ def update_tiles_url(contents: dict, url: str, *, process_sheet: bool = False) -
     return contents
 
 
-def create_tile_embed(tiles: dict, tile_number: str) -> discord.Embed:
+def create_tile_embed(tiles: TileList, tile_number: int) -> discord.Embed:
     """
     Create a Discord embed for a specific tile.
 
     Args:
-        tiles (dict): The dictionary of tiles.
-        tile_number (str): The number of the tile.
+        tiles (TileList): The tiles.
+        tile_number (int): The number of the tile.
 
     Returns:
         discord.Embed: The created Discord embed.
@@ -441,8 +1797,8 @@ def create_tile_embed(tiles: dict, tile_number: str) -> discord.Embed:
     # if len(multi_img_urls) > 1:
     # img_url = multi_img_urls[0]
     embed = discord.Embed(
-        title=f"{itm['tile_num']} - {itm['name']}{' - '.join(itm['short_desc']) if itm['short_desc'] else ''}",
-        description=itm["desc"],
+        title=f"{itm.tile_num} - {itm.name}{' - '.join(itm.short_desc) if itm.short_desc else ''}",
+        description=itm.desc,
         color=0xF7E302,
         # url=multi_wiki_urls[0]
     )
@@ -453,36 +1809,241 @@ def create_tile_embed(tiles: dict, tile_number: str) -> discord.Embed:
     return embed
 
 
-def mark_on_image_tile_complete(team_name: str, row: int, column: int) -> None:
+class ImageAssetCache:
+    """
+    Decoded board templates, team cards, team icons and confetti kept in memory between renders.
+
+    Images are decoded once and handed out as shared read-only objects, callers
+    that draw on one must .copy() it first. The cache only changes when a board
+    image or the bounds are updated (invalidate()) or a newly rendered card is
+    stored with put(). The version number changes on every invalidation.
+    fingerprint() identifies a file's contents across restarts.
+    """
+
+    def __init__(self, *, max_images: int = IMAGE_CACHE_MAX_IMAGES, icon_scale: float = TEAM_ICON_SCALE):
+        self.max_images = max_images
+        self.icon_scale = icon_scale
+        self.version = 0
+        self._images = collections.OrderedDict()
+        self._fingerprints = {}
+        self._board_assets = None
+        self._team_icons = None
+        self._confetti = None
+        # render pool threads share the cache
+        self._lock = threading.RLock()
+
+    def image(self, path: str) -> Image.Image:
+        """
+        Get a decoded image, reading it from disk only if it is not cached.
+
+        Args:
+            path (str): Path of the image file.
+
+        Returns:
+            Image.Image: The shared decoded image. Do not draw on it.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            img = self._images.get(path)
+            if img is not None:
+                self._images.move_to_end(path)
+                return img
+        img = Image.open(path)
+        img.load()
+        self.put(path, img)
+        return img
+
+    def put(self, path: str, img: Image.Image) -> None:
+        """
+        Store an image that was just rendered and saved to path so the next render can reuse it without decoding.
+
+        Args:
+            path (str): Path the image was saved to.
+            img (Image.Image): The image. It must not be drawn on afterwards.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            self._images[path] = img
+            self._images.move_to_end(path)
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+
+    def fingerprint(self, path: str) -> list:
+        """
+        Identify a file's contents by its modification time and size, read once until the next invalidate().
+
+        Args:
+            path (str): Path of the file.
+
+        Returns:
+            list: [mtime_ns, size], the same across restarts while the file is unchanged.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            fingerprint = self._fingerprints.get(path)
+            if fingerprint is None:
+                stat = os.stat(path)
+                fingerprint = self._fingerprints[path] = [stat.st_mtime_ns, stat.st_size]
+            return fingerprint
+
+    def board_assets_fingerprint(self) -> list:
+        """
+        Returns:
+            list: fingerprint() of the team icons and confetti pasted onto the board.
+        """
+        with self._lock:
+            if self._board_assets is None:
+                names = sorted(x for x in os.listdir(IMAGE_TEMPLATE_PATH) if "CNL_Team" in x) + ["confetti.png"]
+                self._board_assets = [
+                    [name, *self.fingerprint(os.path.join(IMAGE_TEMPLATE_PATH, name))] for name in names
+                ]
+            return self._board_assets
+
+    def team_icons(self) -> list:
+        """
+        Returns:
+            list: The CNL_Team_* icons already scaled down for the board, highest team number first.
+        """
+        with self._lock:
+            if self._team_icons is None:
+                self._team_icons = self._load_team_icons()
+            return self._team_icons
+
+    def _load_team_icons(self) -> list:
+        icon_files = sorted([x for x in os.listdir(IMAGE_TEMPLATE_PATH) if "CNL_Team" in x], reverse=True)
+        icons = []
+        for file_name in icon_files:
+            icon = Image.open(os.path.join(IMAGE_TEMPLATE_PATH, file_name))
+            icon_x, icon_y = icon.size
+            icons.append(
+                icon.resize((math.floor(icon_x * self.icon_scale), math.floor(icon_y * self.icon_scale)))
+            )
+        return icons
+
+    def confetti(self) -> Image.Image:
+        with self._lock:
+            if self._confetti is None:
+                self._confetti = Image.open(os.path.join(IMAGE_TEMPLATE_PATH, "confetti.png"))
+                self._confetti.load()
+            return self._confetti
+
+    def invalidate(self) -> None:
+        """
+        Drop every cached image. Used when a board image or the bounds change.
+        """
+        with self._lock:
+            self._images.clear()
+            self._fingerprints.clear()
+            self._board_assets = None
+            self._team_icons = None
+            self._confetti = None
+            self.version += 1
+
+    def sync_version(self, version: int) -> None:
+        """
+        Drop the cache if it is older than the version a render job was submitted with.
+        Render pool processes keep their own copy of the cache and use this to follow invalidations.
+
+        Args:
+            version (int): image_assets.version of the process that submitted the job.
+        """
+        with self._lock:
+            if self.version < version:
+                self.invalidate()
+                self.version = version
+
+
+image_assets = ImageAssetCache()
+
+
+class RenderService:
+    """
+    Runs the Pillow rendering jobs off the event loop on a thread or process pool.
+
+    Jobs are plain functions that take and return picklable values. At most
+    max_queue jobs are submitted at once, any more wait for a free slot so a
+    burst of renders cannot pile up unbounded work behind the pool.
+    """
+
+    def __init__(self, mode: str = RENDER_POOL, *, workers: int = RENDER_WORKERS, max_queue: int = RENDER_MAX_QUEUE):
+        self.mode = mode
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = None
+        self._slots = None
+        self.stats = {"jobs": 0, "waited": 0, "seconds": 0.0}
+
+    def executor(self) -> concurrent.futures.Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="render"
+                )
+        return self._executor
+
+    async def run(self, func, *args):
+        """
+        Run a render job on the pool.
+
+        Args:
+            func: A module level function, so it can be sent to a process pool.
+            *args: Picklable arguments for func.
+
+        Returns:
+            The return value of func.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_queue)
+        if self._slots.locked():
+            self.stats["waited"] += 1
+        async with self._slots:
+            start = time.perf_counter()
+            result = await asyncio.get_running_loop().run_in_executor(self.executor(), func, *args)
+            self.stats["jobs"] += 1
+            self.stats["seconds"] += time.perf_counter() - start
+            return result
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+render_service = RenderService(
+    getattr(config, "RENDER_POOL", RENDER_POOL),
+    workers=getattr(config, "RENDER_WORKERS", RENDER_WORKERS),
+    max_queue=getattr(config, "RENDER_MAX_QUEUE", RENDER_MAX_QUEUE),
+)
+
+
+def card_grid(image_bounds: dict) -> tuple:
     """
-    Mark a tile as complete on the team's image.
+    Get the number of rows and columns of the bingo card.
 
     Args:
-        team_name (str): The name of the team.
-        row (int): The row number of the tile.
-        column (int): The column number of the tile.
+        image_bounds (dict): settings["image_bounds"], as a dict or ImageBounds.
+
+    Returns:
+        tuple: (rows, columns), 5x5 unless set with /set_image_bounds.
     """
-    # Open the image
-    settings = load_settings_json()
-    image_path = os.path.abspath(settings["teams"][team_name]["image"])
-    if not os.path.exists(image_path):
-        image_path = os.path.join(IMAGE_PATH, "bingo_card_image.png")
-        settings["teams"][team_name]["image"] = image_path
-    image_bounds = settings["image_bounds"]
-    img = Image.open(image_path)
-    x_offset = image_bounds["x_offset"] if image_bounds["x_offset"] else 0
-    y_offset = image_bounds["y_offset"] if image_bounds["y_offset"] else 0
-    x_right_offset = (
-        image_bounds["x_right_offset"] if image_bounds["x_right_offset"] else 0
-    )
-    y_bottom_offset = (
-        image_bounds["y_bottom_offset"] if image_bounds["y_bottom_offset"] else 0
-    )
-    gutter = image_bounds["gutter"] if image_bounds["gutter"] else 0
-    if image_bounds["x"] == 0 and image_bounds["y"] == 0:
-        width, height = img.size
-        width = width - (x_offset + x_right_offset + (4 * gutter))
-        height = height - (y_offset + y_bottom_offset + (4 * gutter))
+    return image_bounds.get("rows") or 5, image_bounds.get("columns") or 5
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_card_geometry(image_bounds: tuple, image_size: tuple) -> tuple:
+    image_bounds = dict(image_bounds)
+    rows, columns = card_grid(image_bounds)
+    x_offset = image_bounds.get("x_offset") or 0
+    y_offset = image_bounds.get("y_offset") or 0
+    x_right_offset = image_bounds.get("x_right_offset") or 0
+    y_bottom_offset = image_bounds.get("y_bottom_offset") or 0
+    gutter = image_bounds.get("gutter") or 0
+    if image_bounds.get("x", 0) == 0 and image_bounds.get("y", 0) == 0:
+        width, height = image_size
+        width = width - (x_offset + x_right_offset + ((columns - 1) * gutter))
+        height = height - (y_offset + y_bottom_offset + ((rows - 1) * gutter))
     else:
         width = image_bounds["x"]
         height = image_bounds["y"]
@@ -490,57 +2051,401 @@ def mark_on_image_tile_complete(team_name: str, row: int, column: int) -> None:
     line_width = int(width * 0.01 / 2)
 
     # Calculate the dimensions of each bingo tile
-    tile_width = width // 5  # Assuming a 5x5 bingo board
-    tile_height = height // 5
-
-    # Adjust the row and column to be zero-indexed
-    row -= 1
-    column -= 1
-
-    # Calculate the coordinates of the specified bingo tile
-    x1 = (column * tile_width) + x_offset + (column * gutter)
-    y1 = (row * tile_height) + y_offset + (row * gutter)
-    x2 = ((column + 1) * tile_width) + x_offset + (column * gutter)
-    y2 = ((row + 1) * tile_height) + y_offset + (row * gutter)
-
-    # Create a drawing object
-    draw = ImageDraw.Draw(img)
-
-    # Draw a red square on the specified bingo tile
-    draw.rectangle([x1, y1, x2, y2], outline="red", width=line_width)
-
-    # Draw an X on the square
-    draw.line([(x1, y1), (x2, y2)], fill="red", width=line_width)
-    draw.line([(x1, y2), (x2, y1)], fill="red", width=line_width)
-
-    # Save the modified image
-    img_name = f"{team_name}-{row+1}-{column+1}.png"
-    new_image_path = os.path.join(os.path.dirname(image_path), img_name)
-    img.save(new_image_path)
-    settings["teams"][team_name]["image"] = new_image_path
-    update_settings_json(settings)
-    return settings
+    tile_width = width // columns
+    tile_height = height // rows
+
+    # every tile of the grid at once, rows and columns broadcast against each other
+    column = np.arange(columns)
+    row = np.arange(rows)[:, np.newaxis]
+    boxes = np.empty((rows, columns, 5), dtype=np.int64)
+    boxes[..., 0] = (column * tile_width) + x_offset + (column * gutter)
+    boxes[..., 1] = (row * tile_height) + y_offset + (row * gutter)
+    boxes[..., 2] = ((column + 1) * tile_width) + x_offset + (column * gutter)
+    boxes[..., 3] = ((row + 1) * tile_height) + y_offset + (row * gutter)
+    boxes[..., 4] = line_width
+    return tuple(map(tuple, boxes.reshape(-1, 5).tolist()))
+
+
+def card_geometry(image_bounds: dict, image_size: tuple) -> tuple:
+    """
+    Get the tile boxes of the bingo card, compiled once per bounds and image size.
+
+    Args:
+        image_bounds (dict): settings["image_bounds"] in its settings.json format.
+        image_size (tuple): (width, height) of the card image, used when the bounds leave x and y at 0.
+
+    Returns:
+        tuple: (x1, y1, x2, y2, line_width) per tile, indexed by (row - 1) * columns + (column - 1).
+    """
+    return _compile_card_geometry(tuple(sorted(image_bounds.items())), tuple(image_size))
+
+
+def tiles_completed_mask(tiles_completed: list, rows: int = 5, columns: int = 5) -> int:
+    """
+    Pack a team's completed tiles into a bitmap, bit (row - 1) * columns + (column - 1) per tile.
+
+    Args:
+        tiles_completed (list): [row, column] pairs from settings["teams"][team]["tiles_completed"].
+        rows (int, optional): Rows of the card. Defaults to 5.
+        columns (int, optional): Columns of the card. Defaults to 5.
+
+    Returns:
+        int: The completion bitmap.
+    """
+    mask = 0
+    for row, column in tiles_completed:
+        if 1 <= row <= rows and 1 <= column <= columns:
+            mask |= 1 << ((row - 1) * columns + (column - 1))
+    return mask
+
+
+class CardCompositor:
+    """
+    Renders bingo cards from the clean template and each team's completion bitmap.
+
+    The last rendered card of every team is kept with the bitmap it was drawn
+    from. A new render only touches the tiles whose bit changed: marks are drawn
+    onto the cached card and un-marked tiles get their template pixels pasted
+    back. Changing the template, the bounds or the asset version renders the
+    card again from the template. Each card has its own lock, so teams' cards
+    render in parallel on the pool.
+    """
+
+    def __init__(self, *, max_cards: int = IMAGE_CACHE_MAX_IMAGES):
+        self.max_cards = max_cards
+        self._cards = collections.OrderedDict()
+        self._card_locks = {}
+        self._lock = threading.Lock()
+
+    def _card_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._card_locks.setdefault(key, threading.Lock())
+
+    @staticmethod
+    def _tiles(mask: int, columns: int) -> list:
+        return [(bit // columns + 1, bit % columns + 1) for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+    @staticmethod
+    def _region(box: tuple, size: tuple) -> tuple:
+        x1, y1, x2, y2, line_width = box
+        pad = line_width + 1
+        return max(x1 - pad, 0), max(y1 - pad, 0), min(x2 + pad, size[0]), min(y2 + pad, size[1])
+
+    @staticmethod
+    def _mark(draw: ImageDraw.ImageDraw, box: tuple) -> None:
+        x1, y1, x2, y2, line_width = box
+        # Draw a red square on the specified bingo tile
+        draw.rectangle([x1, y1, x2, y2], outline="red", width=line_width)
+        # Draw an X on the square
+        draw.line([(x1, y1), (x2, y2)], fill="red", width=line_width)
+        draw.line([(x1, y2), (x2, y1)], fill="red", width=line_width)
+
+    def render(self, key: str, template: Image.Image, template_key: tuple, image_bounds: dict, mask: int) -> Image.Image:
+        """
+        Get the card for a completion bitmap.
+
+        Args:
+            key (str): Identifies the card, the path it is saved to.
+            template (Image.Image): The clean card image.
+            template_key (tuple): Anything that changes when the template or bounds change.
+            image_bounds (dict): settings["image_bounds"] in its settings.json format.
+            mask (int): The completion bitmap from tiles_completed_mask().
+
+        Returns:
+            Image.Image: A copy of the rendered card, the caller's to keep.
+        """
+        with self._card_lock(key):
+            with self._lock:
+                cached = self._cards.get(key)
+            if cached is not None and cached[0] == template_key:
+                img, drawn = cached[1], cached[2]
+                changed = drawn ^ mask
+            else:
+                img, changed = template.copy(), mask
+                if img.mode not in ("RGB", "RGBA"):
+                    img = img.convert("RGBA")
+            if changed:
+                size = img.size
+                columns = card_grid(image_bounds)[1]
+                geometry = card_geometry(image_bounds, size)
+                boxes = {
+                    tile: geometry[(tile[0] - 1) * columns + tile[1] - 1]
+                    for tile in self._tiles(mask | changed, columns)
+                }
+                draw = ImageDraw.Draw(img)
+                removed = self._tiles(changed & ~mask, columns)
+                redraw = set(self._tiles(changed & mask, columns))
+                for tile in removed:
+                    region = self._region(boxes[tile], size)
+                    img.paste(template.crop(region), region[:2])
+                    # a cleared region can overlap the mark of a neighbouring tile
+                    for other in self._tiles(mask, columns):
+                        ox1, oy1, ox2, oy2 = self._region(boxes[other], size)
+                        if ox1 < region[2] and region[0] < ox2 and oy1 < region[3] and region[1] < oy2:
+                            redraw.add(other)
+                for tile in sorted(redraw):
+                    self._mark(draw, boxes[tile])
+            with self._lock:
+                self._cards[key] = (template_key, img, mask)
+                self._cards.move_to_end(key)
+                while len(self._cards) > self.max_cards:
+                    self._cards.popitem(last=False)
+            # the next render of this card draws on the cached image while this one may still be encoding
+            return img.copy()
+
+
+card_compositor = CardCompositor()
+
+
+@dataclasses.dataclass(slots=True)
+class EncodedImage:
+    data: bytes
+    format: str
+    size: tuple
+    seconds: float
+
+    @property
+    def extension(self) -> str:
+        return ImageEncoder.EXTENSIONS[self.format]
+
+
+class ImageEncoder:
+    """
+    Encodes rendered cards and boards for upload within a byte budget.
+
+    The image is first scaled down so its longest side fits max_dimension. If the
+    encoded result is still over max_bytes, lossy formats step their quality down,
+    png falls back to a 256 colour palette and after that the image is scaled down
+    further until it fits or reaches MIN_DIMENSION. An image that still does not
+    fit is logged and returned over budget.
+    """
+
+    EXTENSIONS = {"png": ".png", "palette": ".png", "webp": ".webp", "jpeg": ".jpg"}
+    QUALITY_STEPS = (85, 75, 65, 50)
+    MIN_DIMENSION = 512
+
+    def __init__(
+        self,
+        format: str = IMAGE_UPLOAD_FORMAT,
+        *,
+        max_bytes: int = IMAGE_UPLOAD_MAX_BYTES,
+        max_dimension: int = IMAGE_UPLOAD_MAX_DIMENSION,
+        png_compress_level: int = IMAGE_PNG_COMPRESS_LEVEL,
+    ):
+        if format not in self.EXTENSIONS:
+            raise ValueError(f"Unknown image upload format: {format}")
+        self.format = format
+        self.max_bytes = max_bytes
+        self.max_dimension = max_dimension
+        self.png_compress_level = png_compress_level
+        self.stats = {"images": 0, "bytes": 0, "seconds": 0.0, "over_budget": 0}
+
+    @property
+    def extension(self) -> str:
+        return self.EXTENSIONS[self.format]
+
+    def _save(self, img: Image.Image, format: str, quality: int) -> bytes:
+        buffer = BytesIO()
+        if format == "png":
+            img.save(buffer, format="PNG", compress_level=self.png_compress_level)
+        elif format == "palette":
+            palette_img = img if img.mode == "P" else img.quantize(256)
+            palette_img.save(buffer, format="PNG", optimize=True)
+        elif format == "webp":
+            img.save(buffer, format="WEBP", quality=quality, method=4)
+        else:
+            img.convert("RGB").save(buffer, format="JPEG", quality=quality, optimize=True)
+        return buffer.getvalue()
+
+    def encode(self, img: Image.Image) -> EncodedImage:
+        """
+        Encode an image within the byte budget.
+
+        Args:
+            img (Image.Image): The rendered image, left untouched.
+
+        Returns:
+            EncodedImage: The encoded bytes with the format, size and time spent.
+        """
+        start = time.perf_counter()
+        if max(img.size) > self.max_dimension:
+            img = img.copy()
+            img.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+        format = self.format
+        while True:
+            for quality in self.QUALITY_STEPS if format in ("webp", "jpeg") else (None,):
+                data = self._save(img, format, quality)
+                if len(data) <= self.max_bytes:
+                    break
+            if len(data) <= self.max_bytes:
+                break
+            if format == "png":
+                format = "palette"
+                continue
+            if max(img.size) <= self.MIN_DIMENSION:
+                break
+            # the last step stops at MIN_DIMENSION rather than a quarter below it
+            scale = max(0.75, self.MIN_DIMENSION / max(img.size))
+            img = img.resize(
+                (max(round(img.size[0] * scale), 1), max(round(img.size[1] * scale), 1)), Image.LANCZOS
+            )
+        if len(data) > self.max_bytes:
+            print(
+                f"Encoded {format} image is {len(data)} bytes at {img.size[0]}x{img.size[1]}, "
+                f"over the {self.max_bytes} byte budget"
+            )
+        return EncodedImage(data, format, img.size, time.perf_counter() - start)
+
+    def record(self, encoded: EncodedImage) -> None:
+        """
+        Add an encoded image to the stats. Called on the event loop as encoding may run in another process.
+
+        Args:
+            encoded (EncodedImage): The result of encode().
+        """
+        self.stats["images"] += 1
+        self.stats["bytes"] += len(encoded.data)
+        self.stats["seconds"] += encoded.seconds
+        if len(encoded.data) > self.max_bytes:
+            self.stats["over_budget"] += 1
+
+
+image_encoder = ImageEncoder(
+    getattr(config, "IMAGE_UPLOAD_FORMAT", IMAGE_UPLOAD_FORMAT),
+    max_bytes=getattr(config, "IMAGE_UPLOAD_MAX_BYTES", IMAGE_UPLOAD_MAX_BYTES),
+    max_dimension=getattr(config, "IMAGE_UPLOAD_MAX_DIMENSION", IMAGE_UPLOAD_MAX_DIMENSION),
+    png_compress_level=getattr(config, "IMAGE_PNG_COMPRESS_LEVEL", IMAGE_PNG_COMPRESS_LEVEL),
+)
+
+
+def write_image_bytes(path: str, data: bytes) -> None:
+    """
+    Write an encoded image to disk, replacing the old file in one step.
+
+    Args:
+        path (str): Where to save the image.
+        data (bytes): The encoded image.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def render_bingo_card(
+    template_path: str, image_bounds: dict, tiles_completed: list, card_path: str, asset_version: int
+) -> EncodedImage:
+    """
+    Render a team's bingo card from the template and its completed tiles.
+    Runs on the render pool, so it only takes and returns plain picklable values.
+
+    Args:
+        template_path (str): The clean card image.
+        image_bounds (dict): settings["image_bounds"] in its settings.json format.
+        tiles_completed (list): [row, column] pairs of the completed tiles.
+        card_path (str): Identifies the team's card, a copy of the encoded card is also saved here.
+        asset_version (int): image_assets.version when the job was submitted.
+
+    Returns:
+        EncodedImage: The encoded card, ready to upload.
+    """
+    image_assets.sync_version(asset_version)
+    template = image_assets.image(template_path)
+    template_key = (os.path.abspath(template_path), image_assets.version, tuple(sorted(image_bounds.items())))
+    mask = tiles_completed_mask(tiles_completed, *card_grid(image_bounds))
+    img = card_compositor.render(card_path, template, template_key, image_bounds, mask)
+    encoded = image_encoder.encode(img)
+    write_image_bytes(card_path, encoded.data)
+    return encoded
+
+
+def team_card_template(settings: dict, team_name: str) -> str:
+    """
+    Get the clean card image a team's bingo card is drawn on.
+
+    Args:
+        settings (dict): The bingo settings.
+        team_name (str): The name of the team.
+
+    Returns:
+        str: Path of the template image.
+    """
+    image_path = settings["teams"][team_name].get("image") or ""
+    image_path = os.path.abspath(image_path) if image_path else ""
+    # cards used to be saved as {team}-{row}-{column}.png and chained, those already carry marks
+    if (
+        not image_path
+        or not os.path.exists(image_path)
+        or os.path.basename(image_path).startswith(f"{team_name}-")
+    ):
+        image_path = os.path.join(guild_image_path(), "bingo_card_image.png")
+    return image_path
+
+
+def team_card_path(settings: dict, team_name: str) -> str:
+    """
+    Get the image to post as a team's bingo card: the rendered card once a tile
+    is completed, otherwise the template.
+
+    Args:
+        settings (dict): The bingo settings.
+        team_name (str): The name of the team.
+
+    Returns:
+        str: Path of the card image.
+    """
+    card_path = os.path.join(guild_image_path(), "cards", f"{team_name}{image_encoder.extension}")
+    if settings["teams"][team_name].get("tiles_completed") and os.path.exists(card_path):
+        return card_path
+    return team_card_template(settings, team_name)
+
+
+async def render_team_card(team_name: str, settings: dict = None) -> EncodedImage:
+    """
+    Render a team's bingo card from its tiles_completed.
+    The drawing and encoding run on the render pool.
+
+    Args:
+        team_name (str): The name of the team.
+        settings (dict, optional): The bingo settings. Loaded if not given.
+
+    Returns:
+        EncodedImage: The encoded card, also saved in cards/.
+    """
+    if settings is None:
+        settings = read_settings_json()
+    cards_path = os.path.join(guild_image_path(), "cards")
+    os.makedirs(cards_path, exist_ok=True)
+    encoded = await render_service.run(
+        render_bingo_card,
+        team_card_template(settings, team_name),
+        settings["image_bounds"].to_dict(),
+        [list(tile) for tile in settings["teams"][team_name].get("tiles_completed", [])],
+        os.path.join(cards_path, f"{team_name}{image_encoder.extension}"),
+        image_assets.version,
+    )
+    image_encoder.record(encoded)
+    return encoded
 
 
 async def parse_table_location(location: str):
-    if location == "":
+    """
+    Parse an Excel style tile location, column letters followed by the row number: "A1", "C12", "AA3".
+
+    Args:
+        location (str): The location of the tile in the Bingo Card.
+
+    Returns:
+        tuple: (row, column) starting at 1, (0, 0) if the location can't be parsed.
+    """
+    match = re.fullmatch(r"\s*([A-Za-z]+)\s*(\d+)\s*", location or "")
+    if not match:
         return 0, 0
+    col = 0
+    for letter in match.group(1).upper():
+        col = col * 26 + ord(letter) - ord("A") + 1
     # TODO IMAGE is backwards from EXCEL
-    col, row = location[0], location[1]
-    if col.lower() == "a":
-        col = 1
-    elif col.lower() == "b":
-        col = 2
-    elif col.lower() == "c":
-        col = 3
-    elif col.lower() == "d":
-        col = 4
-    elif col.lower() == "e":
-        col = 5
-    else:
-        col = 0
-    # return int(row), int(col) # EXCEL VERSION - ROW, COLUMN
-    return int(row), int(col) # IMAGE VERSION - COLUMN, ROW
+    return int(match.group(2)), col # IMAGE VERSION - COLUMN, ROW
 
 
 def generate_team_assignment_text(all_roles, total_teams) -> str:
@@ -551,146 +2456,383 @@ def generate_team_assignment_text(all_roles, total_teams) -> str:
     all_roles (list): A list of roles representing the teams.
     total_teams (int): The total number of teams to generate assignments for.
 
-    Returns:
-    str: A string representation of team assignments, with each line containing the role name followed by the IDs of the members in that role.
+    Returns:
+    str: A string representation of team assignments, with each line containing the role name followed by the IDs of the members in that role.
+    """
+    content = []
+    all_roles.sort(key=lambda x: x.name)
+    for i, role in enumerate(all_roles):
+        # print(i, role.name)
+        if i >= total_teams:
+            continue
+        formatted_text = f"# {role.name}:\n{' '.join([f'<@{str(r.id)}>' for r in role.members])}\n"
+        content.append(formatted_text)
+    content.sort()
+    return '\n'.join(content)
+
+class SnakeBoard:
+    """
+    Topology of a chutes and ladders board: a tile_count long track laid out
+    in rows of `columns` tiles that alternate direction, starting bottom left.
+
+    Every move is precomputed into a dense (tile + 1) x (DICE_SIDES + 1) array,
+    so landing on a ladder or chute and bouncing back off the last tile are a
+    single lookup.
+    """
+
+    # how a move was altered, used as the prefix of the new tile channel
+    PLAIN, LADDER, CHUTE, BOUNCE = 0, 1, 2, 3
+    ALTERED_PREFIX = (None, "ladder-", "rats-", "bounce back-")
+
+    __slots__ = ("tile_count", "columns", "rows", "shortcuts", "moves", "altered")
+
+    def __init__(self, tile_count: int = 100, columns: int = 10, shortcuts: tuple = CNL_SHORTCUTS, dice_sides: int = DICE_SIDES):
+        self.tile_count = tile_count
+        self.columns = columns
+        self.rows = math.ceil(tile_count / columns)
+        invalid = invalid_shortcuts(shortcuts, tile_count)
+        self.shortcuts = tuple(x for x in shortcuts if x not in invalid)
+        jump = np.arange(tile_count + 1)
+        for start, end in self.shortcuts:
+            jump[start] = end
+        landing = np.arange(tile_count + 1)[:, np.newaxis] + np.arange(dice_sides + 1)
+        over = landing > tile_count
+        # bounce back CNL Tile 98 + 6 > 98 + 2 = 100 -4 = 96 > Tile 96
+        bounced = np.clip(2 * tile_count - landing, 0, tile_count)
+        target = jump[np.minimum(landing, tile_count)]
+        self.moves = np.where(over, bounced, target)
+        self.altered = np.select(
+            [over, target > landing, target < landing],
+            [self.BOUNCE, self.LADDER, self.CHUTE],
+            self.PLAIN,
+        )
+        self.moves.setflags(write=False)
+        self.altered.setflags(write=False)
+
+    def move(self, tile: int, roll: int) -> tuple:
+        """
+        Move a team from a tile by a dice roll.
+
+        Args:
+            tile (int): The tile the team is on.
+            roll (int): The dice roll.
+
+        Returns:
+            tuple: (new tile, prefix naming how the move was altered or None)
+        """
+        return int(self.moves[tile, roll]), self.ALTERED_PREFIX[self.altered[tile, roll]]
+
+    def row_and_column(self, tile: int) -> tuple:
+        """
+        Get the row (counted from the top) and column (from the left) of a tile, both starting at 1.
+        """
+        row = (tile - 1) // self.columns
+        column = (tile - 1) % self.columns + 1
+        if row % 2 == 1:
+            # every other row runs right to left
+            column = self.columns + 1 - column
+        return self.rows - row, column
+
+
+def invalid_shortcuts(shortcuts: tuple, tile_count: int) -> list:
+    """
+    Get the ladders and chutes that start or end outside tiles 1 to tile_count.
+    """
+    return [(a, b) for a, b in shortcuts if not (1 <= a <= tile_count and 1 <= b <= tile_count)]
+
+
+@functools.lru_cache(maxsize=16)
+def _build_snake_board(tile_count: int, columns: int, shortcuts: tuple) -> SnakeBoard:
+    invalid = invalid_shortcuts(shortcuts, tile_count)
+    if invalid:
+        # logged once per layout, /set_board_bounds and /upload_tiles report them to the moderator
+        print(f"Ignoring ladders and chutes outside tiles 1-{tile_count}: {invalid}")
+    return SnakeBoard(tile_count, columns, shortcuts)
+
+
+def board_shortcuts(settings: dict) -> tuple:
+    """
+    Get the ladders and chutes of the board from CNL_SHORTCUTS_SOURCE in config.py.
+
+    "config" uses CNL_SHORTCUTS in config.py or the default board. "tiles" reads the
+    tile sheet, a tile whose tile_num and sabotage column are both whole numbers moves
+    from its tile to the sabotage tile.
+
+    Args:
+        settings (dict): The bingo settings.
+
+    Returns:
+        tuple: (tile, tile to move to) pairs, not checked against the board size.
+    """
+    if getattr(config, "CNL_SHORTCUTS_SOURCE", CNL_SHORTCUTS_SOURCE) != "tiles":
+        return tuple(tuple(x) for x in getattr(config, "CNL_SHORTCUTS", CNL_SHORTCUTS))
+    shortcuts = []
+    for tile in settings["items"].values():
+        if tile is None:
+            continue
+        start, end = str(tile.tile_num or "").strip(), str(tile.sabotage or "").strip()
+        # isdecimal, unlike isdigit, is only true for what int() parses
+        if start.isdecimal() and end.isdecimal():
+            shortcuts.append((int(start), int(end)))
+    return tuple(shortcuts)
+
+
+def snake_board(settings: dict) -> SnakeBoard:
+    """
+    Get the chutes and ladders board of the current settings, built once per layout.
+    Ladders and chutes come from board_shortcuts(), those outside the board are left out.
+
+    Args:
+        settings (dict): The bingo settings.
+
+    Returns:
+        SnakeBoard: The board.
+    """
+    board_bounds = settings["board_bounds"]
+    return _build_snake_board(
+        board_bounds.get("tile_count") or 100, board_bounds.get("columns") or 10, board_shortcuts(settings)
+    )
+
+
+def calculate_row_and_column(score, board_bounds: dict = None):
+    board_bounds = board_bounds or {}
+    board = _build_snake_board(board_bounds.get("tile_count") or 100, board_bounds.get("columns") or 10, ())
+    return board.row_and_column(score)
+
+
+@functools.lru_cache(maxsize=16)
+def _compile_board_geometry(board_bounds: tuple) -> tuple:
+    board_bounds = dict(board_bounds)
+    tile_size = board_bounds.get("tile_size") or 0
+    gutter = board_bounds.get("gutter") or 0
+    x_offset = board_bounds.get("x_offset") or 0
+    y_offset = board_bounds.get("y_offset") or 0
+    origins = [None]
+    for score in range(1, (board_bounds.get("tile_count") or 100) + 1):
+        row, column = calculate_row_and_column(score, board_bounds)
+        column_multiplier = column - 1 if column > 1 else 0
+        row_multiplier = row - 1 if row > 1 else 0
+        width = x_offset + column_multiplier * (gutter + tile_size)
+        height = y_offset + row_multiplier * (gutter + tile_size)
+        origins.append((width, height))
+    return tuple(origins)
+
+
+def board_geometry(board_bounds: dict) -> tuple:
+    """
+    Get the pixel origin of every tile on the chutes and ladders board, compiled once per bounds.
+
+    Args:
+        board_bounds (dict): settings["board_bounds"] in its settings.json format.
+
+    Returns:
+        tuple: (x, y) of the top left corner indexed by score, index 0 is unused.
+    """
+    return _compile_board_geometry(tuple(sorted(board_bounds.items())))
+
+
+def calculate_location_x_and_y(score, board_bounds: dict = None):
+    if board_bounds is None:
+        board_bounds = read_settings_json()["board_bounds"].to_dict()
+    return board_geometry(board_bounds)[score]
+
+
+def layout_team_icons(scores: list, icon_sizes: list, origins: tuple, board_bounds: dict) -> list:
+    """
+    Place the team icons on the chutes and ladders board in one pass.
+
+    Teams are grouped by tile. A team alone on its tile keeps its icon at full size
+    at the team icon offsets. Teams sharing a tile get the cells of a near square
+    grid over the tile, icons are scaled down to fit their cell so none overlap.
+
+    Args:
+        scores (list): The tile of every team, in team icon order. Teams on tile 0 are left off the board.
+        icon_sizes (list): (width, height) of every team icon, reused in turn when there are more teams than icons.
+        origins (tuple): board_geometry() of the board.
+        board_bounds (dict): settings["board_bounds"] in its settings.json format.
+
+    Returns:
+        list: (team icon index, x, y, width, height) for every icon to paste.
+    """
+    scores = np.asarray(scores, dtype=np.int64)
+    placed = np.flatnonzero(scores > 0)
+    if not placed.size:
+        return []
+    tile_size = board_bounds.get("tile_size") or 0
+    x_offset = board_bounds.get("team_icon_x_offset") or 0
+    y_offset = board_bounds.get("team_icon_y_offset") or 0
+
+    # group the teams by tile and number them within their group
+    _, group, counts = np.unique(scores[placed], return_inverse=True, return_counts=True)
+    order = np.argsort(group, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    shared = counts[group]
+
+    # a near square grid of cells per tile, one cell per team
+    columns = np.ceil(np.sqrt(shared)).astype(np.int64)
+    rows = np.ceil(shared / columns).astype(np.int64)
+    cell_width = np.maximum((tile_size - x_offset) // columns, 1)
+    cell_height = np.maximum((tile_size - y_offset) // rows, 1)
+
+    icons = placed % len(icon_sizes)
+    sizes = np.asarray(icon_sizes, dtype=np.int64)[icons]
+    scale = np.minimum(1.0, np.minimum(cell_width / sizes[:, 0], cell_height / sizes[:, 1]))
+    scale = np.where(shared == 1, 1.0, scale)
+    width = np.maximum(np.floor(sizes[:, 0] * scale), 1).astype(np.int64)
+    height = np.maximum(np.floor(sizes[:, 1] * scale), 1).astype(np.int64)
+
+    tile_origins = np.asarray(origins[1:], dtype=np.int64)[scores[placed] - 1]
+    x = tile_origins[:, 0] + x_offset + (rank % columns) * cell_width
+    y = tile_origins[:, 1] + y_offset + (rank // columns) * cell_height
+    return [tuple(int(v) for v in placement) for placement in zip(icons, x, y, width, height)]
+
+
+def render_team_icons_board(
+    template_path: str, placements: list, confetti: bool, new_image_path: str, asset_version: int
+) -> EncodedImage:
+    """
+    Paste the team icons onto the chutes and ladders board.
+    Runs on the render pool, so it only takes and returns plain picklable values.
+
+    Args:
+        template_path (str): The clean board image.
+        placements (list): (team icon index, x, y, width, height) for every icon to paste.
+        confetti (bool): Whether to add the confetti overlay for a winner.
+        new_image_path (str): Where to save a copy of the encoded board.
+        asset_version (int): image_assets.version when the job was submitted.
+
+    Returns:
+        EncodedImage: The encoded board, ready to upload.
+    """
+    image_assets.sync_version(asset_version)
+    img_board = image_assets.image(template_path).convert("RGBA")
+    team_icons = image_assets.team_icons()
+    # every icon goes on one transparent layer that is composited onto the board once
+    overlay = Image.new("RGBA", img_board.size)
+    for i, x, y, width, height in placements:
+        icon = team_icons[i].convert("RGBA")
+        if icon.size != (width, height):
+            icon = icon.resize((width, height), Image.LANCZOS)
+        overlay.alpha_composite(icon, (max(x, 0), max(y, 0)), (max(-x, 0), max(-y, 0)))
+    if confetti:
+        overlay.alpha_composite(image_assets.confetti().convert("RGBA"))
+    img_board.alpha_composite(overlay)
+    encoded = image_encoder.encode(img_board)
+    write_image_bytes(new_image_path, encoded.data)
+    return encoded
+
+
+def board_render_key(template_path: str, board_bounds: dict, placements: list, confetti: bool) -> str:
+    """
+    Hash everything that decides how a chutes and ladders board render looks, including the upload encoding.
+
+    Args:
+        template_path (str): The clean board image.
+        board_bounds (dict): settings["board_bounds"] in its settings.json format.
+        placements (list): (team icon index, x, y, width, height) for every icon to paste.
+        confetti (bool): Whether the confetti overlay is added.
+
+    Returns:
+        str: Hex digest naming the render in generated/.
+    """
+    key = {
+        # file fingerprints rather than image_assets.version, so renders on disk are reused after a restart
+        "template": [os.path.abspath(template_path), *image_assets.fingerprint(template_path)],
+        "icons": image_assets.board_assets_fingerprint(),
+        "icon_scale": image_assets.icon_scale,
+        "bounds": board_bounds,
+        "placements": [list(x) for x in placements],
+        "confetti": confetti,
+        "encoder": [image_encoder.format, image_encoder.max_bytes, image_encoder.max_dimension],
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:24]
+
+
+def evict_board_renders(generated_path: str, max_count: int = BOARD_RENDER_CACHE_MAX) -> int:
     """
-    content = []
-    all_roles.sort(key=lambda x: x.name)
-    for i, role in enumerate(all_roles):
-        # print(i, role.name)
-        if i >= total_teams:
-            continue
-        formatted_text = f"# {role.name}:\n{' '.join([f'<@{str(r.id)}>' for r in role.members])}\n"
-        content.append(formatted_text)
-    content.sort()
-    return '\n'.join(content)
+    Remove the least recently used board renders from generated/ past max_count.
 
-def calculate_shortcut(score):
-    idx = [x[1] for x in CNL_SHORTCUTS if x[0] == score]
-    if idx:
-        return idx[0]
-
-def calculate_row_and_column(score):
-    # breakpoint()
-    row = math.floor((score-1) / 10)
-    actual_row = 10 - row
-    column = score % 10
-    if column == 0:
-        column = 10
-    row_even = True if row % 2 == 1 else False
-    if row_even:
-        actual_column = 11 - column
-    else:
-        actual_column = column
-    return actual_row, actual_column
+    Args:
+        generated_path (str): The generated/ folder next to the board template.
+        max_count (int, optional): Renders to keep. Defaults to BOARD_RENDER_CACHE_MAX.
 
-    
-def calculate_location_x_and_y(score):
-    settings = load_settings_json()
-    board_bounds = settings['board_bounds']
-    tile_size = board_bounds['tile_size']
-    row, column = calculate_row_and_column(score)
-    if column > 1:
-        column_multiplier = column - 1
-    else:
-        column_multiplier = 0
-    width_gutter = column_multiplier * board_bounds['gutter']
-    width_tile_spacing = column_multiplier * tile_size
-    width = board_bounds['x_offset'] + width_gutter + width_tile_spacing
-    row_multiplier = 0
-    if row > 1:
-        row_multiplier = row - 1
-    else:
-        row_multiplier = 0
-    height_gutter = row_multiplier * board_bounds['gutter']
-    height_tile_spacing = row_multiplier * tile_size
-    height = board_bounds['y_offset'] + height_gutter + height_tile_spacing
-    return width, height
+    Returns:
+        int: Number of files removed.
+    """
+    renders = []
+    for name in os.listdir(generated_path):
+        if name.startswith("CNL-"):
+            path = os.path.join(generated_path, name)
+            renders.append((os.path.getmtime(path), path))
+    renders.sort(reverse=True)
+    for _, path in renders[max_count:]:
+        os.remove(path)
+    return max(len(renders) - max_count, 0)
+
+
+async def mark_team_icons_on_board(interaction: discord.Interaction) -> tuple:
+    """
+    Render the chutes and ladders board with every team's icon on its current tile.
 
+    Args:
+        interaction (discord.Interaction): The Discord interaction object.
 
-async def mark_team_icons_on_board(interaction: discord.Interaction) -> str:
-    settings = load_settings_json()
+    Returns:
+        tuple: (path, encoded) of the render. encoded is the EncodedImage of the board, or None
+            when an identical earlier render in generated/ was reused.
+    """
+    settings = read_settings_json()
     if settings['bot_mode']['current'] != "chutes and ladders":
         await interaction.followup.send("Error: Bot mode is set to something other than 'chutes and ladders'")
         return 
     image_path_src = os.path.abspath(settings['board_template'])
     if not os.path.exists(image_path_src):
         image_path_src = os.path.join(IMAGE_TEMPLATE_PATH, "bingo_card_image.png")
-        settings['board_template'] = image_path_src
     board_bounds = settings["board_bounds"]
-    img_board = Image.open(image_path_src)
-    tile_count = board_bounds['tile_count']
-    tile_size = board_bounds['tile_size']
-    x_offset = board_bounds["x_offset"] if board_bounds["x_offset"] else 0
-    y_offset = board_bounds["y_offset"] if board_bounds["y_offset"] else 0
-    x_right_offset = (
-        board_bounds["x_right_offset"] if board_bounds["x_right_offset"] else 0
-    )
-    y_bottom_offset = (
-        board_bounds["y_bottom_offset"] if board_bounds["y_bottom_offset"] else 0
-    )
-    gutter = board_bounds["gutter"] if board_bounds["gutter"] else 0
-    if board_bounds["x"] == 0 and board_bounds["y"] == 0:
-        width, height = img_board.size
-        width = width - (x_offset + x_right_offset + (4 * gutter))
-        height = height - (y_offset + y_bottom_offset + (4 * gutter))
-    else:
-        width = board_bounds["x"]
-        height = board_bounds["y"]
     # add team_icon starting at highest team number to 1
-    icon_path = os.path.dirname(image_path_src)
-    icon_team_files = [x for x in os.listdir(icon_path) if "CNL_Team" in x]
-    icon_team_files.sort()
-    icon_team_files.reverse()
-    icon_team_files = [os.path.join(icon_path, x) for x in icon_team_files]
-    team_names = [x for x in settings['teams'].keys()]
-    team_names.reverse()
-    team_scores = [(x,settings['teams'][x]['current']) for x in settings['teams']]
-    team_scores.reverse()
-    all_scores = [x[1] for x in team_scores]
-    dupe_scores_processed = 0
-    for i in range(len(team_names)):
-        team_name = team_names[i]
-        score = team_scores[i][1]
-        if score == 0:
-            # do not draw on board
-            # print(f'skipping {team_name} due to score: 0')
-            continue
-        # check if score exists for other teams
-        shared_tile = False if all_scores.count(score) == 1 else True
-        number_of_tiles = all_scores.count(score)
-        # open image
-        img_team = Image.open(icon_team_files[i])
-        team_x, team_y = img_team.size
-        img_team = img_team.resize((math.floor(team_x * 0.75), math.floor(team_y * 0.75)))
-        x, y = calculate_location_x_and_y(score)
-        offset_width = tile_size - img_team.size[0]
-        if shared_tile:
-            offset_multiplier = number_of_tiles - dupe_scores_processed - 1
-            new_x = x + (board_bounds['team_icon_x_offset'] + offset_multiplier * (math.floor(offset_width / number_of_tiles)))
-            dupe_scores_processed += 1
-        else:
-            new_x = x + board_bounds['team_icon_x_offset']
-        new_y = y + board_bounds['team_icon_y_offset']
-        img_board.paste(img_team, (new_x, new_y), img_team)
-
-    if all_scores.count(100) >= 1:
-        # winners!
-        confetti_img = Image.open(os.path.join(os.path.dirname(image_path_src), "confetti.png"))
-        img_board.paste(confetti_img, (0,0), confetti_img)
-    img_name = f"CNL-{datetime.datetime.now()}.png"
+    icon_sizes = [icon.size for icon in image_assets.team_icons()]
+    all_scores = [team['current'] for team in settings['teams'].values()]
+    all_scores.reverse()
+    placements = layout_team_icons(
+        all_scores, icon_sizes, board_geometry(board_bounds.to_dict()), board_bounds.to_dict()
+    )
+
+    # winners!
+    confetti = all_scores.count(board_bounds.get("tile_count") or 100) >= 1
+    img_name = f"CNL-{board_render_key(image_path_src, board_bounds.to_dict(), placements, confetti)}{image_encoder.extension}"
     # check if "generated" folder exists
-    if not os.path.exists(os.path.join(os.path.dirname(image_path_src), "generated")):
-        os.mkdir(os.path.join(os.path.dirname(image_path_src), "generated"))
-    new_image_path = os.path.join(os.path.dirname(image_path_src), "generated", img_name)
-    img_board.save(new_image_path)
-    settings["board_latest"] = new_image_path
-    update_settings_json(settings)
-    return new_image_path
+    generated_path = os.path.join(os.path.dirname(image_path_src), "generated")
+    if not os.path.exists(generated_path):
+        os.mkdir(generated_path)
+    new_image_path = os.path.join(generated_path, img_name)
+    encoded = None
+    if os.path.exists(new_image_path):
+        # same positions as an earlier render, mark it as recently used
+        os.utime(new_image_path)
+    else:
+        encoded = await render_service.run(
+            render_team_icons_board,
+            image_path_src,
+            placements,
+            confetti,
+            new_image_path,
+            image_assets.version,
+        )
+        image_encoder.record(encoded)
+        evict_board_renders(generated_path)
+    fallback = image_path_src != os.path.abspath(settings['board_template'])
+    if fallback or settings.get("board_latest") != new_image_path:
+        # an unchanged board leaves the settings alone, no write and no wait on the guild lock
+        async with get_settings_store().global_transaction() as settings:
+            if not os.path.exists(os.path.abspath(settings['board_template'])):
+                settings['board_template'] = image_path_src
+            settings["board_latest"] = new_image_path
+    return new_image_path, encoded
 
 
 async def purge_images(type: str) -> str:
-    settings = load_settings_json()
+    settings = read_settings_json()
     if type == "chutes and ladders":
         folder_path = os.path.join(os.path.dirname(os.path.abspath(settings['board_template'])), "generated")
         old_image_files = [x for x in os.listdir(folder_path) if "CNL-" in x]
@@ -714,47 +2856,251 @@ async def send_or_update_tiles_channel(tile_list_ch, settings):
             # tile['short_desc']
             desc = tile["desc"]
             item_list.append(f"## {name}\n{desc}")
-    edited = False
     chunked_list = chunk_item_list_text(item_list)
-    i = 0
-    async for m in tile_list_ch.history(oldest_first=True):
-        if m.author == bot.user and i == 0:
-            edited = True
-            embed = discord.Embed(description=f'# All Tiles\n\n{chunked_list[i]}')
-            await m.edit(embed=embed)
-        elif m.author == bot.user:
-            embed = discord.Embed(description=f"{chunked_list[i]}")
-            await m.edit(embed=embed)
-        i += 1
-    if edited:
-        if len(chunked_list) > i:
-            # send remaining messages needed
-            for x in range(i, len(chunked_list)):
-                embed = discord.Embed(description=f"{chunked_list[x]}")
-                await tile_list_ch.send(embed=embed)
-    else:
-        for i in range(len(chunked_list)):
-            if i == 0:
-                embed = discord.Embed(description=f'# All Tiles\n\n{chunked_list[i]}')
-                await tile_list_ch.send(embed=embed)
-            else:
-                embed = discord.Embed(description=f"{chunked_list[i]}")
-                await tile_list_ch.send(embed=embed)
+    embeds = [
+        discord.Embed(description=f"# All Tiles\n\n{chunk}" if i == 0 else f"{chunk}")
+        for i, chunk in enumerate(chunked_list)
+    ]
+    messages = registered_messages(settings, "tile-list", tile_list_ch)
+    posted = []
+    try:
+        for message, embed in zip(messages, embeds):
+            posted.append(await message.edit(embed=embed))
+    except discord.NotFound:
+        print("Registered tile-list message was deleted, searching the channel")
+        messages = []
+    if not messages:
+        messages = await discover_bot_messages(tile_list_ch)
+        posted = [await message.edit(embed=embed) for message, embed in zip(messages, embeds)]
+    # send remaining messages needed
+    for embed in embeds[len(posted):]:
+        posted.append(await tile_list_ch.send(embed=embed))
+    # the list got shorter, remove the messages no longer needed
+    for message in messages[len(embeds):]:
+        with contextlib.suppress(discord.NotFound):
+            await message.delete()
+    await register_post("tile-list", tile_list_ch, posted)
 
 # ======================================= Discord Interaction Functions ====================================================
 
 
-async def get_default_channels(interaction: discord.Interaction):
+class GuildChannelIndex:
+    """
+    The channels of one guild indexed by name, by category and by the role a
+    channel plays for a team (its #bingo-card, #dice-roll, ...), so lookups do
+    not scan every channel of servers with hundreds of tile channels.
+
+    Built from the guild cache on first use and kept current by the
+    on_guild_channel_create/delete/update events.
+    """
+
+    def __init__(self, guild: discord.Guild):
+        self.guild_id = guild.id
+        # name -> {channel id: channel}, names are not unique in Discord
+        self._named = {}
+        self._categories = {}
+        # (category id, role) -> {channel id: channel}
+        self._roles = {}
+        for channel in guild.channels:
+            self.add(channel)
+
+    @staticmethod
+    def channel_role(name: str) -> Optional[str]:
+        """
+        Get the role of a channel from its name: "bingo-card" and "team-1-bingo-card" are both a bingo-card channel.
+        """
+        for role in CHANNEL_ROLES:
+            if name == role or name.endswith(f"-{role}"):
+                return role
+        return None
+
+    @staticmethod
+    def _first(table: dict, key) -> Optional[discord.abc.GuildChannel]:
+        channels = table.get(key)
+        return next(iter(channels.values())) if channels else None
+
+    def add(self, channel: discord.abc.GuildChannel) -> None:
+        if isinstance(channel, discord.CategoryChannel):
+            self._categories.setdefault(channel.name.lower(), {})[channel.id] = channel
+            return
+        self._named.setdefault(channel.name, {})[channel.id] = channel
+        role = self.channel_role(channel.name)
+        if role and channel.category_id:
+            self._roles.setdefault((channel.category_id, role), {})[channel.id] = channel
+
+    def remove(self, channel: discord.abc.GuildChannel) -> None:
+        if isinstance(channel, discord.CategoryChannel):
+            self._categories.get(channel.name.lower(), {}).pop(channel.id, None)
+            return
+        self._named.get(channel.name, {}).pop(channel.id, None)
+        role = self.channel_role(channel.name)
+        if role and channel.category_id:
+            self._roles.get((channel.category_id, role), {}).pop(channel.id, None)
+
+    def channel(self, name: str) -> Optional[discord.abc.GuildChannel]:
+        """
+        Get a channel by its exact name, e.g. "score-board".
+        """
+        return self._first(self._named, name)
+
+    def category(self, name: str) -> Optional[discord.CategoryChannel]:
+        """
+        Get a category by name, ignoring case. Team categories are named after the team.
+        """
+        return self._first(self._categories, name.lower())
+
+    def team_channel(self, team_name: str, role: str) -> Optional[discord.abc.GuildChannel]:
+        """
+        Get a team's channel by role, e.g. team_channel("Team 1", "bingo-card").
+
+        Args:
+            team_name (str): The name of the team, its category name.
+            role (str): One of CHANNEL_ROLES.
+
+        Returns:
+            The channel, or None if the team has no category or no such channel.
+        """
+        category = self.category(team_name)
+        if category is None:
+            return None
+        return self._first(self._roles, (category.id, role))
+
+
+guild_channel_indexes = {}
+
+
+def channel_index(guild: discord.Guild) -> GuildChannelIndex:
+    """
+    Get the channel index of a guild, building it on first use.
+
+    Args:
+        guild (discord.Guild): The Discord server.
+
+    Returns:
+        GuildChannelIndex: The guild's channel index.
+    """
+    index = guild_channel_indexes.get(guild.id)
+    if index is None:
+        index = guild_channel_indexes[guild.id] = GuildChannelIndex(guild)
+    return index
+
+
+def registered_messages(settings: dict, key: str, channel) -> list:
+    """
+    Get the messages registered for a managed post as partial messages, without any API call.
+
+    Posts are kept in settings["posts"][key] as {"channel": id, "id": first message id,
+    "messages": [ids], ...}. Posts saved before the channel was recorded are taken to be in channel.
+
+    Args:
+        settings (dict): The bingo settings.
+        key (str): The post key, like "score-board" or "bingo-card:Team 1".
+        channel: The channel the post should be in.
+
+    Returns:
+        list: discord.PartialMessage for every registered message, empty if none are registered in channel.
+    """
+    post = settings.get("posts", {}).get(key) or {}
+    if post.get("channel") not in (None, channel.id):
+        return []
+    message_ids = post.get("messages") or ([post["id"]] if post.get("id") else [])
+    return [channel.get_partial_message(int(x)) for x in message_ids]
+
+
+async def register_post(key: str, channel, messages: list, **fields) -> None:
+    """
+    Record the channel and message IDs of a managed post in settings["posts"].
+
+    Args:
+        key (str): The post key.
+        channel: The channel the messages are in.
+        messages (list): The post's messages, in order.
+        **fields: Extra values stored with the post, like its content.
+    """
+    async with get_settings_store().global_transaction() as settings:
+        post = settings.setdefault("posts", {}).setdefault(key, {})
+        post.update(
+            channel=channel.id,
+            id=messages[0].id if messages else None,
+            messages=[x.id for x in messages],
+            **fields,
+        )
+
+
+async def forget_post(key: str) -> None:
+    """
+    Drop a managed post from the registry, e.g. when its team is deleted.
+
+    Args:
+        key (str): The post key.
+    """
+    async with get_settings_store().global_transaction() as settings:
+        settings.get("posts", {}).pop(key, None)
+
+
+async def discover_bot_messages(channel, check=None) -> list:
+    """
+    Scan a channel's history for the bot's messages. Only used when a post is not
+    registered yet or its registered message was deleted.
+
+    Args:
+        channel: The channel to scan.
+        check (optional): Function taking a message, only messages it returns True for are kept.
+
+    Returns:
+        list: The bot's messages, oldest first.
+    """
+    return [
+        x async for x in channel.history(limit=None, oldest_first=True)
+        if x.author == bot.user and (check is None or check(x))
+    ]
+
+
+async def edit_registered_post(settings: dict, key: str, channel, *, check=None, **edit):
+    """
+    Edit the first message of a managed post straight through its registered ID.
+    Falls back to discover_bot_messages when nothing is registered in channel or
+    the message was deleted, and registers the message found.
+
+    Args:
+        settings (dict): The bingo settings.
+        key (str): The post key.
+        channel: The channel the post is in.
+        check (optional): Picks the post out of the bot's messages during discovery.
+        **edit: Passed to Message.edit().
+
+    Returns:
+        Optional[discord.Message]: The edited message, None if there is no post to edit and a new one should be sent.
+    """
+    for message in registered_messages(settings, key, channel)[:1]:
+        try:
+            return await message.edit(**edit)
+        except discord.NotFound:
+            print(f"Registered {key} message was deleted, searching {channel.name}")
+            for x in edit.get("attachments", []):
+                if isinstance(x, discord.File):
+                    x.reset()
+    found = await discover_bot_messages(channel, check)
+    if not found:
+        return None
+    message = await found[0].edit(**edit)
+    await register_post(key, channel, [message])
+    return message
+
+
+async def get_default_channels(interaction: discord.Interaction, settings: dict = None):
     """
     Get the default channels based on the current bot mode.
 
     Args:
         interaction (discord.Interaction): The Discord interaction object.
+        settings (dict, optional): The bingo settings. Defaults to the guild's settings.
 
     Returns:
         list: The list of default channels.
     """
-    settings = load_settings_json()
+    if settings is None:
+        settings = read_settings_json()
     if settings["bot_mode"]["current"] == "candyland":
         return CANDYLAND_DEFAULT_CHANNELS
     elif settings['bot_mode']['current'] == "chutes and ladders":
@@ -792,18 +3138,77 @@ async def clear_team_roles(interaction):
         interaction: The Discord interaction object.
     """
     roles = [discord.utils.get(interaction.guild.roles, name=rl) for rl in ROLES]
-    for member in interaction.guild.members:
-        await member.remove_roles(*roles)
+    # only members holding a team role are touched
+    await sync_roles(interaction.guild, role_sync_job(interaction, roles))
     print("Removed Team Roles from All Members")
 
+async def bingo_card_file(settings: dict, team_name: str, *, update: bool = False) -> discord.File:
+    """
+    Get a team's bingo card as an upload named bingo_card with the image's extension.
+
+    Args:
+        settings (dict): The bingo settings.
+        team_name (str): The name of the team.
+        update (bool, optional): Render the card again from the team's tiles_completed. Defaults to False.
+
+    Returns:
+        discord.File: The card, from memory when rendered, otherwise read from disk.
+    """
+    if update:
+        encoded = await render_team_card(team_name, settings)
+        return discord.File(BytesIO(encoded.data), filename=f"{BINGO_CARD_FILENAME}{encoded.extension}")
+    card_path = team_card_path(settings, team_name)
+    return discord.File(card_path, filename=f"{BINGO_CARD_FILENAME}{os.path.splitext(card_path)[1]}")
+
+
+async def upload_bingo_card(
+    bingo_card_chan, settings: dict, team_name: str, img: discord.File, *, update: bool = False
+) -> None:
+    """
+    Replace the bingo card image on the team's registered bingo card post, or post a new one.
+
+    Parameters:
+        bingo_card_chan: The team's #bingo-card channel.
+        settings (dict): The bingo settings, holding the registered posts.
+        team_name (str): The name of the team.
+        img (discord.File): The card from bingo_card_file().
+        update (bool, optional): Only changes what is printed. Defaults to False.
+
+    Returns:
+        None
+    """
+    title = f"{team_name} Bingo Card"
+    message = await edit_registered_post(
+        settings,
+        f"bingo-card:{team_name}",
+        bingo_card_chan,
+        check=lambda x: any(embed.title == title for embed in x.embeds),
+        attachments=[img],
+    )
+    if message is not None:
+        print(
+            f'{"Updated" if update else "Posted"} {team_name} Bingo Card Image'
+        )
+        return
+    print("image didnt exist, posting new image")
+    embed = discord.Embed(
+        title=title,
+        color=0xF7E302,
+    )
+    embed.set_image(
+        url=f"attachment://{img.filename}"
+    )
+    img.reset()
+    message = await bingo_card_chan.send(embed=embed, file=img)
+    await register_post(f"bingo-card:{team_name}", bingo_card_chan, [message])
+
+
 async def post_or_update_bingo_card(
     interaction: discord.Interaction,
     settings: dict,
     team_name: str,
     *,
     update: bool = False,
-    row: int = None,
-    column: int = None,
 ) -> None:
     """
     Posts or updates a bingo card image for a specific team in a Discord channel.
@@ -812,52 +3217,92 @@ async def post_or_update_bingo_card(
         interaction (discord.Interaction): The interaction object representing the user's interaction with the bot.
         settings (dict): The settings dictionary containing information about the teams and their bingo cards.
         team_name (str): The name of the team for which the bingo card image should be posted or updated.
-        update (bool, optional): Indicates whether the bingo card image should be updated. Defaults to False.
-        row (int, optional): The row number of the tile to be marked as complete. Required if update is True. Defaults to None.
-        column (int, optional): The column number of the tile to be marked as complete. Required if update is True. Defaults to None.
+        update (bool, optional): Indicates whether the bingo card should be rendered again from the team's tiles_completed. Defaults to False.
 
     Returns:
         None
     """
-    for cat in interaction.guild.categories:
-        if cat.name == team_name:
-            bingo_card_chan = [x for x in cat.channels if x.name == "bingo-card"][0]
-            processed = False
-            async for message in bingo_card_chan.history(limit=1):
-                if message.author == bot.user:
-                    if update and row and column:
-                        settings = mark_on_image_tile_complete(
-                            team_name, row=row, column=column
-                        )
-                        img = discord.File(settings["teams"][team_name]["image"])
-                    else:
-                        img = discord.File(settings["teams"][team_name]["image"])
-                    await message.edit(attachments=[img])
-                    processed = True
-                    print(
-                        f'{"Updated" if update and row and column else "Posted"} {team_name} Bingo Card Image'
-                    )
-            else:
-                if not processed:
-                    print("image didnt exist, posting new image")
-                    # print(settings["teams"][team_name]["image"])
-                    if update and row and column:
-                        settings = mark_on_image_tile_complete(
-                            team_name, row=row, column=column
-                        )
-                        img = discord.File(settings["teams"][team_name]["image"])
-                    else:
-                        img = discord.File(settings["teams"][team_name]["image"])
-                    embed = discord.Embed(
-                        title=f"{team_name} Bingo Card",
-                        color=0xF7E302,
-                    )
-                    embed.set_image(
-                        url=f"attachment://{settings['teams'][team_name]['image']}"
-                    )
-                    await bingo_card_chan.send(embed=embed, file=img)
-                else:
-                    print("image was already posted")
+    bingo_card_chan = channel_index(interaction.guild).team_channel(team_name, "bingo-card")
+    if bingo_card_chan is None:
+        return
+    img = await bingo_card_file(settings, team_name, update=update)
+    await upload_bingo_card(bingo_card_chan, settings, team_name, img, update=update)
+
+
+async def upload_bingo_card_limited(
+    channel, settings: dict, team_name: str, img: discord.File, slots: asyncio.Semaphore, *, update: bool = False
+) -> None:
+    """
+    Upload a team's bingo card once one of slots is free, retrying once after a long rate limit.
+
+    Parameters:
+        channel: The team's bingo-card channel.
+        settings (dict): The bingo settings.
+        team_name (str): The team the card belongs to.
+        img (discord.File): The rendered card from bingo_card_file().
+        slots (asyncio.Semaphore): Shared by the uploads of one command, UPLOAD_CONCURRENCY at a time.
+        update (bool, optional): Edit the registered card instead of posting a new one. Defaults to False.
+    """
+    async with slots:
+        try:
+            await upload_bingo_card(channel, settings, team_name, img, update=update)
+        except discord.RateLimited as e:
+            # only raised for waits longer than the client's max_ratelimit_timeout
+            await asyncio.sleep(e.retry_after)
+            img.reset()
+            await upload_bingo_card(channel, settings, team_name, img, update=update)
+
+
+async def post_or_update_bingo_cards(
+    interaction: discord.Interaction,
+    settings: dict,
+    team_names: list,
+    *,
+    update: bool = False,
+    progress=None,
+) -> list:
+    """
+    Posts or updates the bingo card images of several teams at once.
+    The cards are rendered in parallel on the render pool and uploaded
+    UPLOAD_CONCURRENCY at a time.
+
+    Parameters:
+        interaction (discord.Interaction): The interaction object representing the user's interaction with the bot.
+        settings (dict): The settings dictionary containing information about the teams and their bingo cards.
+        team_names (list): The teams to post the bingo card of.
+        update (bool, optional): Render the cards again from the teams' tiles_completed. Defaults to False.
+        progress (optional): Coroutine function called with (done, total) after every upload.
+
+    Returns:
+        list: The teams whose card could not be posted.
+    """
+    index = channel_index(interaction.guild)
+    channels = {x: index.team_channel(x, "bingo-card") for x in team_names}
+    channels = {x: ch for x, ch in channels.items() if ch is not None}
+    failed = [x for x in team_names if x not in channels]
+    team_names = [x for x in team_names if x in channels]
+    files = await asyncio.gather(
+        *(bingo_card_file(settings, x, update=update) for x in team_names), return_exceptions=True
+    )
+    slots = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+    done = 0
+
+    async def upload(team_name: str, img: discord.File):
+        nonlocal done
+        try:
+            if isinstance(img, Exception):
+                raise img
+            await upload_bingo_card_limited(channels[team_name], settings, team_name, img, slots, update=update)
+        except Exception as e:
+            print(f"Failed to post {team_name} Bingo Card Image: {e}")
+            failed.append(team_name)
+        done += 1
+        if progress:
+            await progress(done, len(team_names))
+
+    await asyncio.gather(*(upload(x, img) for x, img in zip(team_names, files)))
+    return failed
+
 
 async def update_team_bingo_card_channel(
     interaction: discord.Interaction, team_name, roll, settings, reroll=False
@@ -872,11 +3317,11 @@ async def update_team_bingo_card_channel(
     - settings (dict): The settings dictionary containing the current state of the bingo game.
     - reroll (bool, optional): Indicates whether the dice roll is a reroll. Defaults to False.
     """
-    for ch in interaction.channel.category.channels:
-        if ch.name.endswith("bingo-card"):
-            await ch.send(
-                f"{'Rerolling ' if reroll else ''}Dice roll: {roll} for team: {team_name}\nNew tile: {settings['teams'][team_name]['current']} << Old tile: {settings['teams'][team_name]['prev']}\nRerolls remaining: {settings['teams'][team_name]['reroll']}"
-            )
+    ch = channel_index(interaction.guild).team_channel(interaction.channel.category.name, "bingo-card")
+    if ch:
+        await ch.send(
+            f"{'Rerolling ' if reroll else ''}Dice roll: {roll} for team: {team_name}\nNew tile: {settings['teams'][team_name]['current']} << Old tile: {settings['teams'][team_name]['prev']}\nRerolls remaining: {settings['teams'][team_name]['reroll']}"
+        )
 
 async def update_reroll_team_bingo_card_channel(
     interaction: discord.Interaction, team_name, settings, used=True
@@ -890,11 +3335,11 @@ async def update_reroll_team_bingo_card_channel(
     - settings (dict): The settings dictionary containing information about the teams and their rerolls.
     - used (bool, optional): Indicates whether the reroll was used or awarded. Defaults to True.
     """
-    for ch in interaction.guild.channels:
-        if ch.name.endswith(f"{create_discord_friendly_name(team_name)}-bingo-card"):
-            await ch.send(
-                f"Reroll was {'used' if used else 'awarded'} for team: {team_name}\nRerolls remaining: {settings['teams'][team_name]['reroll']}"
-            )
+    ch = channel_index(interaction.guild).team_channel(team_name, "bingo-card")
+    if ch:
+        await ch.send(
+            f"Reroll was {'used' if used else 'awarded'} for team: {team_name}\nRerolls remaining: {settings['teams'][team_name]['reroll']}"
+        )
 
 
 async def update_server_score_board_channel(interaction: discord.Interaction, settings):
@@ -908,26 +3353,8 @@ async def update_server_score_board_channel(interaction: discord.Interaction, se
     Returns:
     None
     """
-    score_card_ch = discord.utils.get(interaction.guild.channels, name="score-board")
-    if settings["posts"]["score-board"]["id"]:
-        msg_id = int(settings["posts"]["score-board"]["id"])
-    else:
-        # ch_id = 1108133466350030858
-        async for msg in score_card_ch.history(oldest_first=True):
-            # print(msg)
-            if msg.author == bot.user:
-                msg_id = msg.id
-                msg_webhook = msg.webhook_id
-    try:
-        message = await score_card_ch.fetch_message(msg_id)
-    except discord.errors.NotFound as e:
-        msg = await score_card_ch.send(
-            content=settings["posts"]["score-board"]["content"]
-        )
-        msg_id = msg.id
-        message = await score_card_ch.fetch_message(msg_id)
-    if message.content != settings["posts"]["score-board"]["content"]:
-        print("score is out of sync")
+    score_card_ch = channel_index(interaction.guild).channel("score-board")
+    post = settings.get("posts", {}).get("score-board", {})
     total_teams = settings["total_teams"]
     teams_names = [x for x in settings["teams"].keys()]
     teams_scores = [x["current"] for x in settings["teams"].values()]
@@ -936,25 +3363,238 @@ async def update_server_score_board_channel(interaction: discord.Interaction, se
         if i >= total_teams:
             continue
         if settings["bot_mode"]["current"] == "candyland":
-            row = f"{teams_names[i]}: {teams_scores[i]} - Rerolls remain: {teams_rerolls[i]}"
             teams_rerolls = [x["reroll"] for x in settings["teams"].values()]
+            row = f"{teams_names[i]}: {teams_scores[i]} - Rerolls remain: {teams_rerolls[i]}"
         else:
             row = f"{teams_names[i]}: {teams_scores[i]}"
         content_text.append(row)
     score_text = "\n".join(content_text)
+    edit = {"content": score_text}
+    img = img_name = None
     # process things for Chutes and ladders
-    settings["posts"]["score-board"]["id"] = msg_id
-    settings["posts"]["score-board"]["content"] = score_text
-    update_settings_json(settings)
-    
     if settings["bot_mode"]["current"] == "chutes and ladders":
-        img_path = await mark_team_icons_on_board(interaction=interaction)
-        if img_path:
-            img = discord.File(img_path)
-            await message.edit(content=score_text, attachments=[img])
+        board = await mark_team_icons_on_board(interaction=interaction)
+        if board:
+            img_path, encoded = board
+            img_name = os.path.basename(img_path)
+            img_filename = f"{SCORE_BOARD_FILENAME}{os.path.splitext(img_path)[1]}"
+            if encoded is None:
+                img = discord.File(img_path, filename=img_filename)
+            else:
+                img = discord.File(BytesIO(encoded.data), filename=img_filename)
+            if post.get("image") != img_name:
+                # renders are named by their content, an unchanged board keeps its attachment
+                edit["attachments"] = [img]
     else:
-        await message.edit(content=score_text, attachments=[])
+        edit["attachments"] = []
+    message = await edit_registered_post(settings, "score-board", score_card_ch, **edit)
+    if message is not None and img and "attachments" not in edit and message.id != post.get("id"):
+        # the registered message was deleted and another one of ours was found, it lacks the board
+        img.reset()
+        message = await message.edit(attachments=[img])
+    if message is None:
+        files = [img] if img else []
+        for x in files:
+            x.reset()
+        message = await score_card_ch.send(content=score_text, files=files)
+    await register_post("score-board", score_card_ch, [message], content=score_text, image=img_name)
+
+
+
+def progress_editor(message, label: str, interval: float = 1.0, details=None):
+    """
+    Build a progress callback for the bulk operations that edits message with "label: done/total".
+
+    Args:
+        message: The message to edit, e.g. from interaction.followup.send(..., wait=True).
+        label (str): Printed before the count.
+        interval (float, optional): Least seconds between edits, the last one is always sent. Defaults to 1.0.
+        details (optional): Function returning more text to show below the count.
+
+    Returns:
+        Coroutine function taking (done, total).
+    """
+    last_progress = time.monotonic()
+
+    async def report_progress(done: int, total: int):
+        nonlocal last_progress
+        # one edit a second at most, the bulk requests share the rate limits
+        if done < total and time.monotonic() - last_progress < interval:
+            return
+        last_progress = time.monotonic()
+        content = f"{label}: {done}/{total}"
+        if details:
+            content += f"\n{details()}"
+        try:
+            await message.edit(content=content)
+        except discord.HTTPException as e:
+            # progress is best effort, e.g. the interaction token expires after 15 minutes
+            print(f"Could not update progress: {e}")
+
+    return report_progress
+
+
+# guilds with a sync_roles in progress, the bulk role commands refuse to start a second one
+role_syncs_running = set()
+
+
+async def resolve_member(guild: discord.Guild, member_id: int) -> Optional[discord.Member]:
+    """
+    Get a member from the cache, fetching them from Discord if they are not in it.
+
+    Args:
+        guild (discord.Guild): The Discord server.
+        member_id (int): The member's user ID.
+
+    Returns:
+        Optional[discord.Member]: The member, None if they are not in the server.
+    """
+    member = guild.get_member(member_id)
+    if member is None:
+        try:
+            member = await guild.fetch_member(member_id)
+        except discord.NotFound:
+            return None
+    return member
+
+
+def member_role_diff(member: discord.Member, remove: set, add: set) -> Optional[list]:
+    """
+    Work out a member's roles after removing and adding some.
+
+    Args:
+        member (discord.Member): The member.
+        remove (set): IDs of the roles to take away.
+        add (set): IDs of the roles to give, these win over remove.
+
+    Returns:
+        Optional[list]: The member's new roles, None when nothing changes.
+    """
+    # roles[0] is @everyone, it is never sent
+    current = member.roles[1:]
+    current_ids = {x.id for x in current}
+    roles = [x for x in current if x.id not in remove or x.id in add]
+    roles += [discord.Object(id=x) for x in add if x not in current_ids]
+    if {x.id for x in roles} == current_ids:
+        return None
+    return roles
+
+
+async def sync_roles(guild: discord.Guild, job: dict, progress=None) -> dict:
+    """
+    Apply a bulk role change to every member holding one of the removed roles (or the
+    members listed in the job) with a single member edit each, ROLE_SYNC_CONCURRENCY at a time.
 
+    The job is stored in settings["role_sync"] until it finishes. As every member's edit is
+    worked out from their current roles, a job interrupted by a restart is simply run again
+    by resume_role_sync, members already done need no request. discord.py waits out the
+    per route rate limit buckets, RateLimited is only raised for waits over the client's
+    max_ratelimit_timeout and is retried once after the wait.
+
+    Args:
+        guild (discord.Guild): The Discord server.
+        job (dict): {"remove": [role ids], "add": [role ids], "members": [member ids] or None,
+            "channel": channel id to report to or None, "reason": audit log reason}.
+        progress (optional): Coroutine function called with (done, total) after every member.
+
+    Returns:
+        dict: Counts of members "changed", "unchanged" and "failed".
+    """
+    role_syncs_running.add(guild.id)
+    try:
+        return await _sync_roles(guild, job, progress)
+    finally:
+        role_syncs_running.discard(guild.id)
+
+
+async def _sync_roles(guild: discord.Guild, job: dict, progress=None) -> dict:
+    async with get_settings_store().global_transaction() as settings:
+        settings["role_sync"] = job
+    remove, add = set(job.get("remove", [])), set(job.get("add", []))
+    if job.get("members") is None:
+        members = [x for x in guild.members if any(r.id in remove for r in x.roles)]
+    else:
+        members = [x for x in [await resolve_member(guild, x) for x in job["members"]] if x is not None]
+    # only sizes the progress total, every edit is worked out again when its turn comes
+    pending = [x for x in members if member_role_diff(x, remove, add) is not None]
+    result = {"changed": 0, "unchanged": len(members) - len(pending), "failed": 0}
+    slots = asyncio.Semaphore(getattr(config, "ROLE_SYNC_CONCURRENCY", ROLE_SYNC_CONCURRENCY))
+    done = 0
+
+    async def apply(member: discord.Member):
+        nonlocal done
+        try:
+            async with slots:
+                # roles gained or lost while waiting for a slot are kept, members gone are skipped
+                current = await resolve_member(guild, member.id)
+                roles = None if current is None else member_role_diff(current, remove, add)
+                if roles is not None:
+                    try:
+                        await current.edit(roles=roles, reason=job.get("reason"))
+                    except discord.RateLimited as e:
+                        await asyncio.sleep(e.retry_after)
+                        await current.edit(roles=roles, reason=job.get("reason"))
+            result["changed" if roles is not None else "unchanged"] += 1
+        except discord.NotFound:
+            # left the server since
+            result["unchanged"] += 1
+        except discord.HTTPException as e:
+            print(f"Failed to update roles of {member}: {e}")
+            result["failed"] += 1
+        done += 1
+        if progress:
+            await progress(done, len(pending))
+
+    await asyncio.gather(*(apply(x) for x in pending))
+    async with get_settings_store().global_transaction() as settings:
+        settings.pop("role_sync", None)
+    print(f"Role sync in {guild.name}: {result}")
+    return result
+
+
+async def resume_role_sync(guild: discord.Guild) -> None:
+    """
+    Finish a bulk role change the bot was restarted in the middle of.
+
+    Args:
+        guild (discord.Guild): The Discord server.
+    """
+    if guild.id in role_syncs_running or not os.path.exists(guild_settings.guild_path(guild.id)):
+        return
+    active_guild_id.set(guild.id)
+    job = get_settings_store().get().get("role_sync")
+    if not job:
+        return
+    print(f"Resuming role sync in {guild.name}")
+    result = await sync_roles(guild, job)
+    channel = guild.get_channel(job["channel"]) if job.get("channel") else None
+    if channel:
+        await channel.send(
+            f"Finished the role update interrupted by a restart: {result['changed']} member(s) updated"
+            + (f", {result['failed']} failed" if result["failed"] else "")
+        )
+
+
+def role_sync_job(interaction: discord.Interaction, remove: list, add: list = (), members: list = None) -> dict:
+    """
+    Describe a bulk role change for sync_roles.
+
+    Args:
+        interaction (discord.Interaction): The command that started it, progress and the resume notice go to its channel.
+        remove (list): The roles to take away, None entries (roles missing from the server) are skipped.
+        add (list, optional): The roles to give.
+        members (list, optional): The members to change, defaults to everyone holding a removed role.
+
+    Returns:
+        dict: The job.
+    """
+    return {
+        "remove": [x.id for x in remove if x is not None],
+        "add": [x.id for x in add if x is not None],
+        "members": None if members is None else [x.id for x in members],
+        "channel": interaction.channel_id,
+        "reason": f"/{interaction.command.name if interaction.command else 'bingo'} by {interaction.user}",
+    }
 
 
 async def process_all_spectators(interaction, roles, spectator_role, unassign):
@@ -970,35 +3610,23 @@ async def process_all_spectators(interaction, roles, spectator_role, unassign):
     Returns:
     None
     """
-    # members = interaction.guild.members
-    guild_roles = interaction.guild.roles
-    await interaction.followup.send(f'Starting the update for Role "spectator" {"added to" if not unassign else "purged from"}\nThis will take a while(1-5 mins). Standby for update...')
-    for r in guild_roles:
-        if r in roles:
-            for m in r.members:
-                if discord.RateLimited:
-                    print("Rate Limited, pausing 5s")
-                    await asyncio.sleep(5)
-                await m.remove_roles(r)
-                if not unassign:
-                    await m.add_roles(spectator_role)
-    # for m in members:
-    #     roles_to_remove = [r for r in m.roles if r in roles]
-    #     print()
-    #     print(roles_to_remove)
-    #     print(roles)
-    #     print()
-    #     if not roles_to_remove:
-    #         continue
-    #     if discord.RateLimited:
-    #         print('Rate Limited, pausing 10s')
-    #         await asyncio.sleep(10)
-    #     await m.remove_roles(*roles_to_remove)
-    #     if not unassign:
-    #         await m.add_roles(spectator_role)
+    if interaction.guild.id in role_syncs_running:
+        await interaction.followup.send("A role update is already running, try again once it has finished.")
+        return
+    progress_message = await interaction.followup.send(
+        f'Starting the update for Role "spectator" {"added to" if not unassign else "purged from"}. Standby for update...',
+        wait=True,
+    )
+    job = role_sync_job(interaction, roles, [] if unassign else [spectator_role])
+    result = await sync_roles(
+        interaction.guild, job, progress=progress_editor(progress_message, "Updating members")
+    )
     print("All members have been updated")
-    await interaction.followup.send(
-        f'Role "spectator" {"added to" if not unassign else "purged from"} all server members'
+    await progress_message.edit(
+        content=f'Role "spectator" {"added to" if not unassign else "purged from"} all server members'
+        f" ({result['changed']} updated"
+        + (f", {result['failed']} failed" if result["failed"] else "")
+        + ")"
     )
 
 
@@ -1088,7 +3716,7 @@ async def team_names_autocomplete(
     Returns:
         List[app_commands.Choice[str]]: A list of app_commands.Choice objects representing the autocompleted team names.
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = settings["teams"].keys()
     return [
         app_commands.Choice(name=team_name, value=team_name)
@@ -1110,7 +3738,7 @@ async def change_team_names_autocomplete(
     Returns:
         List[app_commands.Choice[str]]: A list of app_commands.Choice objects representing the autocompleted team names.
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
     all_categories = [c.name for c in interaction.guild.categories if not c.name.lower() in IGNORED_CATEGORIES]
     all_options = team_names + [x for x in all_categories if x not in team_names]
@@ -1120,6 +3748,28 @@ async def change_team_names_autocomplete(
         if current.lower() in team_name.lower()
     ]
 
+async def snapshot_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> List[app_commands.Choice[str]]:
+    """
+    Autocompletes the settings snapshots that can be restored, newest first.
+
+    Args:
+        interaction (discord.Interaction): The interaction object.
+        current (str): The current input string.
+
+    Returns:
+        List[app_commands.Choice[str]]: A list of app_commands.Choice objects representing the snapshots.
+    """
+    snapshots = get_settings_store().snapshots
+    choices = []
+    for entry in snapshots.list() if snapshots else []:
+        taken = datetime.datetime.fromtimestamp(entry["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+        name = f"{taken} before {entry['label']} ({entry['hash'][:8]})"
+        if current.lower() in name.lower():
+            choices.append(app_commands.Choice(name=name, value=entry["hash"]))
+    return choices[:25]
+
 async def process_sheet_autocomplete(
     interaction: discord.Interaction, current: str
 ) -> List[app_commands.Choice[str]]:
@@ -1144,9 +3794,25 @@ async def process_sheet_autocomplete(
 # ======================================= Bot Commands ====================================================
 
 
+@tasks.loop(minutes=5)
+async def evict_idle_guild_settings():
+    """
+    Unloads the settings shards of guilds that have been idle for GUILD_IDLE_TIMEOUT.
+    """
+    evicted = guild_settings.evict_idle()
+    if evicted:
+        print(f"Evicted {evicted} idle guild settings shard(s)")
+
+
 @bot.event
 async def on_ready():
     print("Bot is Ready")
+    # on_ready also follows a reconnect, where the channel events in between were missed
+    guild_channel_indexes.clear()
+    if not evict_idle_guild_settings.is_running():
+        evict_idle_guild_settings.start()
+    for guild in bot.guilds:
+        asyncio.create_task(resume_role_sync(guild))
     # print('We have logged in as {0.user}'.format(client))
     try:
         synced = await bot.tree.sync()
@@ -1154,6 +3820,40 @@ async def on_ready():
     except Exception as e:
         print(f"Error syncing commands: {e}")
 
+
+@bot.event
+async def on_guild_channel_create(channel):
+    index = guild_channel_indexes.get(channel.guild.id)
+    if index:
+        index.add(channel)
+
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    index = guild_channel_indexes.get(channel.guild.id)
+    if index:
+        index.remove(channel)
+
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    # renames and moves between categories change the index keys
+    index = guild_channel_indexes.get(after.guild.id)
+    if index:
+        index.remove(before)
+        index.add(after)
+
+
+@bot.event
+async def on_guild_remove(guild):
+    guild_channel_indexes.pop(guild.id, None)
+
+
+@bot.event
+async def on_guild_available(guild):
+    # the guild comes back after an outage with channels changed while it was away
+    guild_channel_indexes.pop(guild.id, None)
+
 # @bot.event
 # async def on_guild_role_update(before, after):
 #     print(f"Role Updated: {before.name} -> {after.name}")
@@ -1176,7 +3876,7 @@ async def roll(interaction: discord.Interaction):
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     await interaction.response.defer(thinking=True)
     # put a check for has role in here
     team_name = interaction.channel.category.name
@@ -1196,122 +3896,120 @@ async def roll(interaction: discord.Interaction):
         )
         return
     
-    roll = roll_dice()
-    # create function to handle updating settings points
-    settings = load_settings_json()
-    settings = update_roll_settings(
-        roll,
-        team_name,
-        settings,
-        prev=settings["teams"][team_name]["current"],
-        current=settings["teams"][team_name]["current"] + roll,
-    )
-    score_altered = None
-    # check which bot mode
-    if settings['bot_mode']['current'] == "chutes and ladders":
-        # check for shortcuts
-        current = settings["teams"][team_name]["current"]
-        score = calculate_shortcut(current)
-        if score:
-            if score > current:
-                score_altered = "ladder-"
-            else:
-                score_altered = "rats-"
-            settings["teams"][team_name]["current"] = score
+    store = get_settings_store()
+    async with store.team_transaction(team_name) as settings:
+        team = settings["teams"][team_name]
+        tiles = settings["items"]
+        total_tiles = len(tiles)
+        # Checks if the team is already on the last tile of the bingo
+        finished = team.current == total_tiles
+        if not finished:
+            roll = roll_dice()
+            # create function to handle updating settings points
+            settings = update_roll_settings(
+                roll,
+                team_name,
+                settings,
+                prev=team.current,
+                current=team.current + roll,
+            )
+            score_altered = None
+            # check which bot mode
+            if settings['bot_mode']['current'] == "chutes and ladders":
+                # ladders, chutes and bouncing back off the last tile
+                team.current, score_altered = snake_board(settings).move(team.prev, roll)
+
+            # Check win condition
+            if team.current > total_tiles:
+                if settings['bot_mode']['current'] == 'candyland':
+                    # This makes the last tile mandatory
+                    team.current = total_tiles
+                    # roll_info = settings['items'][str(team.current)]
+                    # print(f"{roll_info = }")
+                else:
+                    # bounce back CNL Tile 98 + 6 > 98 + 2 = 100 -4 = 96 > Tile 96
+                    score_altered = "bounce back-"
+                    new_score = 2 * settings['board_bounds'].tile_count - team.current
+                    team.current = new_score
+            store.record("roll", team_name, roll=roll)
+            rolled_tile, rolled_prev = team.current, team.prev
+            name = create_discord_friendly_name(
+                f"{team.current}-{score_altered if score_altered else ''}{tiles[team.current].name}"
+            )
 
-    # Check win condition 
+            # Check if Sabotage Tile
+            if sabotage := tiles[team.current].sabotage and settings['bot_mode'] == 'candyland':
+                print(sabotage)
+                if "-" in sabotage:
+                    settings = update_roll_settings(
+                        roll,
+                        team_name,
+                        settings,
+                        prev=team.current,
+                        current=team.current + int(sabotage),
+                    )
+                    sabotage_message = f"SABOTAGED: Go back to tile {team.current}"
+                elif "reroll" in sabotage.lower():
 
-    
-    total_tiles = len(settings["items"])
-    if settings["teams"][team_name]["prev"] == total_tiles:
-        # Checks if last prev tile was the last tile of the bingo
+                    # Needs to auto reroll
+                    roll = roll_dice()
+                    settings = update_roll_settings(
+                        roll,
+                        team_name,
+                        settings,
+                        prev=team.current,
+                        current=team.current + roll,
+                    )
+                    sabotage_message = f"SKIPPED: Goto tile {team.current}"
+                else:
+                    sabotage_message = f"SABOTAGED: Goto tile {sabotage}"
+                    # Go to tile
+                    settings = update_roll_settings(
+                        roll,
+                        team_name,
+                        settings,
+                        prev=team.current,
+                        current=int(sabotage),
+                    )
+                store.record("sabotage", team_name, roll=roll)
+                sabotage_name = create_discord_friendly_name(
+                    f"{team.current}-{tiles[team.current].name}"
+                )
+
+    # the roll is committed, announce it with the committed values
+    if finished:
         # await message.add_reaction("\n{TADA}")
         await interaction.followup.send(
             f'# Congrats {discord.utils.get(interaction.guild.roles, name=team_name).mention}\nyou have finished all your tiles! {discord.utils.get(interaction.guild.roles, name="Bingo Moderator").mention}'
         )
         return
-    elif settings["teams"][team_name]["current"] > total_tiles:
-        if settings['bot_mode']['current'] == 'candyland':
-            # This makes the last tile mandatory
-            settings["teams"][team_name]["current"] = total_tiles
-            # roll_info = settings['items'][str(settings['teams'][team_name]['current'])]
-            # print(f"{roll_info = }")
-        else:
-            # bounce back CNL Tile 98 + 6 > 98 + 2 = 100 -4 = 96 > Tile 96
-            score_altered = "bounce back-"
-            new_score = 2 * settings['board_bounds']['tile_count'] - settings["teams"][team_name]["current"]
-            settings["teams"][team_name]["current"] = new_score
-
-    update_settings_json(settings)
-
-    name = create_discord_friendly_name(
-        f"{settings['teams'][team_name]['current']}-{score_altered if score_altered else ''}{settings['items'][str(settings['teams'][team_name]['current'])]['name']}"
-    )
+    settings = read_settings_json()
+    team = settings["teams"][team_name]
+    tiles = settings["items"]
     ch = await interaction.channel.clone(name=name)
     embed = create_tile_embed(
-        tiles=settings["items"],
-        tile_number=str(settings["teams"][team_name]["current"]),
+        tiles=tiles,
+        tile_number=rolled_tile,
     )
     await ch.send(embed=embed)
     await interaction.followup.send(
         f"## {dice_emoji} Team: {team_name} rolled:  {dice_emoji}  __**{roll}**__\
-        \n## Congrats, your new tile is:  {green_square}  __**{settings['teams'][team_name]['current']}**__  {ch.mention}\
-        \nYour previous tile was: {settings['teams'][team_name]['prev']}"
-        # f"Rolling Dice:\n# {roll}\nfor team: {team_name}\nCongrats, your new tile is:\n# {settings['teams'][team_name]['current']} and from previous tile was:\n# {settings['teams'][team_name]['prev']}\n{title}"
+        \n## Congrats, your new tile is:  {green_square}  __**{rolled_tile}**__  {ch.mention}\
+        \nYour previous tile was: {rolled_prev}"
+        # f"Rolling Dice:\n# {roll}\nfor team: {team_name}\nCongrats, your new tile is:\n# {team.current} and from previous tile was:\n# {team.prev}\n{title}"
     )
 
-    # Check if Sabotage Tile
-    if sabotage := settings["items"][str(settings["teams"][team_name]["current"])]["sabotage"] and settings['bot_mode'] == 'candyland':
-        print(sabotage)
-        if "-" in sabotage:
-            settings = update_roll_settings(
-                roll,
-                team_name,
-                settings,
-                prev=settings["teams"][team_name]["current"],
-                current=settings["teams"][team_name]["current"] + int(sabotage),
-            )
-            # message in skipped channel
-            await ch.send(
-                f"SABOTAGED: Go back to tile {settings['teams'][team_name]['current']}"
-            )
-        elif "reroll" in sabotage.lower():
-
-            # Needs to auto reroll
-            roll = roll_dice()
-            settings = update_roll_settings(
-                roll,
-                team_name,
-                settings,
-                prev=settings["teams"][team_name]["current"],
-                current=settings["teams"][team_name]["current"] + roll,
-            )
-            # message in skipped channel
-            await ch.send(
-                f"SKIPPED: Goto tile {settings['teams'][team_name]['current']}"
-            )
-        else:
-            # message in skipped channel
-            await ch.send(f"SABOTAGED: Goto tile {sabotage}")
-            # Go to tile
-            settings = update_roll_settings(
-                roll,
-                team_name,
-                settings,
-                prev=settings["teams"][team_name]["current"],
-                current=int(sabotage),
-            )
-        name = create_discord_friendly_name(
-            f"{settings['teams'][team_name]['current']}-{settings['items'][str(settings['teams'][team_name]['current'])]['name']}"
-        )
+    if sabotage:
+        # message in skipped channel
+        await ch.send(sabotage_message)
         await interaction.channel.send(
-            f"\n{'SABOTAGED' if sabotage != 'reroll' else 'SKIPPED'}:\nRolling Dice: {roll} for team: {team_name}\nCongrats, your new tile is: {settings['teams'][team_name]['current']} and old tile was: {settings['teams'][team_name]['prev']}\n{name}"
+            f"\n{'SABOTAGED' if sabotage != 'reroll' else 'SKIPPED'}:\nRolling Dice: {roll} for team: {team_name}\nCongrats, your new tile is: {team.current} and old tile was: {team.prev}\n{sabotage_name}"
         )
 
-        ch = await interaction.channel.clone(name=name)
+        ch = await interaction.channel.clone(name=sabotage_name)
         embed = create_tile_embed(
-            tiles=settings["items"],
-            tile_number=str(settings["teams"][team_name]["current"]),
+            tiles=tiles,
+            tile_number=team.current,
         )
         await ch.send(embed=embed)
 
@@ -1354,132 +4052,142 @@ async def reroll(interaction: discord.Interaction):
         )
         return
     else:
-        settings = load_settings_json()
+        settings = read_settings_json()
         if settings["running"] == False or settings['rerolling'] == False:
             await interaction.followup.send(
                 "Rolling/Rerolling is not enabled, either wait till Start time or message @ Bingo Moderator if receiving this message in error."
             )
             return
-        settings = load_settings_json()
-        team_name = interaction.channel.category.name
-        if settings["teams"][team_name]["reroll"] > 0:
-            # clear existing channel
-            name = create_discord_friendly_name(
-                f"{settings['teams'][team_name]['current']}-{settings['items'][str(settings['teams'][team_name]['current'])]['name']}"
-            )
-            print(f"{name = }")
-
-            # prev_ch = discord.utils.get(interaction.channel.category.channels, name=name)
-            # messages = [x async for x in prev_ch.history(limit=2)]
-            # if prev_ch and len(messages) == 1:
-            #     await prev_ch.delete()
-            #     print(f'Deleted Channel {name} after a successful reroll')
-            # elif prev_ch:
-            #     await interaction.followup.send(f'Unable to clean up channel <#{discord.utils.get(interaction.guild.channels, name=name).id}> pinging {discord.utils.get(interaction.guild.roles, name="Bingo Moderator").mention}')
-            # return #TODO re-enable this line
-            roll = roll_dice()
-            settings = update_roll_settings(
-                roll,
-                team_name,
-                settings,
-                prev=settings["teams"][team_name]["prev"],
-                current=settings["teams"][team_name]["prev"] + roll,
-                reroll=True,
-            )
-            settings["teams"][team_name]["reroll"] -= 1
-            total_tiles = len(settings["items"])
-            if settings["teams"][team_name]["prev"] == total_tiles:
+        store = get_settings_store()
+        outcome = None
+        async with store.team_transaction(team_name) as settings:
+            team = settings["teams"][team_name]
+            tiles = settings["items"]
+            total_tiles = len(tiles)
+            if team.reroll <= 0:
+                outcome = "no rerolls"
+            elif team.prev == total_tiles:
                 # Checks if last prev tile was the last tile of the bingo
-                # await message.add_reaction("\n{TADA}")
-                await interaction.followup.send(
-                    f'Congrats {discord.utils.get(interaction.guild.roles, name=team_name).mention} you have finished all your tiles! {discord.utils.get(interaction.guild.roles, name="Bingo Moderator").mention}'
+                outcome = "finished"
+            else:
+                # clear existing channel
+                name = create_discord_friendly_name(
+                    f"{team.current}-{tiles[team.current].name}"
                 )
-                return
-            elif settings["teams"][team_name]["current"] > total_tiles:
-                # This makes the last tile mandatory
-                settings["teams"][team_name]["current"] = total_tiles
-            update_settings_json(settings)
-            title = formatted_title(settings, team_name)
+                print(f"{name = }")
+
+                # prev_ch = discord.utils.get(interaction.channel.category.channels, name=name)
+                # messages = [x async for x in prev_ch.history(limit=2)]
+                # if prev_ch and len(messages) == 1:
+                #     await prev_ch.delete()
+                #     print(f'Deleted Channel {name} after a successful reroll')
+                # elif prev_ch:
+                #     await interaction.followup.send(f'Unable to clean up channel <#{discord.utils.get(interaction.guild.channels, name=name).id}> pinging {discord.utils.get(interaction.guild.roles, name="Bingo Moderator").mention}')
+                # return #TODO re-enable this line
+                roll = roll_dice()
+                settings = update_roll_settings(
+                    roll,
+                    team_name,
+                    settings,
+                    prev=team.prev,
+                    current=team.prev + roll,
+                    reroll=True,
+                )
+                team.reroll -= 1
+                if team.current > total_tiles:
+                    # This makes the last tile mandatory
+                    team.current = total_tiles
+                store.record("reroll", team_name, roll=roll)
+                reroll_message = f"ReRolling Dice: {roll} for team: {team_name}\nCongrats, your new tile is: {team.current} and old tile was: {team.prev}\n{formatted_title(settings, team_name)}"
+                rerolled_tile = team.current
+                name = create_discord_friendly_name(
+                    f"{team.current}-{tiles[team.current].name}"
+                )
+
+                # Check if Sabotage Tile
+                if sabotage := tiles[team.current].sabotage:
+                    print(sabotage)
+                    if "-" in sabotage:
+                        settings = update_roll_settings(
+                            roll,
+                            team_name,
+                            settings,
+                            prev=team.current,
+                            current=team.current + int(sabotage),
+                        )
+                        sabotage_message = f"SABOTAGED: Go back to tile {team.current}"
+                    elif "reroll" in sabotage.lower():
+
+                        # Needs to auto reroll
+                        roll = roll_dice()
+                        settings = update_roll_settings(
+                            roll,
+                            team_name,
+                            settings,
+                            prev=team.current,
+                            current=team.current + roll,
+                        )
+                        sabotage_message = f"SKIPPED: Goto tile {team.current}"
+                    else:
+                        sabotage_message = f"SABOTAGED: Goto tile {sabotage}"
+                        # Go to tile
+                        settings = update_roll_settings(
+                            roll,
+                            team_name,
+                            settings,
+                            prev=team.current,
+                            current=int(sabotage),
+                        )
+                    store.record("sabotage", team_name, roll=roll)
+                    sabotage_title = formatted_title(settings, team_name)
+                    sabotage_name = create_discord_friendly_name(
+                        f"{team.current}-{tiles[team.current].name}"
+                    )
+                outcome = "rerolled"
+
+        # the reroll is committed, announce it with the committed values
+        if outcome == "no rerolls":
+            await interaction.followup.send(f"NO MORE REROLLS MFER!")
+            return
+        if outcome == "finished":
+            # await message.add_reaction("\n{TADA}")
             await interaction.followup.send(
-                f"ReRolling Dice: {roll} for team: {team_name}\nCongrats, your new tile is: {settings['teams'][team_name]['current']} and old tile was: {settings['teams'][team_name]['prev']}\n{title}"
+                f'Congrats {discord.utils.get(interaction.guild.roles, name=team_name).mention} you have finished all your tiles! {discord.utils.get(interaction.guild.roles, name="Bingo Moderator").mention}'
             )
+            return
+        settings = read_settings_json()
+        team = settings["teams"][team_name]
+        tiles = settings["items"]
+        await interaction.followup.send(reroll_message)
+        ch = await interaction.channel.clone(name=name)
+        embed = create_tile_embed(
+            tiles=tiles,
+            tile_number=rerolled_tile,
+        )
+        await ch.send(embed=embed)
 
-            name = create_discord_friendly_name(
-                f"{settings['teams'][team_name]['current']}-{settings['items'][str(settings['teams'][team_name]['current'])]['name']}"
+        if sabotage:
+            # message in skipped channel
+            await ch.send(sabotage_message)
+            await interaction.channel.send(
+                f"\n{'SABOTAGED' if sabotage != 'reroll' else 'SKIPPED'}:\nRolling Dice: {roll} for team: {team_name}\nCongrats, your new tile is: {team.current} and old tile was: {team.prev}\n{sabotage_title}"
             )
-            ch = await interaction.channel.clone(name=name)
+
+            ch = await interaction.channel.clone(name=sabotage_name)
             embed = create_tile_embed(
-                tiles=settings["items"],
-                tile_number=str(settings["teams"][team_name]["current"]),
+                tiles=tiles,
+                tile_number=team.current,
             )
             await ch.send(embed=embed)
 
-            # Check if Sabotage Tile
-            if sabotage := settings["items"][str(settings["teams"][team_name]["current"])]["sabotage"]:
-                print(sabotage)
-                if "-" in sabotage:
-                    settings = update_roll_settings(
-                        roll,
-                        team_name,
-                        settings,
-                        prev=settings["teams"][team_name]["current"],
-                        current=settings["teams"][team_name]["current"] + int(sabotage),
-                    )
-                    # message in skipped channel
-                    await ch.send(
-                        f"SABOTAGED: Go back to tile {settings['teams'][team_name]['current']}"
-                    )
-                elif "reroll" in sabotage.lower():
-
-                    # Needs to auto reroll
-                    roll = roll_dice()
-                    settings = update_roll_settings(
-                        roll,
-                        team_name,
-                        settings,
-                        prev=settings["teams"][team_name]["current"],
-                        current=settings["teams"][team_name]["current"] + roll,
-                    )
-                    # message in skipped channel
-                    await ch.send(
-                        f"SKIPPED: Goto tile {settings['teams'][team_name]['current']}"
-                    )
-                else:
-                    # message in skipped channel
-                    await ch.send(f"SABOTAGED: Goto tile {sabotage}")
-                    # Go to tile
-                    settings = update_roll_settings(
-                        roll,
-                        team_name,
-                        settings,
-                        prev=settings["teams"][team_name]["current"],
-                        current=int(sabotage),
-                    )
-                title = formatted_title(settings, team_name)
-                await interaction.channel.send(
-                    f"\n{'SABOTAGED' if sabotage != 'reroll' else 'SKIPPED'}:\nRolling Dice: {roll} for team: {team_name}\nCongrats, your new tile is: {settings['teams'][team_name]['current']} and old tile was: {settings['teams'][team_name]['prev']}\n{title}"
-                )
-
-                name = create_discord_friendly_name(
-                    f"{settings['teams'][team_name]['current']}-{settings['items'][str(settings['teams'][team_name]['current'])]['name']}"
-                )
-                ch = await interaction.channel.clone(name=name)
-                embed = create_tile_embed(
-                    tiles=settings["items"],
-                    tile_number=str(settings["teams"][team_name]["current"]),
-                )
-                await ch.send(embed=embed)
-
-            # Add updating the TEAMS bingo card channel
-            await update_team_bingo_card_channel(
-                interaction, team_name, roll, settings, reroll=True
-            )
-            # Add updating the Server's Bingo card Channel
-            await update_server_score_board_channel(interaction, settings)
+        # Add updating the TEAMS bingo card channel
+        await update_team_bingo_card_channel(
+            interaction, team_name, roll, settings, reroll=True
+        )
 
-            # await roll_reply.edit(content=f"{roll_reply.content}\nCreated new channel <#{discord.utils.get(interaction.guild.channels, name=name).id}> for {discord.utils.get(interaction.guild.roles, name=team_name).mention}")
-        else:
-            await interaction.followup.send(f"NO MORE REROLLS MFER!")
+        # await roll_reply.edit(content=f"{roll_reply.content}\nCreated new channel <#{discord.utils.get(interaction.guild.channels, name=name).id}> for {discord.utils.get(interaction.guild.roles, name=team_name).mention}")
+        # Add updating the Server's Bingo card Channel
+        await update_server_score_board_channel(interaction, settings)
 
 
 @has_role("Bingo Moderator")
@@ -1516,12 +4224,17 @@ async def set_tiles(
     #     return
     # await interaction.response.edit_message(suppress=True)
     settings = load_settings_json()
+    get_settings_store().take_snapshot("upload_tiles")
     try:
         processed, settings = update_settings_json(
             settings,
             url=sheet_link,
             process_sheet=process_sheet
         )
+        tile_count = settings["board_bounds"].get("tile_count") or 100
+        invalid = invalid_shortcuts(board_shortcuts(settings), tile_count)
+        if settings["bot_mode"]["current"] == "chutes and ladders" and invalid:
+            processed += f"\nLadders and chutes {invalid} are outside tiles 1-{tile_count} and will be ignored"
         await interaction.followup.send(f"{processed}")
     except RefreshError:
         os.remove('token.json')
@@ -1543,7 +4256,7 @@ async def clear_team_role(interaction: discord.Interaction, team_name: str):
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
     await interaction.response.defer(thinking=True)
     if not team_name in team_names:
@@ -1553,17 +4266,18 @@ async def clear_team_role(interaction: discord.Interaction, team_name: str):
         return
     else:
         team_number = team_names.index(team_name) + 1
+        if interaction.guild.id in role_syncs_running:
+            await interaction.followup.send("A role update is already running, try again once it has finished.")
+            return
         try:
-            users_processed = 0
-            for user in interaction.guild.members:
-                current_role = discord.utils.get(user.roles, name=f"Team {team_number}")
-                if current_role:
-                    await user.remove_roles(current_role)
-                    users_processed += 1
-            if not users_processed:
+            current_role = discord.utils.get(interaction.guild.roles, name=f"Team {team_number}")
+            if current_role is None:
+                raise ValueError
+            result = await sync_roles(interaction.guild, role_sync_job(interaction, [current_role]))
+            if not result["changed"]:
                 raise ValueError
             await interaction.followup.send(
-                f'Disbanded Team: {team_name} Role: "Team {team_number}" removing the role from {users_processed} users'
+                f'Disbanded Team: {team_name} Role: "Team {team_number}" removing the role from {result["changed"]} users'
             )
         except ValueError:
             await interaction.followup.send(
@@ -1597,7 +4311,7 @@ async def spectators(
     roles.append(spectator_role)
     members = members.split()
     if members[0] == "@everyone" and unassign:
-        process_all_spectators(interaction, roles, spectator_role, unassign)
+        await process_all_spectators(interaction, roles, spectator_role, unassign)
     elif len(members) == 0:
         await interaction.followup.send(
             f"Please add @ each member to add them too team"
@@ -1606,9 +4320,11 @@ async def spectators(
         for m in members:
             m_id = int(m.replace("<", "").replace(">", "").replace("@", ""))
             mem = await interaction.guild.fetch_member(m_id)
-            await mem.remove_roles(*roles)
-            if not unassign:
-                await mem.add_roles(spectator_role)
+            new_roles = member_role_diff(
+                mem, {r.id for r in roles if r}, set() if unassign else {spectator_role.id}
+            )
+            if new_roles is not None:
+                await mem.edit(roles=new_roles)
         await interaction.followup.send(
             f'Role "spectator" {"added" if not unassign else "removed"} to {len(members)} members'
         )
@@ -1632,7 +4348,7 @@ async def add_team_role(interaction: discord.Interaction, team_name: str, member
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
     team_number = team_names.index(team_name) + 1
     await interaction.response.defer(thinking=True)
@@ -1641,13 +4357,22 @@ async def add_team_role(interaction: discord.Interaction, team_name: str, member
     )
     roles = [discord.utils.get(interaction.guild.roles, name=rl) for rl in ROLES]
     members = members.split()
+    if interaction.guild.id in role_syncs_running:
+        await interaction.followup.send("A role update is already running, try again once it has finished.")
+        return
+    targets = []
     for m in members:
-        m_id = int(m.replace("<", "").replace(">", "").replace("@", ""))
-        mem = await interaction.guild.fetch_member(m_id)
-        await mem.remove_roles(*roles)
-        await mem.add_roles(current_role)
+        mem = await resolve_member(interaction.guild, int(m.replace("<", "").replace(">", "").replace("@", "")))
+        if mem is not None:
+            targets.append(mem)
+    # one edit per member swaps any other team role for this one
+    result = await sync_roles(interaction.guild, role_sync_job(interaction, roles, [current_role], targets))
     await process_team_assignment_updates(interaction)
-    await interaction.followup.send(f'Role "Team {team_number}" added to {len(members)} members')
+    await interaction.followup.send(
+        f'Role "Team {team_number}" added to {result["changed"]} members'
+        + (f", {result['failed']} failed" if result["failed"] else "")
+        + (f", {len(members) - len(targets)} not found in the server" if len(targets) < len(members) else "")
+    )
 
 
 async def configure_reroll(interaction: discord.Interaction, team_name: str):
@@ -1663,7 +4388,7 @@ async def configure_reroll(interaction: discord.Interaction, team_name: str):
     None
     """
 
-    class Reroll(discord.ui.View):
+    class Reroll(GuildView):
         def __init__(self, *, timeout: Optional[float] = 180):
             super().__init__(timeout=timeout)
 
@@ -1681,14 +4406,16 @@ async def configure_reroll(interaction: discord.Interaction, team_name: str):
             Returns:
             None
             """
-            settings = load_settings_json()
-            if settings["teams"][team_name]["reroll"] == 0:
+            async with get_settings_store().team_transaction(team_name) as settings:
+                revoked = settings["teams"][team_name]["reroll"] > 0
+                if revoked:
+                    settings["teams"][team_name]["reroll"] -= 1
+                    get_settings_store().record("reroll_revoke", team_name)
+            if not revoked:
                 await interaction.followup.send(
                     content="No Rerolls exist for that team."
                 )
             else:
-                settings["teams"][team_name]["reroll"] -= 1
-                update_settings_json(settings)
                 await interaction.response.edit_message(
                     content=f"1 Reroll has been removed for that team.\n{team_name}: {settings['teams'][team_name]['reroll']} Reroll(s) remain",
                     view=self,
@@ -1714,9 +4441,9 @@ async def configure_reroll(interaction: discord.Interaction, team_name: str):
             Returns:
             None
             """
-            settings = load_settings_json()
-            settings["teams"][team_name]["reroll"] += 1
-            update_settings_json(settings)
+            async with get_settings_store().team_transaction(team_name) as settings:
+                settings["teams"][team_name]["reroll"] += 1
+                get_settings_store().record("reroll_grant", team_name)
             await interaction.response.edit_message(
                 content=f"1 Reroll is added to that team.\n{team_name}: {settings['teams'][team_name]['reroll']} Reroll(s) remain",
                 view=self,
@@ -1747,7 +4474,7 @@ async def delete_team(interaction: discord.Interaction, team_name: str):
     - team_name (str): The name of the team whose channels are to be deleted.
     """
 
-    class DeleteConfirmation(discord.ui.View):
+    class DeleteConfirmation(GuildView):
         """
         A confirmation view for deleting team channels.
 
@@ -1809,7 +4536,7 @@ async def delete_team(interaction: discord.Interaction, team_name: str):
                 else:
                     child.disabled = True
             button.disabled = True
-            settings = load_settings_json()
+            settings = read_settings_json()
             team_names = [x for x in settings["teams"].keys()]
             team_number = team_names.index(self.team_name) + 1
             # if not interaction.channel.category.name.lower() == "admin":
@@ -1855,6 +4582,7 @@ async def delete_team(interaction: discord.Interaction, team_name: str):
                         num_deleted += 1
                         await ch.delete()
                     await cat.delete()
+                    await forget_post(f"bingo-card:{self.team_name}")
                     if num_deleted > 0:
                         await interaction.message.edit(
                             embed=discord.Embed(
@@ -1902,7 +4630,7 @@ async def change_team_name(
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
     # team_number = team_names.index(team_name) + 1
     await interaction.response.defer(thinking=True)
@@ -1914,7 +4642,7 @@ async def change_team_name(
     if not new_team_name:
         await interaction.followup.send(f'No "new_team_name" provided, Please try again')
         return
-    team_cat = discord.utils.get(interaction.guild.categories, name=team_name)
+    team_cat = channel_index(interaction.guild).category(team_name)
     if not team_cat:
         await interaction.followup.send(f'No Category found for "{team_name}"')
         return
@@ -1923,26 +4651,21 @@ async def change_team_name(
             f"Team Name: {team_name} is not found in {team_names}\nPlease Try again"
         )
         return
-    # Update Settings
-    teams_index = dict(
-        zip(settings["teams"].keys(), range(len(settings["teams"].keys())))
-    )
-    team_idx = teams_index[team_name]
-    new_teams = {}
-    for i, pair in enumerate(settings["teams"].items()):
-        k, v = pair
-        if i == team_idx:
-            new_teams.update({new_team_name: v})
-        else:
-            new_teams.update({k: v})
-    settings["teams"] = new_teams
-    # Update Category
-    team_cat = discord.utils.get(interaction.guild.categories, name=team_name)
-    if not team_cat:
-        await interaction.followup.send(f'No Category found for "{team_name}"')
-        return
+    # Update Category, the settings follow once Discord accepted the new name
     await team_cat.edit(name=new_team_name)
-    save_settings_json(settings)
+    # Update Settings
+    store = get_settings_store()
+    with store.in_use():
+        store.take_snapshot("change_team_name")
+        async with store.exclusive_transaction() as settings:
+            # keeps the team's position, team numbers follow the order of settings["teams"]
+            settings["teams"] = {
+                (new_team_name if k == team_name else k): v for k, v in settings["teams"].items()
+            }
+            posts = settings.get("posts", {})
+            if f"bingo-card:{team_name}" in posts:
+                posts[f"bingo-card:{new_team_name}"] = posts.pop(f"bingo-card:{team_name}")
+        store.checkpoint()
     await interaction.followup.send(f'Changed Team "{team_name}" to "{new_team_name}"')
 
 
@@ -1963,7 +4686,7 @@ async def update_tiles_channels(interaction: discord.Interaction, team_name: str
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     # tile_list_ch = discord.utils.get(interaction.guild.channels, name="tile-list")
 
     # await send_or_update_tiles_channel(tile_list_ch, settings)
@@ -1979,7 +4702,7 @@ async def update_tiles_channels(interaction: discord.Interaction, team_name: str
         """========================== NOT IMPLEMENTED ============================="""
 
         return
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
     team_number = team_names.index(team_name) + 1
     await interaction.response.defer(thinking=True)
@@ -2020,13 +4743,17 @@ async def create_discord_text_channel(
     channel_name: str,
     description: str, 
     cat: discord.CategoryChannel, 
-    overwrites: discord.PermissionOverwrite
+    overwrites: discord.PermissionOverwrite,
+    position: int = None,
+    intro: bool = True,
 ):
+    kwargs = {} if position is None else {"position": position}
     chan = await interaction.guild.create_text_channel(
         name=channel_name,
         topic=description,
         category=cat,
         overwrites=overwrites,
+        **kwargs,
     )
     if "dice-roll" in channel_name:
         # find carl-bot and remove from dice roll
@@ -2034,18 +4761,31 @@ async def create_discord_text_channel(
         # print(carl_bot_member.name)
         # await chan.set_permissions(carl_bot_member, read_messages=False, manage_messages=False)
         pass
+    if intro:
+        await post_channel_intro(chan, description)
+    return chan
+
+
+async def post_channel_intro(chan: discord.TextChannel, description: str) -> None:
+    """
+    Post the first messages of a new team channel: its description, and the drop notification
+    webhook instructions in #photo-dump and #drop-spam.
+
+    Args:
+        chan (discord.TextChannel): The new channel.
+        description (str): The tile description, may be empty.
+    """
     if description:
         await chan.send(f"{description}")
-    if "photo-dump" in channel_name or "drop-spam" in channel_name:
-        webhook = await chan.create_webhook(name=channel_name)
+    if "photo-dump" in chan.name or "drop-spam" in chan.name:
+        webhook = await chan.create_webhook(name=chan.name)
         message_1 = await chan.send(
             f"Here are instructions for adding Discord Rare Drop Notification to Runelite\
                 \n\nDownload the Plugin from Plugin Hub\nCopy this Webhook URL to this channel\
                     into the Plugin(Accessed via the settings)"
         )
         message_2 = await chan.send(f"```{webhook.url}```")
-        await message_1.pin()
-        await message_2.pin()
+        await asyncio.gather(message_1.pin(), message_2.pin())
         
         #TODO maybe implement the whitelisting of the items?
         # if settings["bot_mode"]["current"] == "candyland":
@@ -2064,6 +4804,183 @@ async def create_discord_text_channel(
         #     await chan.send(embed=embed)
 
 
+@dataclasses.dataclass(slots=True)
+class PlannedChannel:
+    name: str
+    description: str
+    overwrites: dict
+    voice: bool = False
+
+
+def plan_team_channels(settings: dict, team_number: int, channels: list, overwrites_with_spectator: dict, overwrites_w_out_spectator: dict) -> list:
+    """
+    Work out every channel of a team's category, in order, before any is created.
+
+    Args:
+        settings (dict): The bingo settings.
+        team_number (int): The team's position in settings["teams"], from 1.
+        channels (list): The default channels from get_default_channels().
+        overwrites_with_spectator (dict): Permissions of the channels spectators can see.
+        overwrites_w_out_spectator (dict): Permissions of the team's chat channels.
+
+    Returns:
+        list: A PlannedChannel per channel.
+    """
+    planned = []
+    for channel in channels:
+        # candyland and chutes and ladders list plain names, normal mode name/description dicts
+        description = channel.get("description", "") if isinstance(channel, dict) else ""
+        if settings["bot_mode"]["current"] == "candyland" or settings["bot_mode"]["current"] == "chutes and ladders":
+            channel_name = f"team-{team_number}-{channel}"
+            if channel_name == f"team-{team_number}-chat":
+                overwrites = overwrites_w_out_spectator
+            else:
+                overwrites = overwrites_with_spectator
+        else:
+            channel_name = channel["name"]
+            if channel_name == "chat":
+                # TODO update this
+                # raise Exception("This is not implemented yet, update proper perms")
+                channel_name = f"{team_number}-general-{channel_name}"
+                overwrites = overwrites_w_out_spectator
+            else:
+                # raise Exception("This is not implemented yet, update proper perms")
+                overwrites = overwrites_with_spectator
+        if "voice" in channel_name:
+            planned.append(PlannedChannel(f"{team_number}-{channel_name}", "", overwrites, voice=True))
+        else:
+            planned.append(PlannedChannel(channel_name, description, overwrites))
+    return planned
+
+
+async def provision_team_channels(
+    interaction: discord.Interaction, settings: dict, team_name: str, *, progress=None, slots=None
+) -> dict:
+    """
+    Create a team's category and channels, CHANNEL_CREATE_CONCURRENCY channels at a time.
+
+    The ids of the created channels are kept on the team, so running it again after a partial
+    failure only creates what is missing. Channels from before the ids were kept are matched
+    by their name as Discord normalizes it. A text channel without any message yet gets its
+    description and webhook posts again.
+
+    Parameters:
+        interaction (discord.Interaction): The interaction object representing the user's command interaction.
+        settings (dict): The bingo settings.
+        team_name (str): The name of the team for which channels will be created.
+        progress (optional): Coroutine function called with (done, total) after every channel.
+        slots (asyncio.Semaphore, optional): Limits the channels created at once, share one to
+            provision several teams together. Defaults to CHANNEL_CREATE_CONCURRENCY for this team.
+
+    Returns:
+        dict: The names of the channels "created", already "existing" and "failed".
+    """
+    guild = interaction.guild
+    team_number = list(settings["teams"].keys()).index(team_name) + 1
+    everyone_role = discord.utils.get(guild.roles, name="@everyone")
+    spectator_role = discord.utils.get(guild.roles, name="spectator")
+    bingo_bot_role = discord.utils.get(guild.roles, name="Bingo Bot")
+    team_role = discord.utils.get(guild.roles, name=f"Team {team_number}")
+    overwrites_with_spectator = {
+        guild.default_role: discord.PermissionOverwrite(
+            read_messages=False, connect=False
+        ),
+        bingo_bot_role: bingo_bot_overwrites(),
+        guild.me: bingo_bot_overwrites(),
+        spectator_role: spectator_overwrites(),
+        team_role: team_overwrites(),
+        everyone_role: everyone_overwrites(),
+    }
+    overwrites_w_out_spectator = {
+        guild.default_role: discord.PermissionOverwrite(
+            read_messages=False, connect=False
+        ),
+        bingo_bot_role: bingo_bot_overwrites(),
+        guild.me: bingo_bot_overwrites(),
+        team_role: team_overwrites(),
+        everyone_role: everyone_overwrites(),
+    }
+    channels = await get_default_channels(interaction, settings)
+    if not channels:
+        return {"created": [], "existing": [], "failed": []}
+    planned = plan_team_channels(
+        settings, team_number, channels, overwrites_with_spectator, overwrites_w_out_spectator
+    )
+
+    index = channel_index(guild)
+    cat = index.category(team_name)
+    if cat is None:
+        cat = await guild.create_category(name=team_name, overwrites=overwrites_with_spectator)
+        # the channel events may come in after the next steps look the category up
+        index.add(cat)
+    known = dict(settings["teams"][team_name].get("channels", {}))
+    by_name = {discord_channel_name(x.name): x for x in cat.channels}
+    # channels returned by Discord during this run, found again by a retry without the cache
+    made = {}
+    result = {"created": [], "existing": [], "failed": []}
+    if slots is None:
+        slots = asyncio.Semaphore(getattr(config, "CHANNEL_CREATE_CONCURRENCY", CHANNEL_CREATE_CONCURRENCY))
+    done = 0
+
+    def find(channel: PlannedChannel):
+        chan = guild.get_channel(known[channel.name]) if channel.name in known else None
+        return chan or by_name.get(discord_channel_name(channel.name))
+
+    async def create(position: int, channel: PlannedChannel):
+        chan = made.get(channel.name) or find(channel)
+        if chan is not None:
+            known[channel.name] = chan.id
+        has_intro = channel.description or "photo-dump" in channel.name or "drop-spam" in channel.name
+        if channel.name not in made and chan is not None and (
+            channel.voice or not has_intro or chan.last_message_id is not None
+        ):
+            result["existing"].append(channel.name)
+            return
+        async with slots:
+            if chan is None:
+                if channel.voice:
+                    chan = await guild.create_voice_channel(
+                        name=channel.name, category=cat, overwrites=channel.overwrites, position=position
+                    )
+                else:
+                    chan = await create_discord_text_channel(
+                        interaction, channel.name, channel.description, cat, channel.overwrites,
+                        position, intro=False,
+                    )
+                made[channel.name] = chan
+                known[channel.name] = chan.id
+                index.add(chan)
+            if not channel.voice and has_intro:
+                # also covers a channel an earlier run created but failed before its first message
+                await post_channel_intro(chan, channel.description)
+        result["created"].append(channel.name)
+
+    async def provision(position: int, channel: PlannedChannel):
+        nonlocal done
+        try:
+            try:
+                await create(position, channel)
+            except discord.RateLimited as e:
+                # only raised for waits longer than the client's max_ratelimit_timeout
+                await asyncio.sleep(e.retry_after)
+                await create(position, channel)
+        except discord.HTTPException as e:
+            print(f"Failed to create {channel.name} for {team_name}: {e}")
+            result["failed"].append(channel.name)
+        done += 1
+        if progress:
+            await progress(done, len(planned))
+
+    # explicit positions keep the channels in planned order although they are created at once
+    try:
+        await asyncio.gather(*(provision(i, x) for i, x in enumerate(planned)))
+    finally:
+        async with get_settings_store().team_transaction(team_name) as live:
+            if team_name in live["teams"]:
+                live["teams"][team_name]["channels"] = known
+    return result
+
+
 @has_role("Bingo Moderator")
 @app_commands.autocomplete(team_name=team_names_autocomplete)
 @bot.tree.command(name="create_team_channels",
@@ -2079,73 +4996,30 @@ async def create_team_channels(interaction: discord.Interaction, team_name: str)
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
-    team_number = team_names.index(team_name) + 1
     await interaction.response.defer(thinking=True)
     if not team_name in team_names:
         await interaction.followup.send(
             f"Team Name: {team_name} is not found in {team_names}\nPlease Try again"
         )
         return
-    everyone_role = discord.utils.get(interaction.guild.roles, name="@everyone")
-    spectator_role = discord.utils.get(interaction.guild.roles, name="spectator")
-    bingo_bot_role = discord.utils.get(interaction.guild.roles, name="Bingo Bot")
-    team_role = discord.utils.get(interaction.guild.roles, name=f"Team {team_number}")
-    cat = await interaction.guild.create_category(name=team_name)
-    overwrites_with_spectator = {
-        interaction.guild.default_role: discord.PermissionOverwrite(
-            read_messages=False, connect=False
-        ),
-        bingo_bot_role: bingo_bot_overwrites(),
-        interaction.guild.me: bingo_bot_overwrites(),
-        spectator_role: spectator_overwrites(),
-        team_role: team_overwrites(),
-        everyone_role: everyone_overwrites(),
-    }
-    overwrites_w_out_spectator = {
-        interaction.guild.default_role: discord.PermissionOverwrite(
-            read_messages=False, connect=False
-        ),
-        bingo_bot_role: bingo_bot_overwrites(),
-        interaction.guild.me: bingo_bot_overwrites(),
-        team_role: team_overwrites(),
-        everyone_role: everyone_overwrites(),
-    }
-    await cat.edit(overwrites=overwrites_with_spectator)
-    # Create Default Channels
-    # all_channels = []
-    channels = await get_default_channels(interaction)
-    for channel in channels:
-        settings = load_settings_json()
-        if settings["bot_mode"]["current"] == "candyland" or settings["bot_mode"]["current"] == "chutes and ladders":
-            channel_name = f"team-{team_number}-{channel}"
-            if channel_name == f"team-{team_number}-chat":
-                overwrites = overwrites_w_out_spectator
-            else:
-                overwrites = overwrites_with_spectator
-        else:
-            channel_name = channel["name"]
-            if channel_name == "chat":
-                # TODO update this
-                # raise Exception("This is not implemented yet, update proper perms")
-                channel_name = f"{team_number}-general-{channel_name}"
-                overwrites = overwrites_w_out_spectator
-            else:
-                # raise Exception("This is not implemented yet, update proper perms")
-                overwrites = overwrites_with_spectator
-        if "voice" in channel_name:
-            channel_name = f"{team_number}-{channel_name}"
-            chan = await interaction.guild.create_voice_channel(
-                name=channel_name, category=cat, overwrites=overwrites
-            )
-        else:
-            #TODO update this to be relevant, doesnt work for candyland and CNL
-            description = channel["description"]
-            await create_discord_text_channel(interaction, channel_name, description, cat, overwrites)
-        
-        # all_channels.append(chan)
-    await interaction.followup.send(f'Channels created for "{team_name}"')
+    progress_message = await interaction.followup.send(f'Creating channels for "{team_name}"', wait=True)
+    result = await provision_team_channels(
+        interaction,
+        settings,
+        team_name,
+        progress=progress_editor(progress_message, f'Creating channels for "{team_name}"'),
+    )
+    await progress_message.edit(
+        content=f'Channels created for "{team_name}": {len(result["created"])} created'
+        + (f', {len(result["existing"])} already existed' if result["existing"] else "")
+        + (
+            f'\nFailed: {", ".join(result["failed"])}, run the command again to retry'
+            if result["failed"]
+            else ""
+        )
+    )
 
 
 @has_role("Bingo Moderator")
@@ -2163,7 +5037,7 @@ async def set_tile(interaction: discord.Interaction, team_name: str, tile: int):
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
     team_number = team_names.index(team_name) + 1
     await interaction.response.defer(thinking=True)
@@ -2190,9 +5064,10 @@ async def set_tile(interaction: discord.Interaction, team_name: str, tile: int):
         return
     if tile < 0:
         tile = 1
-    settings["teams"][team_name]["current"] = tile
+    async with get_settings_store().team_transaction(team_name) as settings:
+        settings["teams"][team_name]["current"] = tile
+        get_settings_store().record("set_tile", team_name)
     await interaction.followup.send(f"Updated tile for Team: {team_name} to {tile}")
-    update_settings_json(settings)
 
 
 @has_role("Bingo Moderator")
@@ -2213,7 +5088,7 @@ async def set_previous_tile(
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
     team_number = team_names.index(team_name) + 1
     await interaction.response.defer(thinking=True)
@@ -2240,11 +5115,74 @@ async def set_previous_tile(
         return
     if tile < 0:
         tile = None
-    settings["teams"][team_name]["prev"] = tile
+    async with get_settings_store().team_transaction(team_name) as settings:
+        settings["teams"][team_name]["prev"] = tile
+        get_settings_store().record("set_previous_tile", team_name)
     await interaction.followup.send(
         f"Updated prev tile for Team: {team_name} to {tile}"
     )
-    update_settings_json(settings)
+
+
+@has_role("Bingo Moderator")
+@app_commands.autocomplete(team_name=team_names_autocomplete)
+@bot.tree.command(name="rollback_team",
+    description=f"Restore a team's tile, previous tile and rerolls to a past journal event # or time (YYYY-MM-DD HH:MM:SS).")
+async def rollback_team(
+    interaction: discord.Interaction,
+    team_name: str,
+    event: Optional[int] = None,
+    timestamp: Optional[str] = None,
+):
+    """
+    Rolls a team back to the state it was in at a past journal event or time.
+    The state is rebuilt from the roll journal and restored in one step, then the score board is updated.
+
+    Parameters:
+    - interaction (discord.Interaction): The interaction object representing the command invocation.
+    - team_name (str): The name of the team.
+    - event (int, optional): The journal event number to roll back to.
+    - timestamp (str, optional): The time to roll back to, e.g. "2024-05-02 19:30:00" (server local time).
+
+    Returns:
+    None
+    """
+    await interaction.response.defer(thinking=True)
+    settings = read_settings_json()
+    team_names = [x for x in settings["teams"].keys()]
+    if not team_name in team_names:
+        await interaction.followup.send(
+            f"Team Name: {team_name} is not found in {team_names}\nPlease Try again"
+        )
+        return
+    if get_settings_store().journal is None:
+        await interaction.followup.send("Roll journal is not enabled, nothing to roll back to.")
+        return
+    if event is None and not timestamp:
+        await interaction.followup.send('Provide either an "event" number or a "timestamp" to roll back to.')
+        return
+    ts = None
+    if event is None:
+        try:
+            ts = datetime.datetime.fromisoformat(timestamp).timestamp()
+        except ValueError:
+            await interaction.followup.send(
+                f'Unable to process "timestamp": {timestamp} - Use the format YYYY-MM-DD HH:MM:SS'
+            )
+            return
+    async with get_settings_store().team_transaction(team_name) as settings:
+        state, seq = get_settings_store().journal.team_state_at(team_name, seq=event, ts=ts)
+        if state is not None:
+            for k in JOURNAL_TEAM_FIELDS:
+                settings["teams"][team_name][k] = state[k]
+            get_settings_store().record("rollback", team_name, to_seq=seq)
+    if state is None:
+        await interaction.followup.send(f"No journal history for {team_name} at that point.")
+        return
+    await interaction.followup.send(
+        f"Rolled back {team_name} to journal event #{seq}\n"
+        f"Tile: {state['current']} Previous tile: {state['prev']} Rerolls: {state['reroll']}"
+    )
+    await update_server_score_board_channel(interaction, settings)
 
 
 @has_role("Bingo Moderator")
@@ -2262,7 +5200,7 @@ async def configure_team_reroll(interaction: discord.Interaction, team_name: str
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     team_names = [x for x in settings["teams"].keys()]
     team_number = team_names.index(team_name) + 1
     # if not interaction.channel.category.name.lower() == "admin":
@@ -2294,7 +5232,7 @@ async def update_score(interaction: discord.Interaction):
 
     Returns: None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     await update_server_score_board_channel(interaction=interaction, settings=settings)
     await interaction.response.send_message("Updated!")
 
@@ -2314,8 +5252,11 @@ async def post_tiles(interaction: discord.Interaction):
     Returns: None
     """
     await interaction.response.defer(thinking=True)
-    settings = load_settings_json()
-    tile_list_ch = discord.utils.get(interaction.guild.channels, name="tile-list")
+    settings = read_settings_json()
+    tile_list_ch = channel_index(interaction.guild).channel("tile-list")
+    if tile_list_ch is None:
+        await interaction.followup.send("No #tile-list channel found, create it and try again.")
+        return
 
     await send_or_update_tiles_channel(tile_list_ch, settings)
     await interaction.followup.send(f"Posted {len(settings['items'])} tiles to channel {tile_list_ch.mention}")
@@ -2332,7 +5273,7 @@ async def toggle_roll_choice(interaction: discord.Interaction, reroll=False):
         None
     """
 
-    class ToggleRolling(discord.ui.View):
+    class ToggleRolling(GuildView):
         """
         A custom UI view for toggling the rolling feature.
 
@@ -2356,9 +5297,8 @@ async def toggle_roll_choice(interaction: discord.Interaction, reroll=False):
             Returns:
             - None
             """
-            settings = load_settings_json()
-            settings["running"] = False
-            save_settings_json(settings)
+            async with get_settings_store().global_transaction() as settings:
+                settings["running"] = False
             for child in self.children:
                 child.disabled = True
             await interaction.response.edit_message(
@@ -2380,9 +5320,8 @@ async def toggle_roll_choice(interaction: discord.Interaction, reroll=False):
             Returns:
                 None
             """
-            settings = load_settings_json()
-            settings["running"] = True
-            save_settings_json(settings)
+            async with get_settings_store().global_transaction() as settings:
+                settings["running"] = True
             for child in self.children:
                 child.disabled = True
             await interaction.response.edit_message(
@@ -2404,9 +5343,8 @@ async def toggle_roll_choice(interaction: discord.Interaction, reroll=False):
             Returns:
             - None
             """
-            settings = load_settings_json()
-            settings["rerolling"] = False
-            save_settings_json(settings)
+            async with get_settings_store().global_transaction() as settings:
+                settings["rerolling"] = False
             for child in self.children:
                 child.disabled = True
             await interaction.response.edit_message(
@@ -2428,9 +5366,8 @@ async def toggle_roll_choice(interaction: discord.Interaction, reroll=False):
             Returns:
                 None
             """
-            settings = load_settings_json()
-            settings["rerolling"] = True
-            save_settings_json(settings)
+            async with get_settings_store().global_transaction() as settings:
+                settings["rerolling"] = True
             for child in self.children:
                 child.disabled = True
             await interaction.response.edit_message(
@@ -2438,7 +5375,7 @@ async def toggle_roll_choice(interaction: discord.Interaction, reroll=False):
                 view=self,
             )
 
-    settings = load_settings_json()
+    settings = read_settings_json()
     await interaction.response.send_message(
         f"Rolling is {'ENABLED' if settings['running'] == True else 'DISABLED'}\n\
             Rerolling is {'ENABLED' if settings['rerolling'] == True else 'DISABLED'}",
@@ -2476,12 +5413,56 @@ async def check_roll_enabled(interaction: discord.Interaction):
     None
     """
     await interaction.response.defer(thinking=True)
-    settings = load_settings_json()
+    settings = read_settings_json()
     await interaction.followup.send(
         f"Rolling is currently: {'ENABLED' if settings['running'] == True else 'DISABLED'}\n\
             Rerolling is {'ENABLED' if settings['rerolling'] == True else 'DISABLED'}"
     )
 
+@has_role("Bingo Moderator")
+@bot.tree.command(name="lock_stats",
+    description=f"Shows settings lock contention counters. Does not update/change anything.")
+async def lock_stats(interaction: discord.Interaction):
+    """
+    Shows how often team/global settings transactions had to wait on each other.
+
+    Parameters:
+    interaction (discord.Interaction): The interaction object representing the user's interaction with the bot.
+
+    Returns:
+    None
+    """
+    stats = get_settings_store().lock_stats
+    await interaction.response.send_message(
+        f"Transactions: {stats['acquired']}\n"
+        f"Contended: {stats['contended']}\n"
+        f"Total wait: {stats['wait_seconds']:.3f}s\n"
+        f"Rolled back: {stats['rolled_back']}"
+    )
+
+@has_role("Bingo Moderator")
+@bot.tree.command(name="render_stats",
+    description=f"Shows card/board render and upload encoding counters. Does not update/change anything.")
+async def render_stats(interaction: discord.Interaction):
+    """
+    Shows how many images were rendered and encoded, the time spent and the upload size.
+
+    Parameters:
+    interaction (discord.Interaction): The interaction object representing the user's interaction with the bot.
+
+    Returns:
+    None
+    """
+    renders = render_service.stats
+    encodes = image_encoder.stats
+    average_size = encodes["bytes"] / encodes["images"] if encodes["images"] else 0
+    await interaction.response.send_message(
+        f"Renders: {renders['jobs']} ({renders['seconds']:.3f}s, {renders['waited']} queued)\n"
+        f"Encoded: {encodes['images']} as {image_encoder.format} ({encodes['seconds']:.3f}s)\n"
+        f"Uploaded: {encodes['bytes'] / 1024:.0f} KiB, {average_size / 1024:.0f} KiB on average\n"
+        f"Over budget: {encodes['over_budget']}"
+    )
+
 @has_role("Bingo Moderator")
 @bot.tree.command(name="brief_teams_channels",
     description=f"Toggles the brief teams channels setting. Prevents tiles from being posted in team categories.")
@@ -2522,7 +5503,7 @@ async def tile_completed(interaction: discord.Interaction):
     None
     """
     await interaction.response.defer(thinking=True)
-    settings = load_settings_json()
+    settings = read_settings_json()
     # Check tile is completed.
     if not settings['running']:
         await interaction.response.send(f'Bingo is not currently running. No action has occurred. ')
@@ -2579,7 +5560,7 @@ async def version(
 @has_role("Bingo Moderator")
 @app_commands.autocomplete(team_name=team_names_autocomplete)
 @bot.tree.command(name="mark_specific_tile_completed",
-    description=f"Mark a tile as completed on the bingo board, Column A-E. Row 1-5. 'A1' for example.")
+    description=f"Mark a tile as completed on the bingo board, Column letter then Row number. 'A1' for example.")
 async def mark_specific_tile_completed(interaction: discord.Interaction, team_name: str, location: str):
     """
     Marks a tile as completed for a specific team and updates the Bingo Card.
@@ -2593,27 +5574,71 @@ async def mark_specific_tile_completed(interaction: discord.Interaction, team_na
     None
     """
     await interaction.response.defer(thinking=True)
-    settings = load_settings_json()
+    settings = read_settings_json()
     if settings['bot_mode']['current'] != "normal":
         await interaction.followup.send(f"This command only works when Bot is in mode 'normal'. Current Mode: {settings['bot_mode']['current']}")
         return
-    team_names = [x for x in settings["teams"].keys()]
-    team_number = team_names.index(team_name) + 1
     row, col = await parse_table_location(location)
+    rows, columns = card_grid(settings["image_bounds"])
+    if row > rows or col > columns:
+        await interaction.followup.send(f"Location {location} is outside the {rows}x{columns} Bingo Card")
+        return
     if row == 0 or col == 0:
         update = False
     else:
         update = True
-        settings["teams"][team_name]["tiles_completed"].append([row, col])
-    update_settings_json(settings)
+        async with get_settings_store().team_transaction(team_name) as settings:
+            tiles_completed = settings["teams"][team_name]["tiles_completed"]
+            if [row, col] not in tiles_completed:
+                tiles_completed.append([row, col])
+        settings = read_settings_json()
     await post_or_update_bingo_card(
-        interaction, settings, team_name, update=update, row=row, column=col
+        interaction, settings, team_name, update=update
     )
     await interaction.followup.send(
         f"Team: {team_name}'s tile has been marked as completed and updated in the Bingo Card Channel"
     )
 
 
+@has_role("Bingo Moderator")
+@app_commands.autocomplete(team_name=team_names_autocomplete)
+@bot.tree.command(name="unmark_specific_tile_completed",
+    description=f"Remove the completed mark from a tile on the bingo board, Column letter then Row number. 'A1' for example.")
+async def unmark_specific_tile_completed(interaction: discord.Interaction, team_name: str, location: str):
+    """
+    Marks a tile as not completed for a specific team and updates the Bingo Card.
+
+    Parameters:
+    - interaction (discord.Interaction): The interaction object representing the user's interaction with the bot.
+    - team_name (str): The name of the team.
+    - location (str): The location of the tile in the Bingo Card.
+
+    Returns:
+    None
+    """
+    await interaction.response.defer(thinking=True)
+    settings = read_settings_json()
+    if settings['bot_mode']['current'] != "normal":
+        await interaction.followup.send(f"This command only works when Bot is in mode 'normal'. Current Mode: {settings['bot_mode']['current']}")
+        return
+    row, col = await parse_table_location(location)
+    async with get_settings_store().team_transaction(team_name) as settings:
+        tiles_completed = settings["teams"][team_name]["tiles_completed"]
+        marked = [row, col] in tiles_completed
+        if marked:
+            tiles_completed.remove([row, col])
+    if not marked:
+        await interaction.followup.send(f"Team: {team_name}'s tile {location} is not marked as completed")
+        return
+    settings = read_settings_json()
+    await post_or_update_bingo_card(
+        interaction, settings, team_name, update=True
+    )
+    await interaction.followup.send(
+        f"Team: {team_name}'s tile has been unmarked and updated in the Bingo Card Channel"
+    )
+
+
 @has_role("Bingo Moderator")
 @app_commands.autocomplete(team_name=team_names_autocomplete)
 @bot.tree.command(name="post_bingo_card",
@@ -2635,27 +5660,35 @@ async def post_bingo_card(
     None
     """
     await interaction.response.defer(thinking=True)
-    settings = load_settings_json()
+    settings = read_settings_json()
     if settings['bot_mode']['current'] == "normal":
         await interaction.followup.send(f"Not in a bingo mode that requires this. Current Mode: {settings['bot_mode']['current']}")
         return
     team_names = [x for x in settings["teams"].keys()]
     update = False
-    i = 0
     if for_all_teams or team_name == None:
-        for i in range(len(team_names)):
-            if i >= settings["total_teams"]:
-                continue
-            else:
-                await post_or_update_bingo_card(
-                    interaction, settings, team_names[i], update=update, row=0, column=0
-                )
-    else:
-        await post_or_update_bingo_card(
-            interaction, settings, team_name, update=update, row=0, column=0
+        team_names = team_names[:settings["total_teams"]]
+        progress_message = await interaction.followup.send(
+            f"Posting Bingo Card images: 0/{len(team_names)}", wait=True
+        )
+        failed = await post_or_update_bingo_cards(
+            interaction,
+            settings,
+            team_names,
+            update=True,
+            progress=progress_editor(progress_message, "Posting Bingo Card images"),
+        )
+        posted = [x for x in team_names if x not in failed]
+        await progress_message.edit(
+            content=f"Posted Bingo Card image in {', '.join(posted)}'s Bingo Card Channel"
+            + (f"\nFailed for: {', '.join(failed)}" if failed else "")
         )
+        return
+    await post_or_update_bingo_card(
+        interaction, settings, team_name, update=update
+    )
     await interaction.followup.send(
-        f"Posted Bingo Card image in {team_name if team_name else ', '.join([team_names[x] for x in range(settings['total_teams'])])}'s Bingo Card Channel"
+        f"Posted Bingo Card image in {team_name}'s Bingo Card Channel"
     )
 
 
@@ -2675,14 +5708,14 @@ async def default_bingo_card(interaction: discord.Interaction, team_name: str):
     None
     """
     await interaction.response.defer(thinking=True)
-    settings = load_settings_json()
+    settings = read_settings_json()
     update = False
     # settings["teams"][team_name]["image"] = os.path.join(
     #     IMAGE_PATH, "bingo_card_image.png"
     # )
     # update_settings_json(settings)
     await post_or_update_bingo_card(
-        interaction, settings, team_name, update=update, row=0, column=0
+        interaction, settings, team_name, update=update
     )
     await interaction.followup.send(
         f"Posted Bingo Card image in {team_name}'s Bingo Card Channel"
@@ -2703,7 +5736,7 @@ async def upload_board_image(interaction: discord.Interaction, file: discord.Att
     Returns:
     None
     """
-    settings = load_settings_json()
+    settings = read_settings_json()
     await interaction.response.defer(thinking=True)
     if not file:
         await interaction.followup.send(
@@ -2711,20 +5744,24 @@ async def upload_board_image(interaction: discord.Interaction, file: discord.Att
         )
         return
     else:
-        team_names = [x for x in settings["teams"].keys()]
         # check game style
         if settings["bot_mode"]["current"] == "chutes and ladders":
-            image_path = os.path.join(IMAGE_TEMPLATE_PATH, "bingo_card_image.png")
-            settings["board_template"] = image_path
+            image_path = os.path.join(guild_image_path(), "cnl_board_image.png")
         else:
-            image_path = os.path.join(IMAGE_PATH, "bingo_card_image.png")
-            for team_name in team_names:
-                settings["teams"][team_name]["image"] = image_path
+            image_path = os.path.join(guild_image_path(), "bingo_card_image.png")
 
         # download attachment
         with open(image_path, "wb") as f:
             await file.save(f)
-        # update all settings['teams'][team_name]['image']
+        image_assets.invalidate()
+        # reload, teams may have rolled during the download
+        settings = load_settings_json()
+        if settings["bot_mode"]["current"] == "chutes and ladders":
+            settings["board_template"] = image_path
+        else:
+            # update all settings['teams'][team_name]['image']
+            for team_name in settings["teams"]:
+                settings["teams"][team_name]["image"] = image_path
         update_settings_json(settings)
         await interaction.followup.send(f"Default Bingo Card Image has been updated")
 
@@ -2741,6 +5778,8 @@ async def set_image_bounds(
     y_top_offset: int,
     y_bottom_offset: int,
     gutter: int,
+    rows: int = 5,
+    columns: int = 5,
 ):
     """
     Sets the image bounds for each team in the settings.
@@ -2754,13 +5793,15 @@ async def set_image_bounds(
     - y_top_offset: The top offset of the image.
     - y_bottom_offset: The bottom offset of the image.
     - gutter: The gutter size of the image.
+    - rows: Number of tile rows on the bingo card.
+    - columns: Number of tile columns on the bingo card.
 
     Returns:
     - None
     """
+    await interaction.response.defer(thinking=True)
     settings = load_settings_json()
     team_names = [x for x in settings["teams"].keys()]
-    await interaction.response.defer(thinking=True)
     if (
         x_left_offset == ""
         or y_top_offset == ""
@@ -2772,21 +5813,29 @@ async def set_image_bounds(
     ):
         await interaction.followup.send(f"Please provide all the required values")
         return
+    elif rows < 1 or columns < 1:
+        await interaction.followup.send(f"Bingo Card must have at least 1 row and 1 column")
+        return
     else:
         # update all settings['teams'][team_name]['image']
         for team_name in team_names:
-            settings["image_bounds"] = {
-                "x_offset": x_left_offset,
-                "y_offset": y_top_offset,
-                "x_right_offset": x_right_offset,
-                "y_bottom_offset": y_bottom_offset,
-                "x": x,
-                "y": y,
-                "gutter": gutter,
-            }
+            settings["image_bounds"] = ImageBounds(
+                x_offset=x_left_offset,
+                y_offset=y_top_offset,
+                x_right_offset=x_right_offset,
+                y_bottom_offset=y_bottom_offset,
+                x=x,
+                y=y,
+                gutter=gutter,
+                rows=rows,
+                columns=columns,
+            )
         update_settings_json(settings)
+        image_assets.invalidate()
+        template_path = os.path.join(guild_image_path(), "bingo_card_image.png")
+        if os.path.exists(template_path):
+            card_geometry(settings["image_bounds"].to_dict(), image_assets.image(template_path).size)
         await interaction.followup.send(f"Image bounds for each team have been updated")
-        update_settings_json(settings)
 
 
 @has_role("Bingo Moderator")
@@ -2805,6 +5854,7 @@ async def set_board_bounds(
     y_top_offset: int,
     y_bottom_offset: int,
     gutter: int,
+    columns: int = 10,
 ):
     """
     Sets the image bounds for each team in the settings.
@@ -2822,13 +5872,14 @@ async def set_board_bounds(
     - y_top_offset: The top offset of the image.
     - y_bottom_offset: The bottom offset of the image.
     - gutter: The gutter size between tiles.
+    - columns: Number of tiles in each row of the board, rows alternate direction.
 
     Returns:
     - None
     """
+    await interaction.response.defer(thinking=True)
     settings = load_settings_json()
     team_names = [x for x in settings["teams"].keys()]
-    await interaction.response.defer(thinking=True)
     if (
         tile_count == ""
         or tile_size == ""
@@ -2844,25 +5895,36 @@ async def set_board_bounds(
     ):
         await interaction.followup.send(f"Please provide all the required values")
         return
+    elif tile_count < 1 or columns < 1:
+        await interaction.followup.send(f"Board must have at least 1 tile and 1 column")
+        return
+    elif invalid := invalid_shortcuts(board_shortcuts(settings), tile_count):
+        await interaction.followup.send(
+            f"Ladders and chutes {invalid} are outside tiles 1-{tile_count}, fix CNL_SHORTCUTS or the tile sheet first"
+        )
+        return
     else:
         # update all settings['teams'][team_name]['image']
         for team_name in team_names:
-            settings["board_bounds"] = {
-                "tile_count": tile_count,
-                "tile_size": tile_size,
-                "team_icon_x_offset": team_icon_x_offset,
-                "team_icon_y_offset": team_icon_y_offset,
-                "x_offset": x_left_offset,
-                "y_offset": y_top_offset,
-                "x_right_offset": x_right_offset,
-                "y_bottom_offset": y_bottom_offset,
-                "x": x,
-                "y": y,
-                "gutter": gutter,
-            }
+            settings["board_bounds"] = BoardBounds(
+                tile_count=tile_count,
+                columns=columns,
+                tile_size=tile_size,
+                team_icon_x_offset=team_icon_x_offset,
+                team_icon_y_offset=team_icon_y_offset,
+                x_offset=x_left_offset,
+                y_offset=y_top_offset,
+                x_right_offset=x_right_offset,
+                y_bottom_offset=y_bottom_offset,
+                x=x,
+                y=y,
+                gutter=gutter,
+            )
         update_settings_json(settings)
+        image_assets.invalidate()
+        board_geometry(settings["board_bounds"].to_dict())
+        snake_board(settings)
         await interaction.followup.send(f"Board bounds for each team have been updated")
-        update_settings_json(settings)
 
 
 
@@ -2903,9 +5965,7 @@ async def close_server(interaction: discord.Interaction):
     roles.append(spectator_role)
     # roles.append(rules_accepted_role)
     await process_all_spectators(interaction, roles, spectator_role, unassign=True)
-    start_here_channel = discord.utils.get(
-        interaction.guild.channels, name="start-here"
-    )
+    start_here_channel = channel_index(interaction.guild).channel("start-here")
     rules_accepted_role = discord.utils.get(
         interaction.guild.roles, name="Rules Accepted"
     )
@@ -2927,14 +5987,15 @@ async def update_total_teams(interaction: discord.Interaction, total_teams: int)
     None
     """
     await interaction.response.defer(thinking=True)
-    settings = load_settings_json()
+    settings = read_settings_json()
     if total_teams < 1:
         await interaction.followup.send(
             f"Number of active teams must be greater than 0"
         )
         return
-    settings["total_teams"] = total_teams
-    update_settings_json(settings)
+    get_settings_store().take_snapshot("update_total_teams")
+    async with get_settings_store().global_transaction() as settings:
+        settings["total_teams"] = total_teams
     await interaction.followup.send(
         f"Number of active teams has been updated to {total_teams}"
     )
@@ -2953,7 +6014,7 @@ async def reset_bingo_settings(interaction: discord.Interaction):
     - None
     """
 
-    class ConfirmReset(discord.ui.View):
+    class ConfirmReset(GuildView):
         def __init__(self, *, timeout: Optional[float] = 180):
             super().__init__(timeout=timeout)
 
@@ -2974,8 +6035,8 @@ async def reset_bingo_settings(interaction: discord.Interaction):
             self, interaction: discord.Interaction,
             button: discord.ui.Button
         ):
+            get_settings_store().take_snapshot("reset_bingo_settings")
             settings = load_settings_json()
-            old_settings = load_settings_json()
             team_names = [x for x in settings["teams"].keys()]
             # set total_teams to 7
             settings["total_teams"] = 7
@@ -2992,7 +6053,7 @@ async def reset_bingo_settings(interaction: discord.Interaction):
                 settings["teams"][team_name]["roll_history"] = []
                 # set image to default
                 settings["teams"][team_name]["image"] = os.path.join(
-                    IMAGE_PATH, "bingo_card_image.png"
+                    guild_image_path(), "bingo_card_image.png"
                 )
                 # # set image bounds to default
                 # settings["image_bounds"] = {
@@ -3009,6 +6070,7 @@ async def reset_bingo_settings(interaction: discord.Interaction):
 
             # delete images in IMAGE_PATH that arent default_bingo_card_image.png
             update_settings_json(settings)
+            get_settings_store().checkpoint()
             for child in self.children:
                 child.disabled = True
             await interaction.response.edit_message(
@@ -3020,26 +6082,74 @@ async def reset_bingo_settings(interaction: discord.Interaction):
         view=ConfirmReset(),
     )
 
-async def process_team_assignment_updates(interaction: discord.Interaction):
-    settings = load_settings_json()
+@has_role("Bingo Moderator")
+@app_commands.autocomplete(snapshot=snapshot_autocomplete)
+@bot.tree.command(name="restore_snapshot",
+    description=f"Restore the settings saved before a reset, team/tile change or team count change.")
+async def restore_snapshot(interaction: discord.Interaction, snapshot: str):
+    """
+    Restores the settings from a snapshot taken before a destructive command.
+    Tiles are restored from the snapshot, the Google Sheet is not downloaded again.
+    The current settings are snapshotted first so the restore can be undone.
+
+    Parameters:
+    - interaction (discord.Interaction): The interaction object representing the user's interaction with the bot.
+    - snapshot (str): The hash of the snapshot to restore.
+
+    Returns:
+    - None
+    """
+    await interaction.response.defer(thinking=True)
+    store = get_settings_store()
+    if store.snapshots is None:
+        await interaction.followup.send("Settings snapshots are not enabled.")
+        return
+    try:
+        contents = store.snapshots.load(snapshot)
+    except KeyError:
+        await interaction.followup.send(f'No snapshot found for "{snapshot}"')
+        return
+    with store.in_use():
+        store.take_snapshot("restore_snapshot")
+        # waits for running rolls, then restores in place so every holder of the settings sees it
+        async with store.exclusive_transaction() as settings:
+            settings.clear()
+            settings.update(hydrate_settings(contents))
+        store.checkpoint()
+    await interaction.followup.send(f"Restored settings snapshot {snapshot[:8]}")
+
+async def post_team_assignments(guild: discord.Guild, settings: dict) -> bool:
+    """
+    Post or update the team members list in #team-assignments.
+
+    Args:
+        guild (discord.Guild): The Discord server.
+        settings (dict): The bingo settings.
+
+    Returns:
+        bool: False if the server has no #team-assignments channel.
+    """
     total_teams = settings['total_teams']
     all_roles = []
-    for role in interaction.guild.roles:
+    for role in guild.roles:
         if role.name in ROLES:
             all_roles.append(role)
-    team_assignment_channel = discord.utils.get(interaction.guild.channels, name="team-assignments")
+    team_assignment_channel = channel_index(guild).channel("team-assignments")
     if not team_assignment_channel:
+        return False
+    content = generate_team_assignment_text(all_roles, total_teams)
+    message = await edit_registered_post(settings, "team-assignments", team_assignment_channel, content=content)
+    if message is None:
+        message = await team_assignment_channel.send(content=content) #, silent=True)
+        await register_post("team-assignments", team_assignment_channel, [message])
+    return True
+
+
+async def process_team_assignment_updates(interaction: discord.Interaction):
+    settings = read_settings_json()
+    if not await post_team_assignments(interaction.guild, settings):
         await interaction.followup.send('No Team Assignment Channel found')
         return
-    else:
-        async for m in team_assignment_channel.history(oldest_first=True):
-            if m.author == bot.user:
-                content = generate_team_assignment_text(all_roles, total_teams)
-                await m.edit(content=content)
-                break
-        else:
-            content = generate_team_assignment_text(all_roles, total_teams)
-            await team_assignment_channel.send(content=content) #, silent=True)
     await interaction.followup.send('Updated Team Assignment Channel')
 
 @has_role("Bingo Moderator")
@@ -3057,6 +6167,156 @@ async def update_team_assignment(interaction: discord.Interaction):
     await interaction.response.defer(thinking=True)
     await process_team_assignment_updates(interaction)
 
+@dataclasses.dataclass(slots=True)
+class SetupStep:
+    name: str
+    # coroutine function taking no arguments, raises to fail the step
+    run: object
+    after: tuple = ()
+    status: str = "waiting"
+    seconds: float = 0.0
+
+
+async def run_setup_steps(steps: list, progress=None) -> None:
+    """
+    Run setup steps as a dependency graph. Every step starts as soon as the steps in its
+    after are done and is skipped if one of them failed. The Discord requests made by
+    the steps are bounded inside the steps themselves.
+
+    Args:
+        steps (list): SetupStep, each listed after the steps it depends on.
+        progress (optional): Coroutine function called with (done, total) after every step.
+    """
+    tasks = {}
+    done = 0
+
+    async def run(step: SetupStep) -> bool:
+        nonlocal done
+        if not all(await asyncio.gather(*(tasks[x] for x in step.after))):
+            step.status = "skipped"
+        else:
+            step.status = "running"
+            start = time.perf_counter()
+            try:
+                await step.run()
+                step.status = "done"
+            except Exception as e:
+                print(f"Setup step {step.name} failed: {e}")
+                step.status = "failed"
+            step.seconds = time.perf_counter() - start
+        done += 1
+        if progress:
+            await progress(done, len(steps))
+        return step.status == "done"
+
+    for step in steps:
+        tasks[step.name] = asyncio.create_task(run(step))
+    await asyncio.gather(*tasks.values())
+
+
+@has_role("Bingo Moderator")
+@bot.tree.command(name="setup_event", description=f"Create all teams' channels and post the tiles, bingo cards, team assignments and score.")
+async def setup_event(interaction: discord.Interaction):
+    """
+    Sets up the whole event in one go: /create_team_channels for every team, then
+    /post_tiles, /post_bingo_card, /update_team_assignment and /update_score.
+    Steps that do not depend on each other run at the same time, a team's bingo card
+    is posted as soon as its channels exist. Safe to run again, existing channels and
+    posts are reused.
+
+    Parameters:
+    - interaction (discord.Interaction): The interaction object representing the user's interaction with the bot.
+
+    Returns:
+    - None
+    """
+    await interaction.response.defer(thinking=True)
+    started = time.perf_counter()
+    settings = read_settings_json()
+    guild = interaction.guild
+    index = channel_index(guild)
+    team_names = [x for x in settings["teams"].keys()][:settings["total_teams"]]
+    # one limiter for all teams, channel creation shares a rate limit across the server
+    slots = asyncio.Semaphore(getattr(config, "CHANNEL_CREATE_CONCURRENCY", CHANNEL_CREATE_CONCURRENCY))
+    # the same limit on card uploads as /post_bingo_card for every team
+    uploads = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    # every step reads the settings when it starts, to see what the steps before it saved
+    def team_channels(team_name: str):
+        async def run():
+            result = await provision_team_channels(interaction, read_settings_json(), team_name, slots=slots)
+            if result["failed"]:
+                raise RuntimeError(f"could not create {', '.join(result['failed'])}")
+        return run
+
+    def team_card(team_name: str):
+        async def run():
+            channel = index.team_channel(team_name, "bingo-card")
+            if channel is None:
+                raise RuntimeError(f"no bingo-card channel for {team_name}")
+            settings = read_settings_json()
+            img = await bingo_card_file(settings, team_name, update=True)
+            await upload_bingo_card_limited(channel, settings, team_name, img, uploads, update=True)
+        return run
+
+    async def tiles():
+        tile_list_ch = index.channel("tile-list")
+        if tile_list_ch is None:
+            raise RuntimeError("no #tile-list channel")
+        await send_or_update_tiles_channel(tile_list_ch, read_settings_json())
+
+    async def team_assignments():
+        if not await post_team_assignments(guild, read_settings_json()):
+            raise RuntimeError("no #team-assignments channel")
+
+    async def score_board():
+        if index.channel("score-board") is None:
+            raise RuntimeError("no #score-board channel")
+        await update_server_score_board_channel(interaction, read_settings_json())
+
+    steps = [SetupStep(f"channels: {x}", team_channels(x)) for x in team_names]
+    if settings["bot_mode"]["current"] != "normal":
+        steps += [SetupStep(f"bingo card: {x}", team_card(x), after=(f"channels: {x}",)) for x in team_names]
+    steps += [
+        SetupStep("tile list", tiles),
+        SetupStep("team assignments", team_assignments),
+        SetupStep("score board", score_board),
+    ]
+
+    def running_steps() -> str:
+        running = [x.name for x in steps if x.status == "running"]
+        return f"Running: {', '.join(running)}" if running else ""
+
+    progress_message = await interaction.followup.send(f"Setting up the event: 0/{len(steps)}", wait=True)
+    # a setup can outlast the idle timeout, keep the shard the steps save to loaded
+    with get_settings_store().in_use():
+        await run_setup_steps(
+            steps, progress=progress_editor(progress_message, "Setting up the event", details=running_steps)
+        )
+
+    elapsed = time.perf_counter() - started
+    by_kind = {}
+    for step in steps:
+        kind = step.name.split(":")[0]
+        by_kind[kind] = by_kind.get(kind, 0.0) + step.seconds
+    failed = [x for x in steps if x.status != "done"]
+    lines = [
+        f"Event set up in {elapsed:.1f}s ({sum(x.seconds for x in steps):.1f}s of steps run in parallel)",
+        ", ".join(f"{kind} {seconds:.1f}s" for kind, seconds in by_kind.items()),
+    ]
+    lines += [f"- {x.name}: {x.seconds:.1f}s" for x in sorted(steps, key=lambda x: -x.seconds)[:5]]
+    if failed:
+        lines.append(
+            f"Failed: {', '.join(f'{x.name} ({x.status})' for x in failed)}. Run /setup_event again to retry."
+        )
+    try:
+        await progress_message.edit(content="\n".join(lines))
+    except discord.HTTPException as e:
+        # the interaction token expires after 15 minutes, a long setup outlives it
+        print(f"Could not edit the setup progress message: {e}")
+        await interaction.channel.send("\n".join(lines))
+
+
 @has_role("Bingo Moderator")
 @bot.tree.command(name="purge_chutes_and_ladders_images", description=f"Clears out the old images from chutes and ladders game mode board.")
 async def purge_chutes_and_ladders_images(interaction: discord.Interaction):
@@ -3071,4 +6331,8 @@ async def purge_chutes_and_ladders_images(interaction: discord.Interaction):
 
 if __name__ == '__main__':
     print('About to log in with bot')
-    bot.run(config.DISCORD_BOT_TOKEN)
+    try:
+        bot.run(config.DISCORD_BOT_TOKEN)
+    finally:
+        guild_settings.flush_all()
+        render_service.shutdown()
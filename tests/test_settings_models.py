@@ -0,0 +1,35 @@
+import copy
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# config.py holds the bot token and is not checked in, bot only reads optional values from it
+sys.modules.setdefault("config", types.ModuleType("config"))
+
+import bot  # noqa: E402
+
+
+def test_mark_on_default_team_survives_to_dict():
+    settings = bot.hydrate_settings(copy.deepcopy(bot.default_settings_dict))
+    team = settings["teams"]["Team 1"]
+    team["tiles_completed"].append([1, 1])
+    assert "tiles_completed" in team
+    assert team.get("tiles_completed", []) == [[1, 1]]
+    assert bot.Team.from_dict(team.to_dict()).to_dict()["tiles_completed"] == [[1, 1]]
+
+
+def test_list_fields_missing_from_settings_json_are_present():
+    team = bot.Team.from_dict({"current": 0, "prev": None, "reroll": True, "roll_history": []})
+    team["tiles_completed"].append([2, 3])
+    assert team.to_dict()["tiles_completed"] == [[2, 3]]
+    assert "prev" in team and team.get("prev", "unset") is None
+    assert "image" not in team and "image" not in team.to_dict()
+
+
+def test_hydrate_fills_missing_top_level_keys():
+    settings = bot.hydrate_settings({"teams": {"Team 1": {"current": 0}}})
+    assert settings["running"] is False and settings["total_teams"] == 7
+    assert isinstance(settings["image_bounds"], bot.ImageBounds)
+    assert isinstance(settings["board_bounds"], bot.BoardBounds)
+    assert list(settings["teams"]) == ["Team 1"]